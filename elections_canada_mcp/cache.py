@@ -0,0 +1,250 @@
+"""
+Result caching for the Elections Canada MCP Server.
+
+Tool results are pure functions of their arguments and of the loaded dataset, so
+serialized results are kept in a shared LRU cache. Cache keys are built from
+canonicalized arguments (e.g. 'Liberal', 'lpc' and 'LPC' share an entry) and
+the dataset snapshot version, so a new snapshot never serves stale results.
+Results materialized ahead of time (see `precompute.py`) are pinned: they are
+served like other entries but never evicted.
+Concurrent misses for the same key are coalesced so that only one of them
+computes the result.
+"""
+
+import functools
+import inspect
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+def freeze(value: Any) -> Hashable:
+    """Convert an argument value into a hashable, order-preserving cache key component."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    if isinstance(value, set):
+        return tuple(sorted(freeze(v) for v in value))
+    return value
+
+
+class _Call:
+    """A computation in flight, shared by every caller waiting for the same key."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls with the same key into a single computation.
+
+    The first caller for a key computes the result; callers arriving while it is
+    in flight wait for it and share its result (or its exception).
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run `fn` for `key`, or wait for the computation already in flight."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache of serialized tool results.
+
+    Entries are evicted in least-recently-used order once either the number of
+    entries or their total size in bytes exceeds its bound. All entries are
+    dropped when the dataset snapshot version changes. Pinned entries are not
+    counted in the bounds and are never evicted. Concurrent misses for the same
+    key share a single computation.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.snapshot: Optional[str] = None
+        self._entries: "OrderedDict[Hashable, str]" = OrderedDict()
+        self._pinned: Dict[Hashable, str] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._flights = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def set_snapshot(self, snapshot: str) -> None:
+        """Set the dataset snapshot version, clearing the cache if it changed."""
+        with self._lock:
+            if snapshot != self.snapshot:
+                self.snapshot = snapshot
+                self._entries.clear()
+                self._pinned.clear()
+                self._bytes = 0
+
+    def get(self, key: Hashable) -> Optional[str]:
+        """Return the cached result for a key, or None on a miss."""
+        with self._lock:
+            value = self._pinned.get(key)
+            if value is not None:
+                self.hits += 1
+                return value
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def _recheck(self, key: Hashable) -> Optional[str]:
+        """
+        Return the result for a key if it was stored after the caller's miss (e.g. by
+        a flight that finished just before this caller became leader), without
+        counting another lookup.
+        """
+        with self._lock:
+            value = self._pinned.get(key)
+            if value is None:
+                value = self._entries.get(key)
+                if value is not None:
+                    self._entries.move_to_end(key)
+            return value
+
+    def contains(self, key: Hashable) -> bool:
+        """Return whether a key is cached, without touching the counters or LRU order."""
+        with self._lock:
+            return key in self._pinned or key in self._entries
+
+    def pin(self, key: Hashable, value: str) -> None:
+        """Store a result that is never evicted (dropped only when the snapshot changes)."""
+        with self._lock:
+            self._pinned[key] = value
+
+    def put(self, key: Hashable, value: str) -> None:
+        """Store a result, evicting least-recently-used entries to respect the bounds."""
+        size = len(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[key] = value
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the cache counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "snapshot": self.snapshot,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "pinned": len(self._pinned),
+                "maxEntries": self.max_entries,
+                "maxBytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "coalesced": self._flights.coalesced,
+                "hitRate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+    def cached(self, normalizers: Optional[Dict[str, Callable[[Any], Any]]] = None,
+               depends_on: Optional[Callable[[Dict[str, Any]], Hashable]] = None):
+        """
+        Decorator caching a tool's serialized result.
+
+        Args:
+            normalizers: Mapping of parameter name to a function returning the canonical
+                         form of the argument (e.g. `get_party_code`). If it returns a
+                         falsy value the argument is kept as given.
+            depends_on: Optional function returning extra state the result depends on
+                        (e.g. the version of the custom region registry). It is called
+                        with the call's arguments by parameter name, defaults applied.
+        """
+        normalizers = normalizers or {}
+
+        def decorator(fn):
+            signature = inspect.signature(fn)
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                key = self.make_key(fn.__name__, signature, normalizers, depends_on, args, kwargs)
+                result = self.get(key)
+                if result is None:
+                    result = self._flights.do(key, lambda: self._compute(key, fn, args, kwargs))
+                return result
+
+            wrapper.cache_key = lambda *args, **kwargs: self.make_key(
+                fn.__name__, signature, normalizers, depends_on, args, kwargs
+            )
+            return wrapper
+
+        return decorator
+
+    def _compute(self, key: Hashable, fn: Callable[..., str], args: tuple, kwargs: dict) -> str:
+        """Compute and store a result (run by the single caller leading a flight)."""
+        result = self._recheck(key)
+        if result is not None:
+            return result
+        result = fn(*args, **kwargs)
+        self.put(key, result)
+        return result
+
+    def make_key(self, name: str, signature: inspect.Signature,
+                 normalizers: Dict[str, Callable[[Any], Any]],
+                 depends_on: Optional[Callable[[Dict[str, Any]], Hashable]],
+                 args: tuple, kwargs: dict) -> Hashable:
+        """Build the cache key for a call from its canonicalized arguments."""
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        canonical = []
+        for param, value in bound.arguments.items():
+            normalizer = normalizers.get(param)
+            if normalizer is not None and value is not None:
+                value = normalizer(value) or value
+            canonical.append((param, freeze(value)))
+        extra = depends_on(bound.arguments) if depends_on is not None else None
+        return (name, self.snapshot, extra, tuple(canonical))
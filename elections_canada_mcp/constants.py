@@ -69,6 +69,16 @@ PARTY_CODE_TO_NAME = {
     "PPC": "People's Party of Canada"
 }
 
+# French party names (used in output when the language is FR)
+PARTY_CODE_TO_NAME_FR = {
+    "LPC": "Parti libéral du Canada",
+    "CPC": "Parti conservateur du Canada",
+    "NDP": "Nouveau Parti démocratique",
+    "BQ": "Bloc Québécois",
+    "GPC": "Parti vert du Canada",
+    "PPC": "Parti populaire du Canada"
+}
+
 # Province name to code mapping
 PROVINCE_NAME_TO_CODE = {
     # English names
@@ -126,3 +136,37 @@ PROVINCE_CODE_TO_NAME = {
     "SK": "Saskatchewan",
     "YT": "Yukon"
 }
+
+# Province code to French name mapping
+PROVINCE_CODE_TO_NAME_FR = {
+    "AB": "Alberta",
+    "BC": "Colombie-Britannique",
+    "MB": "Manitoba",
+    "NB": "Nouveau-Brunswick",
+    "NL": "Terre-Neuve-et-Labrador",
+    "NT": "Territoires du Nord-Ouest",
+    "NS": "Nouvelle-Écosse",
+    "NU": "Nunavut",
+    "ON": "Ontario",
+    "PE": "Île-du-Prince-Édouard",
+    "QC": "Québec",
+    "SK": "Saskatchewan",
+    "YT": "Yukon"
+}
+
+# Standard Geographical Classification province numbers (the first two digits of riding codes)
+PROVINCE_NUMBER_TO_CODE = {
+    10: "NL",
+    11: "PE",
+    12: "NS",
+    13: "NB",
+    24: "QC",
+    35: "ON",
+    46: "MB",
+    47: "SK",
+    48: "AB",
+    59: "BC",
+    60: "YT",
+    61: "NT",
+    62: "NU"
+}
@@ -0,0 +1,425 @@
+"""
+Vectorized election dataset for the Elections Canada MCP Server.
+
+This module turns the riding-level JSON records into riding x party numpy arrays
+once at load time, so that aggregations can be computed with masked sums instead
+of loops over the per-riding dictionaries. The parsed JSON tree is not kept:
+ridings are exposed as slotted `RidingRecord` views over the arrays, with party
+and province codes and riding names interned so each string is stored once.
+"""
+
+import hashlib
+import json
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from .localization import DEFAULT_LANGUAGE, Localizer, party_name, province_name
+
+
+# Ballot position of a party that is not on a riding's ballot
+NOT_ON_BALLOT = np.iinfo(np.int8).max
+
+# Keys of a riding record, in the order of the data file
+RIDING_KEYS = (
+    "ridingCode", "ridingName_EN", "ridingName_FR", "provCode", "voteDistribution",
+    "validVotes", "rejectedVotes", "totalVotes", "registeredVoters", "turnout"
+)
+
+
+class RidingRecord(Mapping):
+    """
+    Read-only view of one riding of an `ElectionDataset`.
+
+    Behaves like the riding's JSON object (`riding["ridingName_EN"]`,
+    `riding["voteDistribution"]`, ...) but stores only a reference to the dataset
+    and a row number; every value is read from the dataset's arrays on access.
+    """
+
+    __slots__ = ("_dataset", "_row")
+
+    def __init__(self, dataset: "ElectionDataset", row: int):
+        self._dataset = dataset
+        self._row = row
+
+    def __getitem__(self, key: str) -> Any:
+        dataset, row = self._dataset, self._row
+        if key == "ridingCode":
+            return int(dataset.riding_codes[row])
+        if key == "ridingName_EN":
+            return dataset.names_en[row]
+        if key == "ridingName_FR":
+            return dataset.names_fr[row]
+        if key == "provCode":
+            return dataset.province_list[dataset.province_index[row]]
+        if key == "voteDistribution":
+            return dataset.vote_distribution(row)
+        if key == "validVotes":
+            return int(dataset.valid_votes[row])
+        if key == "rejectedVotes":
+            return int(dataset.rejected_votes[row])
+        if key == "totalVotes":
+            return int(dataset.total_votes[row])
+        if key == "registeredVoters":
+            return int(dataset.registered_voters[row])
+        if key == "turnout":
+            return float(dataset.turnout[row])
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(RIDING_KEYS)
+
+    def __len__(self) -> int:
+        return len(RIDING_KEYS)
+
+    def __repr__(self) -> str:
+        return f"RidingRecord({self['ridingCode']}, {self['ridingName_EN']!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the riding as a plain JSON-serializable dictionary."""
+        return {key: self[key] for key in RIDING_KEYS}
+
+
+class ElectionDataset:
+    """
+    Riding x party vote matrices built from a list of riding records.
+
+    Rows follow the order of the ridings in the data file and columns follow the
+    order in which party codes first appear in the vote distributions. Each
+    party's position on a riding's ballot (its place in the riding's vote
+    distribution) is kept, and ties for winner, runner-up and every finishing
+    position are resolved in ballot order, matching the first-highest rule used
+    by `summarize_results` and the stable sorts of `closest_ridings` and
+    `best_and_worst`.
+    """
+
+    def __init__(self, ridings: List[Dict[str, Any]], snapshot: Optional[str] = None):
+        # Version of the data the arrays were built from, used to invalidate caches
+        self.snapshot = snapshot or hashlib.sha256(
+            json.dumps(ridings, sort_keys=True).encode("utf-8")
+        ).hexdigest()[:16]
+        self.num_ridings = len(ridings)
+
+        # Party columns in first-seen order
+        self.party_codes: List[str] = []
+        self.party_index: Dict[str, int] = {}
+        for riding in ridings:
+            for party_vote in riding["voteDistribution"]:
+                code = sys.intern(party_vote["partyCode"])
+                if code not in self.party_index:
+                    self.party_index[code] = len(self.party_codes)
+                    self.party_codes.append(code)
+        self.num_parties = len(self.party_codes)
+
+        # Riding metadata (names are interned so identical EN/FR names share one string)
+        self.riding_codes = np.array([r["ridingCode"] for r in ridings], dtype=np.int64)
+        self.row_by_code = {int(code): row for row, code in enumerate(self.riding_codes)}
+        self.names_en = [sys.intern(r["ridingName_EN"]) for r in ridings]
+        self.names_fr = [sys.intern(r.get("ridingName_FR") or r["ridingName_EN"]) for r in ridings]
+        self.localizer = Localizer(self.names_en, self.names_fr)
+        self.province_list = sorted({sys.intern(r["provCode"]) for r in ridings})
+        self.province_index = np.array(
+            [self.province_list.index(r["provCode"]) for r in ridings], dtype=np.int8
+        )
+        self.province_codes = np.array(self.province_list)[self.province_index]
+        self.valid_votes = np.array([r.get("validVotes", 0) for r in ridings], dtype=np.int32)
+        self.rejected_votes = np.array([r.get("rejectedVotes", 0) for r in ridings], dtype=np.int32)
+        self.total_votes = np.array([r.get("totalVotes", 0) for r in ridings], dtype=np.int32)
+        self.registered_voters = np.array([r.get("registeredVoters", 0) for r in ridings], dtype=np.int32)
+        self.turnout = np.array([r.get("turnout", 0.0) for r in ridings], dtype=np.float64)
+
+        # Riding x party matrices
+        shape = (self.num_ridings, self.num_parties)
+        self.votes = np.zeros(shape, dtype=np.int32)
+        self.vote_percent = np.zeros(shape, dtype=np.float64)
+        self.has_party = np.zeros(shape, dtype=bool)
+        # Position of each party on each riding's ballot (NOT_ON_BALLOT when absent)
+        self.ballot_position = np.full(shape, NOT_ON_BALLOT, dtype=np.int8)
+        for row, riding in enumerate(ridings):
+            for position, party_vote in enumerate(riding["voteDistribution"]):
+                col = self.party_index[party_vote["partyCode"]]
+                self.votes[row, col] = party_vote["votes"]
+                self.vote_percent[row, col] = party_vote["votePercent"]
+                self.has_party[row, col] = True
+                self.ballot_position[row, col] = position
+
+        # Party columns of each riding in finishing order, reused by the ranking queries
+        self.order = self.ranked_parties()
+
+        # Winner and runner-up per riding (-1 when a riding has no votes cast)
+        rows = np.arange(self.num_ridings)
+        order = self.order
+        self.winner = order[:, 0].copy()
+        self.winner[self.votes[rows, self.winner] <= 0] = -1
+        if self.num_parties > 1:
+            top, second = order[:, 0], order[:, 1]
+            self.runner_up = second
+            self.vote_margin = self.votes[rows, top] - self.votes[rows, second]
+            self.percent_margin = (
+                self.vote_percent[rows, top] - self.vote_percent[rows, second]
+            )
+        else:
+            self.runner_up = np.full(self.num_ridings, -1)
+            self.vote_margin = np.zeros(self.num_ridings, dtype=np.int64)
+            self.percent_margin = np.zeros(self.num_ridings, dtype=np.float64)
+
+        # Finishing position of each party in each riding (1 = won, 0 = did not receive votes)
+        self.rank = np.zeros(shape, dtype=np.int8)
+        self.rank[rows[:, None], order] = np.arange(1, self.num_parties + 1, dtype=np.int8)
+        self.rank[self.votes <= 0] = 0
+
+        # Head-to-head table: head_to_head[a, b] is the number of ridings where
+        # party a finished ahead of party b
+        contested = self.votes > 0
+        self.head_to_head = np.zeros((self.num_parties, self.num_parties), dtype=np.int64)
+        for col in range(self.num_parties):
+            ahead = (self.votes[:, col:col + 1] > self.votes) & contested[:, col:col + 1]
+            self.head_to_head[col] = ahead.sum(axis=0)
+
+        # Boolean row masks per province
+        self.province_masks: Dict[str, np.ndarray] = {
+            code: self.province_index == i for i, code in enumerate(self.province_list)
+        }
+
+        # Riding records are views over the arrays above
+        self.ridings = [RidingRecord(self, row) for row in range(self.num_ridings)]
+
+    @classmethod
+    def from_file(cls, path: str) -> "ElectionDataset":
+        """Load a dataset from a riding-level JSON file, versioned by the file's content hash."""
+        with open(path, 'rb') as f:
+            content = f.read()
+        return cls(json.loads(content), hashlib.sha256(content).hexdigest()[:16])
+
+    def vote_distribution(self, row: int) -> List[Dict[str, Any]]:
+        """Return a new list of the party votes of a riding, in ballot (data file) order."""
+        votes = self.votes[row].tolist()
+        vote_percent = self.vote_percent[row].tolist()
+        cols = np.flatnonzero(self.has_party[row])
+        cols = cols[np.argsort(self.ballot_position[row, cols], kind="stable")]
+        return [
+            {"partyCode": self.party_codes[col], "votes": votes[col], "votePercent": vote_percent[col]}
+            for col in cols.tolist()
+        ]
+
+    def memory_usage(self) -> Dict[str, Any]:
+        """Return the approximate memory footprint of the dataset in bytes."""
+        array_bytes = sum(
+            value.nbytes for value in vars(self).values() if isinstance(value, np.ndarray)
+        )
+        array_bytes += sum(mask.nbytes for mask in self.province_masks.values())
+        names_fr = self.localizer.riding_names["FR"]
+        names = {id(name): name for name in self.names_en + self.names_fr + names_fr}
+        string_bytes = sum(sys.getsizeof(name) for name in names.values())
+        list_bytes = sum(sys.getsizeof(values) for values in (self.names_en, self.names_fr, names_fr, self.ridings))
+        record_bytes = sum(sys.getsizeof(riding) for riding in self.ridings)
+        index_bytes = sys.getsizeof(self.row_by_code)
+        total = array_bytes + string_bytes + list_bytes + record_bytes + index_bytes
+        return {
+            "ridings": self.num_ridings,
+            "parties": self.num_parties,
+            "arrayBytes": int(array_bytes),
+            "stringBytes": string_bytes,
+            "recordBytes": record_bytes + list_bytes + index_bytes,
+            "totalBytes": int(total),
+            "bytesPerRiding": round(total / self.num_ridings, 1) if self.num_ridings else 0.0
+        }
+
+    def pair_margin(self, party_a: int, party_b: int) -> np.ndarray:
+        """Return the per-riding percentage-point margin of party column a over party column b."""
+        return self.vote_percent[:, party_a] - self.vote_percent[:, party_b]
+
+    def rows_for_codes(self, riding_codes: List[int]) -> np.ndarray:
+        """Return a boolean row mask selecting the given riding codes (unknown codes are ignored)."""
+        mask = np.zeros(self.num_ridings, dtype=bool)
+        rows = [self.row_by_code[code] for code in riding_codes if code in self.row_by_code]
+        mask[rows] = True
+        return mask
+
+    def summarize_mask(self, mask: np.ndarray, region_name: Optional[str] = None,
+                       region_code: Optional[str] = None, language: str = DEFAULT_LANGUAGE) -> Dict[str, Any]:
+        """
+        Summarize election results for the ridings selected by a boolean row mask.
+
+        Returns the same structure as `summarize_results`, computed with masked
+        vectorized sums over the vote matrix.
+
+        Args:
+            mask: Boolean array with one entry per riding
+            region_name: Name of the region
+            region_code: Code of the region
+            language: Language of the party names ('EN' or 'FR')
+
+        Returns:
+            Dictionary with summary statistics
+        """
+        party_votes = self.votes[mask].sum(axis=0, dtype=np.int64)
+        present = self.has_party[mask]
+        # Parties in the order summarize_results first meets them (riding by riding,
+        # in ballot order), which decides the order of parties tied on both seats and votes
+        cols = np.flatnonzero(present.any(axis=0))
+        first_rows = np.argmax(present, axis=0)[cols]
+        positions = self.ballot_position[mask][first_rows, cols]
+        cols = cols[np.lexsort((positions, first_rows))]
+        winners = self.winner[mask]
+        party_seats = np.bincount(winners[winners >= 0], minlength=self.num_parties)
+        total_votes = int(party_votes.sum())
+
+        parties_data = []
+        for col in cols:
+            party_code = self.party_codes[col]
+            votes = int(party_votes[col])
+            vote_percent = (votes / total_votes * 100) if total_votes > 0 else 0
+
+            parties_data.append({
+                "partyCode": party_code,
+                "partyName": party_name(party_code, language),
+                "seats": int(party_seats[col]),
+                "votes": votes,
+                "votePercent": round(vote_percent, 2)
+            })
+
+        # Sort by seats (descending), then by votes (descending)
+        parties_data.sort(key=lambda x: (-x["seats"], -x["votes"]))
+
+        summary = {
+            "totalRidings": int(np.count_nonzero(mask)),
+            "totalVotes": total_votes,
+            "parties": parties_data
+        }
+
+        if region_name:
+            summary["regionName"] = region_name
+        if region_code:
+            summary["regionCode"] = region_code
+
+        return summary
+
+    def ranked_parties(self) -> np.ndarray:
+        """
+        Return the party columns of each riding sorted by votes (descending).
+
+        Parties on the ballot come first, ties in ballot order (the order of the
+        riding's vote distribution), so that column 0 is the winner and column 1
+        the runner-up exactly as a stable sort of the vote distribution would give.
+        """
+        ranked = np.where(self.has_party, self.votes.astype(np.int64), -1)
+        return np.lexsort((self.ballot_position, -ranked), axis=1)
+
+    def _riding_fields(self, row: int, language: str = DEFAULT_LANGUAGE) -> Dict[str, Any]:
+        """Return the identifying fields of a riding in the tools' output format."""
+        province_code = self.province_list[self.province_index[row]]
+        return {
+            "ridingCode": int(self.riding_codes[row]),
+            "ridingName": self.localizer.riding_name(row, language),
+            "province": province_code,
+            "provinceName": province_name(province_code, language)
+        }
+
+    def _party_fields(self, row: int, col: int, language: str = DEFAULT_LANGUAGE) -> Dict[str, Any]:
+        """Return a party's result in a riding in the tools' output format."""
+        code = self.party_codes[col]
+        return {
+            "partyCode": code,
+            "partyName": party_name(code, language),
+            "votes": int(self.votes[row, col]),
+            "votePercent": float(self.vote_percent[row, col])
+        }
+
+    def closest_ridings(self, num_results: int = 10, party_code: Optional[str] = None,
+                        language: str = DEFAULT_LANGUAGE) -> Dict[str, Any]:
+        """
+        Find the ridings with the smallest margins between the winner and the runner-up.
+
+        Vectorized equivalent of `utils.closest_ridings` over the dataset's ridings.
+
+        Args:
+            num_results: Number of results to return for each ordering
+            party_code: Optional party code; only ridings won by this party are included
+            language: Language of the riding, province and party names ('EN' or 'FR')
+
+        Returns:
+            Dictionary with the closest ridings by vote margin and by percentage margin
+        """
+        order = self.order
+        rows = np.flatnonzero(self.has_party.sum(axis=1) >= 2)
+        top, second = order[rows, 0], order[rows, min(1, self.num_parties - 1)]
+        if party_code:
+            keep = top == self.party_index.get(party_code, -1)
+            rows, top, second = rows[keep], top[keep], second[keep]
+        vote_margin = self.votes[rows, top].astype(np.int64) - self.votes[rows, second]
+        percent_margin = self.vote_percent[rows, top] - self.vote_percent[rows, second]
+
+        def entries(indices: np.ndarray) -> List[Dict[str, Any]]:
+            result = []
+            for i in indices.tolist():
+                entry = self._riding_fields(rows[i], language)
+                entry["winner"] = self._party_fields(rows[i], top[i], language)
+                entry["runnerUp"] = self._party_fields(rows[i], second[i], language)
+                entry["voteMargin"] = int(vote_margin[i])
+                entry["percentMargin"] = float(percent_margin[i])
+                result.append(entry)
+            return result
+
+        return {
+            "byVoteMargin": entries(np.argsort(vote_margin, kind="stable")[:num_results]),
+            "byPercentMargin": entries(np.argsort(percent_margin, kind="stable")[:num_results])
+        }
+
+    def best_and_worst(self, party_code: str, num_entries: int = 10,
+                       language: str = DEFAULT_LANGUAGE) -> Dict[str, Any]:
+        """
+        Find the best and worst results of a party.
+
+        Vectorized equivalent of `utils.best_and_worst` over the dataset's ridings.
+
+        Args:
+            party_code: Party code (e.g., 'LPC')
+            num_entries: Number of entries to return for each category
+            language: Language of the riding, province and party names ('EN' or 'FR')
+
+        Returns:
+            Dictionary with the top and worst ridings by vote percentage, the largest
+            winning margins and the largest losing margins
+        """
+        col = self.party_index.get(party_code)
+        if col is None:
+            return {"topByVotePercent": [], "topByWinningMargin": [],
+                    "worstByVotePercent": [], "worstByLosingMargin": []}
+
+        order = self.order
+        rows = np.flatnonzero(self.has_party[:, col])
+        winner, second = order[rows, 0], order[rows, min(1, self.num_parties - 1)]
+        won = winner == col
+        win = won & (self.has_party[rows].sum(axis=1) >= 2)
+        win_rows, runner_up = rows[win], second[win]
+        loss_rows, loss_winner = rows[~won], winner[~won]
+        percent = self.vote_percent[rows, col]
+        win_margin = self.vote_percent[win_rows, col] - self.vote_percent[win_rows, runner_up]
+        loss_margin = self.vote_percent[loss_rows, loss_winner] - self.vote_percent[loss_rows, col]
+
+        def entries(selected: np.ndarray, others: Optional[np.ndarray] = None,
+                    key: Optional[str] = None, margins: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+            result = []
+            for i, row in enumerate(selected.tolist()):
+                entry = self._riding_fields(row, language)
+                entry["votes"] = int(self.votes[row, col])
+                entry["votePercent"] = float(self.vote_percent[row, col])
+                if key is not None:
+                    entry[key] = self._party_fields(row, others[i], language)
+                    entry["margin"] = float(margins[i])
+                result.append(entry)
+            return result
+
+        top = np.argsort(-percent, kind="stable")[:num_entries]
+        worst = np.argsort(percent, kind="stable")[:num_entries]
+        top_win = np.argsort(-win_margin, kind="stable")[:num_entries]
+        top_loss = np.argsort(-loss_margin, kind="stable")[:num_entries]
+        return {
+            "topByVotePercent": entries(rows[top]),
+            "topByWinningMargin": entries(win_rows[top_win], runner_up[top_win], "runnerUp", win_margin[top_win]),
+            "worstByVotePercent": entries(rows[worst]),
+            "worstByLosingMargin": entries(loss_rows[top_loss], loss_winner[top_loss], "winner", loss_margin[top_loss])
+        }
@@ -0,0 +1,133 @@
+"""
+Vote-efficiency metrics for the Elections Canada MCP Server.
+
+A single vectorized pass over the riding x party vote matrix classifies every
+vote of every riding as effective or wasted:
+
+- losing votes: every vote for a party that did not win the riding
+- surplus votes: the winner's votes beyond the one vote it needed to beat the
+  runner-up
+
+The per-riding votes, seats, losing and surplus votes of each party are stacked
+into one matrix and summed per province once, so the national and provincial
+metrics are precomputed and a custom set of ridings is a single masked sum.
+From those totals the following are derived:
+
+- votes per seat of each party
+- efficiency gap between the two leading parties: the difference of their
+  wasted votes as a share of all votes cast (positive when it favours the first)
+- Gallagher index: sqrt(1/2 x sum of squared vote/seat percentage differences)
+- Loosemore-Hanby index: 1/2 x sum of absolute vote/seat percentage differences
+"""
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from .dataset import ElectionDataset
+from .localization import DEFAULT_LANGUAGE, party_name
+
+# Blocks of the stacked per-riding matrix, each with one column per party
+EFFICIENCY_BLOCKS = ("votes", "seats", "losingVotes", "surplusVotes")
+
+
+class EfficiencyIndex:
+    """Wasted votes and disproportionality totals per province and nationally."""
+
+    def __init__(self, dataset: ElectionDataset):
+        self.dataset = dataset
+        votes = dataset.votes.astype(np.int64)
+        cols = np.arange(dataset.num_parties)
+        won = dataset.winner[:, None] == cols[None, :]
+
+        # Votes of the runner-up of each riding (0 when it has a single party)
+        rows = np.arange(dataset.num_ridings)
+        if dataset.num_parties > 1:
+            runner_up_votes = votes[rows, dataset.runner_up]
+        else:
+            runner_up_votes = np.zeros(dataset.num_ridings, dtype=np.int64)
+
+        losing = np.where(won, 0, votes)
+        surplus = np.where(won, np.maximum(votes - runner_up_votes[:, None] - 1, 0), 0)
+        self.stacked = np.concatenate((votes, won.astype(np.int64), losing, surplus), axis=1)
+
+        # Province totals (one row per province) and national totals
+        self.province_totals = np.zeros((len(dataset.province_list), self.stacked.shape[1]), dtype=np.int64)
+        np.add.at(self.province_totals, dataset.province_index, self.stacked)
+        self.national_totals = self.province_totals.sum(axis=0)
+
+    def totals(self, province_code: Optional[str] = None,
+               mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Return the stacked totals of a custom set of ridings, a province or all ridings."""
+        if mask is not None:
+            return self.stacked[mask].sum(axis=0)
+        if province_code is not None:
+            return self.province_totals[self.dataset.province_list.index(province_code)]
+        return self.national_totals
+
+    def metrics(self, province_code: Optional[str] = None,
+                mask: Optional[np.ndarray] = None, language: str = DEFAULT_LANGUAGE) -> Dict[str, Any]:
+        """
+        Compute the vote-efficiency metrics of a set of ridings.
+
+        Args:
+            province_code: Optional province (ignored when a mask is given)
+            mask: Optional boolean mask of the ridings (default: all ridings)
+            language: Language of the party names ('EN' or 'FR')
+
+        Returns:
+            Dictionary with the wasted votes and votes per seat of each party, the
+            efficiency gap between the two leading parties and the Gallagher and
+            Loosemore-Hanby indices
+        """
+        num_parties = self.dataset.num_parties
+        votes, seats, losing, surplus = self.totals(province_code, mask).reshape(
+            len(EFFICIENCY_BLOCKS), num_parties)
+        wasted = losing + surplus
+        total_votes, total_seats = int(votes.sum()), int(seats.sum())
+        vote_share = votes / total_votes * 100 if total_votes else np.zeros(num_parties)
+        seat_share = seats / total_seats * 100 if total_seats else np.zeros(num_parties)
+        difference = vote_share - seat_share
+
+        parties = []
+        for col in np.flatnonzero((votes > 0) | (seats > 0)).tolist():
+            code = self.dataset.party_codes[col]
+            parties.append({
+                "partyCode": code,
+                "partyName": party_name(code, language),
+                "votes": int(votes[col]),
+                "seats": int(seats[col]),
+                "votePercent": round(float(vote_share[col]), 2),
+                "seatPercent": round(float(seat_share[col]), 2),
+                "votesPerSeat": round(float(votes[col] / seats[col])) if seats[col] else None,
+                "losingVotes": int(losing[col]),
+                "surplusVotes": int(surplus[col]),
+                "wastedVotes": int(wasted[col]),
+                "wastedPercent": round(float(wasted[col] / votes[col] * 100), 2) if votes[col] else 0.0
+            })
+        parties.sort(key=lambda x: (-x["seats"], -x["votes"]))
+
+        efficiency_gap = None
+        if len(parties) > 1 and total_votes:
+            first, second = (self.dataset.party_index[p["partyCode"]] for p in parties[:2])
+            gap = (wasted[second] - wasted[first]) / total_votes * 100
+            efficiency_gap = {
+                "parties": [self.dataset.party_codes[first], self.dataset.party_codes[second]],
+                "gapPercent": round(float(gap), 2),
+                "favours": self.dataset.party_codes[first if gap >= 0 else second]
+            }
+
+        if mask is None:
+            mask = self.dataset.province_masks[province_code] if province_code is not None else None
+        ridings = self.dataset.num_ridings if mask is None else int(np.count_nonzero(mask))
+        return {
+            "totalRidings": ridings,
+            "totalVotes": total_votes,
+            "wastedVotes": int(wasted.sum()),
+            "wastedPercent": round(float(wasted.sum() / total_votes * 100), 2) if total_votes else 0.0,
+            "votesPerSeat": round(total_votes / total_seats) if total_seats else None,
+            "efficiencyGap": efficiency_gap,
+            "gallagherIndex": round(float(np.sqrt((difference ** 2).sum() / 2)), 2),
+            "loosemoreHanbyIndex": round(float(np.abs(difference).sum() / 2), 2),
+            "parties": parties
+        }
@@ -0,0 +1,303 @@
+"""
+Registry of the elections loaded by the Elections Canada MCP Server.
+
+Each election is an `ElectionDataset` identified by its year (taken from the
+data file name, e.g. `2019_riding_vote_ElectionsCanada.json` is election
+"2019"). Besides the bundled file, riding-level files in the same format are
+picked up from the directory named by the `ELECTIONS_DATA_DIR` environment
+variable.
+
+Transposition tables (see `transposition.py`) found in the same directories
+define virtual elections: `<election>@<table>` is the election projected onto
+the table's target boundaries. Virtual elections are built on first use and
+behave like any other election.
+
+Every election has an `ElectionContext` holding the lookups and indexes the
+tools use; comparisons between two elections are built once per pair of
+dataset snapshots and reused.
+"""
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .dataset import ElectionDataset
+from .efficiency import EfficiencyIndex
+from .electoral_systems import SeatSimulator
+from .export import VoteTableExporter
+from .flips import FlipAnalyzer
+from .regions import MAX_REGIONS, RegionRegistry
+from .shares import ShareIndex
+from .similarity import SimilarityIndex
+from .swing import ElectionComparison
+from .transposition import TranspositionError, TranspositionTable
+from .turnout import TurnoutIndex
+from .utils import normalize_text
+
+# Riding-level data files, named after the election year
+ELECTION_FILE_PATTERN = re.compile(r"^(\d{4})_riding_vote.*\.json$")
+# Transposition tables, named <name>_transposition.csv or .json
+TRANSPOSITION_FILE_PATTERN = re.compile(r"^(.+)_transposition\.(csv|json)$")
+# Separator between the election and the table in a virtual election identifier
+TRANSPOSITION_SEPARATOR = "@"
+
+
+class ElectionError(ValueError):
+    """Raised when an election reference cannot be resolved."""
+
+
+class ElectionContext:
+    """An election's dataset with the lookups and indexes built over it."""
+
+    def __init__(self, election_id: str, dataset: ElectionDataset, source: str,
+                 max_regions: int = MAX_REGIONS):
+        self.election_id = election_id
+        self.dataset = dataset
+        self.source = source
+        self.riding_lookup = {riding["ridingCode"]: riding for riding in dataset.ridings}
+        # Normalized English and French riding names -> riding codes
+        self.riding_names: Dict[str, List[int]] = {}
+        for code, name_en, name_fr in zip(dataset.riding_codes.tolist(), dataset.names_en, dataset.names_fr):
+            for name in dict.fromkeys((normalize_text(name_en), normalize_text(name_fr))):
+                self.riding_names.setdefault(name, []).append(code)
+        self.province_lookup: Dict[str, list] = {}
+        for riding in dataset.ridings:
+            self.province_lookup.setdefault(riding["provCode"], []).append(riding)
+        self.regions = RegionRegistry(dataset, max_regions)
+        self.shares = ShareIndex(dataset)
+        self.exporter = VoteTableExporter(dataset)
+        self._similarity: Optional[SimilarityIndex] = None
+        self._turnout: Optional[TurnoutIndex] = None
+        self._seats: Optional[SeatSimulator] = None
+        self._flips: Optional[FlipAnalyzer] = None
+        self._efficiency: Optional[EfficiencyIndex] = None
+
+    def resolve_riding(self, reference: Union[int, str]) -> Tuple[Optional[int], List[int]]:
+        """
+        Resolve a riding code or name (English or French, accent- and case-insensitive).
+
+        A name matches a riding whose full normalized name is equal to it, or else
+        every riding whose normalized name contains it.
+
+        Returns:
+            The riding code and an empty list when the reference matches exactly one
+            riding; None and the matching codes when it is ambiguous; None and an
+            empty list when nothing matches
+        """
+        if isinstance(reference, int) or str(reference).strip().isdigit():
+            code = int(reference)
+            return (code, []) if code in self.riding_lookup else (None, [])
+        key = normalize_text(str(reference))
+        if not key:
+            return None, []
+        codes = self.riding_names.get(key)
+        if codes is None:
+            codes = list(dict.fromkeys(
+                code for name, matches in self.riding_names.items() if key in name for code in matches
+            ))
+        if len(codes) == 1:
+            return codes[0], []
+        return None, codes
+
+    @property
+    def similarity(self) -> SimilarityIndex:
+        """Similarity index of the election, built on first use."""
+        if self._similarity is None:
+            self._similarity = SimilarityIndex(self.dataset)
+        return self._similarity
+
+    @property
+    def turnout(self) -> TurnoutIndex:
+        """Turnout index of the election, built on first use."""
+        if self._turnout is None:
+            self._turnout = TurnoutIndex(self.dataset)
+        return self._turnout
+
+    @property
+    def seats(self) -> SeatSimulator:
+        """Seat simulator of the election, built on first use."""
+        if self._seats is None:
+            self._seats = SeatSimulator(self.dataset)
+        return self._seats
+
+    @property
+    def flips(self) -> FlipAnalyzer:
+        """Seat-flip costs of the election, built on first use."""
+        if self._flips is None:
+            self._flips = FlipAnalyzer(self.dataset)
+        return self._flips
+
+    @property
+    def efficiency(self) -> EfficiencyIndex:
+        """Vote-efficiency totals of the election, built on first use."""
+        if self._efficiency is None:
+            self._efficiency = EfficiencyIndex(self.dataset)
+        return self._efficiency
+
+
+class ElectionRegistry:
+    """Elections keyed by identifier, with a cache of aligned election comparisons."""
+
+    def __init__(self, max_comparisons: int = 16, max_regions: int = MAX_REGIONS):
+        self.contexts: Dict[str, ElectionContext] = {}
+        self.tables: Dict[str, TranspositionTable] = {}
+        self.default: Optional[str] = None
+        self.max_comparisons = max_comparisons
+        self.max_regions = max_regions
+        self._comparisons: "OrderedDict[Tuple[str, str], ElectionComparison]" = OrderedDict()
+        self._lock = threading.RLock()
+        # Incremented on every change so that cached results can be invalidated
+        self.version = 0
+
+    def add(self, election_id: str, dataset: ElectionDataset, source: Optional[str] = None,
+            default: bool = False) -> ElectionContext:
+        """Register an election (replacing any election with the same identifier)."""
+        context = ElectionContext(election_id, dataset, source or "memory", self.max_regions)
+        with self._lock:
+            self.contexts[election_id] = context
+            if default or self.default is None:
+                self.default = election_id
+            self.version += 1
+        return context
+
+    def add_table(self, table: TranspositionTable) -> None:
+        """Register a transposition table, dropping the virtual elections built from a previous version."""
+        with self._lock:
+            self.tables[table.name] = table
+            suffix = f"{TRANSPOSITION_SEPARATOR}{table.name}"
+            for election_id in [e for e in self.contexts if e.endswith(suffix)]:
+                del self.contexts[election_id]
+            self.version += 1
+
+    def load_directory(self, directory: str) -> List[str]:
+        """
+        Load every riding-level election file and transposition table of a directory.
+
+        Files already loaded (same path) are skipped, as are files for an election
+        identifier that is already registered.
+
+        Returns:
+            Identifiers of the elections and names of the tables that were loaded
+        """
+        loaded = []
+        if not directory or not os.path.isdir(directory):
+            return loaded
+        known_paths = {os.path.realpath(context.source) for context in self.contexts.values()}
+        for filename in sorted(os.listdir(directory)):
+            path = os.path.join(directory, filename)
+            if os.path.realpath(path) in known_paths:
+                continue
+            election = ELECTION_FILE_PATTERN.match(filename)
+            table = TRANSPOSITION_FILE_PATTERN.match(filename)
+            if election and election.group(1) not in self.contexts:
+                self.add(election.group(1), ElectionDataset.from_file(path), path)
+                loaded.append(election.group(1))
+            elif table and table.group(1) not in self.tables:
+                self.add_table(TranspositionTable.from_file(path, table.group(1)))
+                loaded.append(table.group(1))
+        return loaded
+
+    def get(self, election_id: Optional[str] = None) -> ElectionDataset:
+        """Return an election's dataset (the default election when None)."""
+        return self.context(election_id).dataset
+
+    def context(self, election_id: Optional[str] = None) -> ElectionContext:
+        """Return an election's context (the default election when None)."""
+        return self.contexts[self.resolve(election_id)]
+
+    def resolve(self, election_id: Optional[str] = None) -> str:
+        """
+        Return the identifier of an election (the default election when None),
+        building virtual transposed elections on first use.
+        """
+        if election_id is None or str(election_id).strip() == "":
+            return self.default
+        key = str(election_id).strip()
+        if key in self.contexts:
+            return key
+        if TRANSPOSITION_SEPARATOR in key:
+            return self.transpose(*key.rsplit(TRANSPOSITION_SEPARATOR, 1))
+        raise ElectionError(
+            f"Unknown election {election_id}; available elections: {', '.join(self.contexts)}"
+        )
+
+    def transpose(self, election_id: Optional[str], table_name: str) -> str:
+        """
+        Project an election onto the boundaries of a transposition table and register
+        the result as the virtual election `<election>@<table>`.
+
+        Returns:
+            Identifier of the virtual election
+        """
+        source_id = self.resolve(election_id)
+        if table_name not in self.tables:
+            raise ElectionError(
+                f"Unknown transposition table {table_name}; available tables: "
+                f"{', '.join(self.tables) or 'none'}"
+            )
+        key = f"{source_id}{TRANSPOSITION_SEPARATOR}{table_name}"
+        with self._lock:
+            if key in self.contexts:
+                return key
+            try:
+                dataset = self.tables[table_name].project(self.contexts[source_id].dataset)
+            except TranspositionError as e:
+                raise ElectionError(str(e))
+            self.add(key, dataset, f"{self.contexts[source_id].source}{TRANSPOSITION_SEPARATOR}{table_name}")
+        return key
+
+    def _registered(self, election_id: Optional[str]) -> Optional[ElectionContext]:
+        """Return the context of a registered election without building virtual elections."""
+        key = self.default if election_id is None else str(election_id).strip()
+        return self.contexts.get(key or self.default)
+
+    def snapshot(self, election_id: Optional[str]) -> Optional[str]:
+        """Return the dataset snapshot of a registered election, or None (virtual elections are not built)."""
+        context = self._registered(election_id)
+        return context.dataset.snapshot if context is not None else None
+
+    def regions_version(self, election_id: Optional[str] = None) -> int:
+        """
+        Return a counter that changes whenever a custom region of an election changes
+        (0 for virtual elections that are not built yet).
+        """
+        context = self._registered(election_id)
+        return context.regions.version if context is not None else 0
+
+    def compare(self, base_id: str, target_id: Optional[str] = None) -> ElectionComparison:
+        """Return the comparison of two elections, building it on first use."""
+        base_key, target_key = self.resolve(base_id), self.resolve(target_id)
+        if base_key == target_key:
+            raise ElectionError("Two different elections are required")
+        base, target = self.contexts[base_key].dataset, self.contexts[target_key].dataset
+        pair = (base.snapshot, target.snapshot)
+        with self._lock:
+            comparison = self._comparisons.get(pair)
+            if comparison is not None:
+                self._comparisons.move_to_end(pair)
+                return comparison
+        comparison = ElectionComparison(base, target)
+        with self._lock:
+            self._comparisons[pair] = comparison
+            while len(self._comparisons) > self.max_comparisons:
+                self._comparisons.popitem(last=False)
+        return comparison
+
+    def list(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Describe the registered elections and transposition tables."""
+        return {
+            "elections": [
+                {
+                    "election": election_id,
+                    "default": election_id == self.default,
+                    "ridings": context.dataset.num_ridings,
+                    "parties": list(context.dataset.party_codes),
+                    "snapshot": context.dataset.snapshot,
+                    "source": os.path.basename(context.source)
+                }
+                for election_id, context in list(self.contexts.items())
+            ],
+            "transpositionTables": [table.describe() for table in self.tables.values()]
+        }
@@ -0,0 +1,266 @@
+"""
+Electoral system simulation for the Elections Canada MCP Server.
+
+Seats are re-allocated from the party vote totals of each province (the same
+totals `summarize_results` reports) under proportional and mixed-member
+systems, so the results can be compared with the first-past-the-post seats:
+
+- dhondt / sainte_lague: highest-averages methods, allocated seat by seat from
+  a heap of party quotients (O(seats x log parties))
+- largest_remainder: Hare quota, with the remaining seats going to the largest
+  remainders
+- mmp: the ridings keep their first-past-the-post winners and compensatory list
+  seats are added, each going to the party with the highest D'Hondt quotient
+  counting the ridings it already won (additional member system)
+
+Seats can be allocated within each province (each province keeps its number of
+ridings) or in a single national pool. Parties below the vote threshold of an
+allocation region receive no proportional or list seats; a threshold no party
+reaches in a region is an error rather than leaving its seats unallocated.
+
+Under mmp the list seats are added to the ridings, so the chamber is larger than
+under first-past-the-post: seat changes are reported both in seats and in
+percentage points of the chamber.
+"""
+
+import heapq
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from .constants import PROVINCE_CODE_TO_NAME
+from .dataset import ElectionDataset
+from .localization import DEFAULT_LANGUAGE, party_name
+from .utils import normalize_text
+
+ALLOCATION_METHODS = ("dhondt", "sainte_lague", "largest_remainder", "mmp")
+# Accepted spellings of each method (normalized, without apostrophes or underscores)
+METHOD_ALIASES = {
+    "dhondt": "dhondt",
+    "jefferson": "dhondt",
+    "saintelague": "sainte_lague",
+    "webster": "sainte_lague",
+    "largestremainder": "largest_remainder",
+    "hare": "largest_remainder",
+    "hamilton": "largest_remainder",
+    "mmp": "mmp",
+    "mixedmemberproportional": "mmp",
+    "ams": "mmp"
+}
+MAJORITY_FRACTION = 0.5
+
+# Divisor of the next seat of a party that already holds n seats
+DIVISORS: Dict[str, Callable[[int], int]] = {
+    "dhondt": lambda n: n + 1,
+    "sainte_lague": lambda n: 2 * n + 1
+}
+
+
+class ElectoralSystemError(ValueError):
+    """Raised when a simulation request is invalid."""
+
+
+def get_method(name: str) -> Optional[str]:
+    """Convert a method name (e.g. "D'Hondt", "Sainte-Laguë", "MMP") to its canonical name."""
+    return METHOD_ALIASES.get(normalize_text(name).replace("'", "").replace("_", ""))
+
+
+def highest_averages(votes: np.ndarray, seats: int, method: str = "dhondt",
+                     initial: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Allocate seats with a highest-averages method using a heap of party quotients.
+
+    Args:
+        votes: Votes of each party (parties with no votes receive no seats)
+        seats: Number of seats to allocate
+        method: 'dhondt' or 'sainte_lague'
+        initial: Seats each party already holds, counted in its divisors (for
+                 compensatory list seats); these are not part of the `seats` allocated
+
+    Returns:
+        Seats allocated to each party (including the initial seats)
+    """
+    divisor = DIVISORS[method]
+    allocated = np.zeros(len(votes), dtype=np.int64) if initial is None else initial.astype(np.int64)
+    # Ties go to the party with more votes, then to the first column
+    heap = [(-votes[col] / divisor(allocated[col]), -votes[col], col)
+            for col in np.flatnonzero(votes > 0).tolist()]
+    if not heap:
+        return allocated
+    heapq.heapify(heap)
+    for _ in range(seats):
+        _, negative_votes, col = heapq.heappop(heap)
+        allocated[col] += 1
+        heapq.heappush(heap, (negative_votes / divisor(allocated[col]), negative_votes, col))
+    return allocated
+
+
+def largest_remainder(votes: np.ndarray, seats: int) -> np.ndarray:
+    """
+    Allocate seats with the largest remainder method and the Hare quota.
+
+    Args:
+        votes: Votes of each party (parties with no votes receive no seats)
+        seats: Number of seats to allocate
+
+    Returns:
+        Seats allocated to each party
+    """
+    total = votes.sum()
+    if total <= 0 or seats <= 0:
+        return np.zeros(len(votes), dtype=np.int64)
+    quotas = votes * seats / total
+    allocated = np.floor(quotas).astype(np.int64)
+    remaining = seats - int(allocated.sum())
+    if remaining > 0:
+        # Largest remainders first; ties go to the party with more votes
+        order = np.lexsort((-votes, -(quotas - allocated)))
+        allocated[order[:remaining]] += 1
+    return allocated
+
+
+class SeatSimulator:
+    """Re-allocates the seats of a dataset under other electoral systems."""
+
+    def __init__(self, dataset: ElectionDataset):
+        self.dataset = dataset
+        # Province x party vote totals and first-past-the-post seats
+        provinces = dataset.province_list
+        self.province_votes = np.zeros((len(provinces), dataset.num_parties), dtype=np.int64)
+        np.add.at(self.province_votes, dataset.province_index, dataset.votes)
+        self.province_seats = np.bincount(dataset.province_index, minlength=len(provinces))
+        self.province_fptp = np.zeros((len(provinces), dataset.num_parties), dtype=np.int64)
+        won = dataset.winner >= 0
+        np.add.at(self.province_fptp, (dataset.province_index[won], dataset.winner[won]), 1)
+
+    def allocate(self, method: str, votes: np.ndarray, seats: int, fptp: np.ndarray,
+                 threshold: float, list_seat_share: float, region: str = "the region") -> np.ndarray:
+        """
+        Allocate the seats of one allocation region.
+
+        Args:
+            method: One of ALLOCATION_METHODS
+            votes: Votes of each party in the region
+            seats: Number of ridings in the region
+            fptp: First-past-the-post seats of each party in the region
+            threshold: Minimum vote percentage in the region for proportional seats
+            list_seat_share: For mmp, the share of all seats that are list seats
+            region: Name of the region, for error messages
+
+        Returns:
+            Seats of each party
+
+        Raises:
+            ElectoralSystemError: If votes were cast in the region but no party reaches
+                                  the threshold, so its seats could not be allocated
+        """
+        total = votes.sum()
+        eligible = np.where(votes * 100 >= threshold * total, votes, 0) if total > 0 else votes
+        if total > 0 and seats > 0 and not eligible.any():
+            raise ElectoralSystemError(
+                f"No party reaches the {threshold:g}% threshold in {region}; "
+                f"its {seats} seats cannot be allocated"
+            )
+        if method == "largest_remainder":
+            return largest_remainder(eligible, seats)
+        if method == "mmp":
+            list_seats = int(round(seats * list_seat_share / (1 - list_seat_share)))
+            return highest_averages(eligible, list_seats, "dhondt", initial=fptp)
+        return highest_averages(eligible, seats, method)
+
+    def simulate(self, methods: List[str], province_code: Optional[str] = None,
+                 threshold: float = 0.0, regional: bool = True,
+                 list_seat_share: float = 0.4, language: str = DEFAULT_LANGUAGE) -> Dict[str, Any]:
+        """
+        Simulate several electoral systems on the same votes.
+
+        Args:
+            methods: Methods from ALLOCATION_METHODS
+            province_code: Optional province to simulate on its own
+            threshold: Minimum vote percentage for proportional or list seats,
+                       within each allocation region
+            regional: Allocate seats province by province (True) or in one national pool
+            list_seat_share: For mmp, the share of all seats that are list seats
+            language: Language of the party names ('EN' or 'FR')
+
+        Returns:
+            Dictionary with the first-past-the-post result and the seats of each party
+            under each method
+        """
+        unknown = [m for m in methods if m not in ALLOCATION_METHODS]
+        if unknown:
+            raise ElectoralSystemError(
+                f"Invalid method {unknown[0]}; expected one of {', '.join(ALLOCATION_METHODS)}"
+            )
+        if not 0 <= threshold < 100:
+            raise ElectoralSystemError("Threshold must be a percentage between 0 and 100")
+        if not 0 < list_seat_share < 1:
+            raise ElectoralSystemError("List seat share must be between 0 and 1")
+
+        if province_code is not None:
+            index = self.dataset.province_list.index(province_code)
+            regions = [index]
+        else:
+            regions = list(range(len(self.dataset.province_list)))
+        votes = self.province_votes[regions]
+        seats = self.province_seats[regions]
+        fptp = self.province_fptp[regions]
+        if not regional:
+            # One national pool
+            votes, seats, fptp = votes.sum(axis=0, keepdims=True), seats.sum(keepdims=True), fptp.sum(
+                axis=0, keepdims=True)
+
+        names = ([PROVINCE_CODE_TO_NAME.get(code, code) for code in (self.dataset.province_list[i] for i in regions)]
+                 if regional else ["the national pool"])
+        total_votes = votes.sum(axis=0)
+        fptp_seats = fptp.sum(axis=0)
+        systems = []
+        for method in methods:
+            party_seats = sum(
+                self.allocate(method, votes[i], int(seats[i]), fptp[i], threshold, list_seat_share, names[i])
+                for i in range(len(seats))
+            )
+            systems.append(self._describe(method, party_seats, total_votes, fptp_seats, language))
+
+        return {
+            "totalRidings": int(self.province_seats[regions].sum()),
+            "threshold": threshold,
+            "allocation": "provincial" if regional else "national",
+            "firstPastThePost": self._describe("fptp", fptp_seats, total_votes, fptp_seats, language),
+            "systems": systems
+        }
+
+    def _describe(self, method: str, party_seats: np.ndarray, total_votes: np.ndarray,
+                  fptp_seats: np.ndarray, language: str = DEFAULT_LANGUAGE) -> Dict[str, Any]:
+        """
+        Describe the seats of each party under a method, next to the FPTP seats. Seat
+        changes are given in seats and in percentage points of each chamber, since the
+        mmp chamber is larger than the FPTP one.
+        """
+        total_seats = int(party_seats.sum())
+        fptp_total = int(fptp_seats.sum())
+        vote_sum = int(total_votes.sum())
+        parties = []
+        for col in np.flatnonzero((total_votes > 0) | (party_seats > 0)).tolist():
+            code = self.dataset.party_codes[col]
+            seat_percent = float(party_seats[col] / total_seats * 100) if total_seats else 0.0
+            fptp_percent = float(fptp_seats[col] / fptp_total * 100) if fptp_total else 0.0
+            parties.append({
+                "partyCode": code,
+                "partyName": party_name(code, language),
+                "votePercent": round(float(total_votes[col] / vote_sum * 100), 2) if vote_sum else 0.0,
+                "seats": int(party_seats[col]),
+                "seatPercent": round(seat_percent, 2),
+                "seatChangeFromFPTP": int(party_seats[col] - fptp_seats[col]),
+                "seatPercentChangeFromFPTP": round(seat_percent - fptp_percent, 2)
+            })
+        parties.sort(key=lambda x: (-x["seats"], -x["votePercent"]))
+        majority = int(total_seats * MAJORITY_FRACTION) + 1
+        return {
+            "method": method,
+            "totalSeats": total_seats,
+            "addedSeats": total_seats - fptp_total,
+            "majorityThreshold": majority,
+            "majority": parties[0]["partyCode"] if parties and parties[0]["seats"] >= majority else None,
+            "parties": parties
+        }
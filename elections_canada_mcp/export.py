@@ -0,0 +1,237 @@
+"""
+Bulk export of the vote table for the Elections Canada MCP Server.
+
+The vote table has one row per riding and party (riding code, riding name,
+province, party code, votes, vote percentage). It is exported in chunks through
+an opaque cursor, so a client can page through the whole table (or a filtered
+slice) without the server ever building the full payload. Each chunk is
+rendered from the dataset arrays in one of three formats:
+
+- csv: comma-separated values, with a header row in the first chunk
+- ndjson: one JSON object per line
+- columnar: an Arrow-style columnar layout, with a JSON schema and one
+  base64-encoded little-endian buffer per column (strings are
+  dictionary-encoded)
+
+Riding names are written in the requested language ('EN' or 'FR').
+
+Run `python -m elections_canada_mcp.export --scale 200` to benchmark export
+throughput on a synthetic poll-level sized table.
+"""
+
+import base64
+import csv
+import io
+import json
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .dataset import ElectionDataset
+from .localization import DEFAULT_LANGUAGE
+
+EXPORT_FORMATS = ("csv", "ndjson", "columnar")
+EXPORT_COLUMNS = ("ridingCode", "ridingName", "province", "partyCode", "votes", "votePercent")
+MAX_CHUNK_SIZE = 10000
+
+
+class ExportError(ValueError):
+    """Raised when an export request or cursor is invalid."""
+
+
+class VoteTableExporter:
+    """Chunked exporter of the riding x party vote table of a dataset."""
+
+    def __init__(self, dataset: ElectionDataset):
+        self.dataset = dataset
+        self._selections: Dict[Tuple[Optional[str], Optional[str]], Tuple[np.ndarray, np.ndarray]] = {}
+
+    def selection(self, province_code: Optional[str] = None,
+                  party_code: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the (row, column) indices of the vote table entries matching the filters."""
+        key = (province_code, party_code)
+        if key not in self._selections:
+            selected = self.dataset.has_party.copy()
+            if province_code:
+                selected &= self.dataset.province_masks.get(
+                    province_code, np.zeros(self.dataset.num_ridings, dtype=bool)
+                )[:, None]
+            if party_code:
+                party_mask = np.zeros(self.dataset.num_parties, dtype=bool)
+                if party_code in self.dataset.party_index:
+                    party_mask[self.dataset.party_index[party_code]] = True
+                selected &= party_mask[None, :]
+            # Row-major order: ridings in data file order, parties in column order
+            self._selections[key] = np.nonzero(selected)
+        return self._selections[key]
+
+    def encode_cursor(self, offset: int) -> str:
+        """Encode an offset into an opaque cursor tied to the dataset snapshot."""
+        return base64.urlsafe_b64encode(f"{self.dataset.snapshot}:{offset}".encode()).decode()
+
+    def decode_cursor(self, cursor: Optional[str]) -> int:
+        """Decode a cursor into an offset, rejecting cursors from another snapshot."""
+        if not cursor:
+            return 0
+        try:
+            snapshot, offset = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+            offset = int(offset)
+        except (ValueError, UnicodeDecodeError):
+            raise ExportError(f"Invalid cursor: {cursor}")
+        if offset < 0:
+            raise ExportError(f"Invalid cursor: {cursor}")
+        if snapshot != self.dataset.snapshot:
+            raise ExportError("Cursor is from a different dataset snapshot; restart the export")
+        return offset
+
+    def export_chunk(self, export_format: str, cursor: Optional[str] = None, chunk_size: int = 1000,
+                     province_code: Optional[str] = None,
+                     party_code: Optional[str] = None, language: str = DEFAULT_LANGUAGE) -> Dict[str, Any]:
+        """
+        Render one chunk of the vote table.
+
+        Args:
+            export_format: 'csv', 'ndjson' or 'columnar'
+            cursor: Cursor returned by the previous chunk (None for the first chunk)
+            chunk_size: Maximum number of rows in the chunk
+            province_code: Optional province code filter
+            party_code: Optional party code filter
+            language: Language of the riding names ('EN' or 'FR')
+
+        Returns:
+            Dictionary with the chunk data, row counts and the cursor of the next
+            chunk (None when the export is complete)
+        """
+        export_format = export_format.lower()
+        if export_format not in EXPORT_FORMATS:
+            raise ExportError(f"Invalid format {export_format}; expected one of {', '.join(EXPORT_FORMATS)}")
+        if chunk_size < 1 or chunk_size > MAX_CHUNK_SIZE:
+            raise ExportError(f"Chunk size must be between 1 and {MAX_CHUNK_SIZE}")
+
+        offset = self.decode_cursor(cursor)
+        rows, cols = self.selection(province_code, party_code)
+        total = len(rows)
+        end = min(offset + chunk_size, total)
+        rows, cols = rows[offset:end], cols[offset:end]
+
+        names = self.dataset.localizer.riding_names[language]
+        if export_format == "csv":
+            data = self._render_csv(rows, cols, names, header=offset == 0)
+        elif export_format == "ndjson":
+            data = self._render_ndjson(rows, cols, names)
+        else:
+            data = self._render_columnar(rows, cols, names)
+
+        return {
+            "format": export_format,
+            "columns": list(EXPORT_COLUMNS),
+            "offset": offset,
+            "rows": int(end - offset) if end > offset else 0,
+            "totalRows": int(total),
+            "nextCursor": self.encode_cursor(end) if end < total else None,
+            "data": data
+        }
+
+    def _columns(self, rows: np.ndarray, cols: np.ndarray, names: List[str]):
+        """Return the column values of the selected entries as Python lists."""
+        dataset = self.dataset
+        return (
+            dataset.riding_codes[rows].tolist(),
+            [names[row] for row in rows.tolist()],
+            [dataset.province_list[i] for i in dataset.province_index[rows].tolist()],
+            [dataset.party_codes[col] for col in cols.tolist()],
+            dataset.votes[rows, cols].tolist(),
+            dataset.vote_percent[rows, cols].tolist()
+        )
+
+    def _render_csv(self, rows: np.ndarray, cols: np.ndarray, names: List[str], header: bool) -> str:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        if header:
+            writer.writerow(EXPORT_COLUMNS)
+        writer.writerows(zip(*self._columns(rows, cols, names)))
+        return buffer.getvalue()
+
+    def _render_ndjson(self, rows: np.ndarray, cols: np.ndarray, names: List[str]) -> str:
+        return "".join(
+            json.dumps(dict(zip(EXPORT_COLUMNS, values))) + "\n"
+            for values in zip(*self._columns(rows, cols, names))
+        )
+
+    def _render_columnar(self, rows: np.ndarray, cols: np.ndarray, names: List[str]) -> Dict[str, Any]:
+        dataset = self.dataset
+
+        def buffer(values: np.ndarray) -> str:
+            return base64.b64encode(np.ascontiguousarray(values).tobytes()).decode("ascii")
+
+        # Riding names are dictionary-encoded by their row in the chunk's riding dictionary
+        unique_rows, riding_index = np.unique(rows, return_inverse=True)
+        return {
+            "length": int(len(rows)),
+            "fields": [
+                {"name": "ridingCode", "type": "<i8", "buffer": buffer(dataset.riding_codes[rows].astype("<i8"))},
+                {"name": "ridingName", "type": "dictionary<i4>", "buffer": buffer(riding_index.astype("<i4")),
+                 "dictionary": [names[row] for row in unique_rows.tolist()]},
+                {"name": "province", "type": "dictionary<i1>",
+                 "buffer": buffer(dataset.province_index[rows].astype("<i1")),
+                 "dictionary": list(dataset.province_list)},
+                {"name": "partyCode", "type": "dictionary<i1>", "buffer": buffer(cols.astype("<i1")),
+                 "dictionary": list(dataset.party_codes)},
+                {"name": "votes", "type": "<i4", "buffer": buffer(dataset.votes[rows, cols].astype("<i4"))},
+                {"name": "votePercent", "type": "<f8",
+                 "buffer": buffer(dataset.vote_percent[rows, cols].astype("<f8"))}
+            ]
+        }
+
+
+def benchmark(scale: int = 100, chunk_size: int = 5000) -> Dict[str, Any]:
+    """
+    Measure export throughput on a synthetic table `scale` times the bundled dataset.
+
+    The synthetic dataset repeats every riding `scale` times with distinct codes,
+    which approximates poll-level row counts.
+    """
+    import os
+
+    data_file = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "datafiles/2021_riding_vote_redistributed_ElectionsCanada.json"
+    )
+    with open(data_file, 'r') as f:
+        ridings = json.load(f)
+    synthetic = [
+        {**riding, "ridingCode": riding["ridingCode"] * 1000 + copy}
+        for copy in range(scale) for riding in ridings
+    ]
+    exporter = VoteTableExporter(ElectionDataset(synthetic))
+
+    results = {}
+    for export_format in EXPORT_FORMATS:
+        start = time.perf_counter()
+        cursor, rows, size = None, 0, 0
+        while True:
+            chunk = exporter.export_chunk(export_format, cursor, chunk_size)
+            rows += chunk["rows"]
+            size += len(json.dumps(chunk))
+            cursor = chunk["nextCursor"]
+            if cursor is None:
+                break
+        elapsed = time.perf_counter() - start
+        results[export_format] = {
+            "rows": rows,
+            "seconds": round(elapsed, 3),
+            "rowsPerSecond": round(rows / elapsed),
+            "megabytes": round(size / 1e6, 2)
+        }
+    return {"ridings": len(synthetic), "chunkSize": chunk_size, "formats": results}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark vote table export throughput")
+    parser.add_argument("--scale", type=int, default=100, help="Copies of each riding in the synthetic table")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+    print(json.dumps(benchmark(args.scale, args.chunk_size), indent=2))
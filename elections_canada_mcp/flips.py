@@ -0,0 +1,120 @@
+"""
+Seat-flip sensitivity for the Elections Canada MCP Server.
+
+For every riding and party, the exact number of votes the party needs to win
+the riding is computed once from the three leading vote counts of each riding,
+in two ways:
+
+- added: new votes for the party (e.g. from non-voters), so it must pass the
+  current leader
+- switched: voters switching from the current winner to the party, so each
+  switched vote counts twice, but the party must also pass the runner-up
+
+Because every riding is worth one seat and ridings are independent, the
+cheapest way for a party to reach a seat target is to flip the ridings with the
+smallest costs: the plan is the k cheapest entries of the party's cost column,
+selected with a partial sort.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .dataset import ElectionDataset
+
+FLIP_MODES = ("added", "switched")
+# Cost of ridings a party cannot win (it received no votes there)
+UNFLIPPABLE = np.iinfo(np.int64).max
+
+
+class FlipAnalyzer:
+    """Votes needed by each party to win each riding, and cheapest paths to a seat target."""
+
+    def __init__(self, dataset: ElectionDataset):
+        self.dataset = dataset
+        votes = dataset.votes.astype(np.int64)
+
+        # The three leading vote counts and the two leading parties of each riding
+        # (padded with empty parties when fewer than three parties are in the dataset)
+        padded = np.concatenate((votes, np.zeros((dataset.num_ridings, 3), dtype=np.int64)), axis=1)
+        order = np.argsort(-padded, axis=1, kind="stable")
+        first, second, third = (np.take_along_axis(padded, order[:, i:i + 1], axis=1)[:, 0]
+                                for i in range(3))
+        leader, runner_up = order[:, 0], order[:, 1]
+
+        cols = np.arange(dataset.num_parties)
+        is_leader = cols[None, :] == leader[:, None]
+        is_runner_up = cols[None, :] == runner_up[:, None]
+
+        # Added votes: pass the strongest other party
+        strongest_other = np.where(is_leader, second[:, None], first[:, None])
+        added = strongest_other - votes + 1
+
+        # Switched votes: take votes from the leader until the party is ahead of it
+        # and of the strongest remaining party
+        strongest_remaining = np.where(is_runner_up, third[:, None], second[:, None])
+        switched = np.maximum((first[:, None] - votes) // 2 + 1, strongest_remaining - votes + 1)
+
+        held = (dataset.winner[:, None] == cols[None, :])
+        unavailable = ~dataset.has_party | (votes <= 0)
+        self.costs = {}
+        for mode, cost in (("added", added), ("switched", switched)):
+            cost = np.where(held, 0, cost)
+            self.costs[mode] = np.where(unavailable & ~held, UNFLIPPABLE, cost)
+        self.seats = np.bincount(dataset.winner[dataset.winner >= 0], minlength=dataset.num_parties)
+
+    def majority(self) -> int:
+        """Return the number of seats needed for a majority."""
+        return self.dataset.num_ridings // 2 + 1
+
+    def plan(self, col: int, seat_target: int, mode: str = "added",
+             mask: Optional[np.ndarray] = None) -> Dict[str, Any]:
+        """
+        Find the cheapest set of ridings a party must flip to reach a seat target.
+
+        Args:
+            col: Party column
+            seat_target: Number of seats to reach
+            mode: 'added' or 'switched'
+            mask: Optional mask of the ridings that may be flipped
+
+        Returns:
+            Dictionary with the current seats, the number of flips needed, the rows
+            to flip (cheapest first), their costs and whether the target is reachable
+        """
+        cost = self.costs[mode][:, col]
+        candidates = (self.dataset.winner != col) & (cost != UNFLIPPABLE)
+        if mask is not None:
+            candidates &= mask
+        rows = np.flatnonzero(candidates)
+        needed = max(0, seat_target - int(self.seats[col]))
+        feasible = needed <= len(rows)
+        k = min(needed, len(rows))
+        if 0 < k < len(rows):
+            rows = rows[np.argpartition(cost[rows], k - 1)[:k]]
+        rows = rows[:k]
+        rows = rows[np.argsort(cost[rows], kind="stable")]
+        return {
+            "seats": int(self.seats[col]),
+            "flipsNeeded": needed,
+            "feasible": feasible,
+            "rows": rows,
+            "costs": cost[rows],
+            "totalVotes": int(cost[rows].sum()) if feasible else None
+        }
+
+    def summary(self, seat_target: int, mode: str = "added",
+                mask: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+        """Return the votes each party needs to reach a seat target."""
+        result = []
+        for col, code in enumerate(self.dataset.party_codes):
+            plan = self.plan(col, seat_target, mode, mask)
+            result.append({
+                "partyCode": code,
+                "seats": plan["seats"],
+                "flipsNeeded": plan["flipsNeeded"],
+                "feasible": plan["feasible"],
+                "totalVotesNeeded": plan["totalVotes"]
+            })
+        result.sort(key=lambda x: (not x["feasible"], x["totalVotesNeeded"] or 0, -x["seats"]))
+        return result
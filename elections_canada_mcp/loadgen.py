@@ -0,0 +1,406 @@
+"""
+Load generator for the Elections Canada MCP Server.
+
+Launches the server locally (the same `main()` entry point as the
+`elections_canada_server` command) and replays a weighted mix of tool calls
+from many concurrent simulated agents, over stdio or over the streamable-HTTP
+transport. Reports throughput, latency percentiles, error rate and the server's
+resident memory over time. Everything runs offline on the local machine.
+
+Examples:
+    elections_canada_loadgen --transport stdio --concurrency 50 --duration 30
+    elections_canada_loadgen --transport streamable-http --concurrency 50 \\
+        --mix search_ridings=5,get_party_votes=5,summarize_national_results=2 \\
+        --max-p99-ms 250 --max-error-rate 0.01
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+
+from .constants import PARTY_CODE_TO_NAME, PROVINCE_CODE_TO_NAME
+
+DATA_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "datafiles/2021_riding_vote_redistributed_ElectionsCanada.json"
+)
+
+# Default mix of tool calls, weighted toward the lookups and summaries agents use most
+DEFAULT_MIX = {
+    "search_ridings": 5,
+    "get_party_votes": 5,
+    "get_winning_party": 2,
+    "summarize_province_results": 3,
+    "summarize_national_results": 2,
+    "find_closest_ridings": 1,
+    "best_and_worst_results": 1,
+}
+
+SEARCH_TERMS = ["toronto", "montreal", "vancouver", "calgary", "edmonton", "ottawa",
+                "st laurent", "halifax", "winnipeg", "quebec", "saint", "north"]
+
+
+class ArgumentGenerator:
+    """Generate random but valid arguments for each tool."""
+
+    def __init__(self, seed: Optional[int] = None):
+        with open(DATA_FILE, 'r') as f:
+            ridings = json.load(f)
+        self.riding_codes = [riding["ridingCode"] for riding in ridings]
+        self.riding_names = [riding["ridingName_EN"] for riding in ridings]
+        self.parties = list(PARTY_CODE_TO_NAME.keys()) + ["Liberal", "Conservative", "NDP"]
+        self.provinces = list(PROVINCE_CODE_TO_NAME.keys()) + ["Ontario", "Quebec", "Alberta"]
+        self.random = random.Random(seed)
+        self.generators: Dict[str, Callable[[], Dict[str, Any]]] = {
+            "search_ridings": lambda: {"search_term": self.random.choice(SEARCH_TERMS)},
+            "get_party_votes": lambda: {
+                "riding_code": self.riding(),
+                **({"party_code": self.random.choice(self.parties)} if self.random.random() < 0.5 else {})
+            },
+            "get_winning_party": lambda: {"riding_code": self.riding()},
+            "summarize_province_results": lambda: {
+                "province_name_or_code": self.random.choice(self.provinces)
+            },
+            "summarize_national_results": lambda: {},
+            "find_closest_ridings": lambda: {
+                "num_results": self.random.choice([5, 10, 20]),
+                **({"party": self.random.choice(self.parties)} if self.random.random() < 0.5 else {})
+            },
+            "best_and_worst_results": lambda: {
+                "party": self.random.choice(self.parties),
+                "num_entries": self.random.choice([5, 10, 20])
+            },
+            "find_similar_ridings": lambda: {"riding_code": self.random.choice(self.riding_codes)},
+            "party_finish_positions": lambda: {"party": self.random.choice(self.parties)},
+            "head_to_head": lambda: dict(zip(("party_a", "party_b"),
+                                             self.random.sample(list(PARTY_CODE_TO_NAME), 2))),
+        }
+
+    def riding(self):
+        """Return a random riding code, or its name half of the time."""
+        row = self.random.randrange(len(self.riding_codes))
+        return self.riding_names[row] if self.random.random() < 0.5 else self.riding_codes[row]
+
+    def next_call(self, tools: List[str], weights: List[float]):
+        """Pick a tool according to the mix and generate its arguments."""
+        name = self.random.choices(tools, weights)[0]
+        return name, self.generators[name]()
+
+
+class LoadStats:
+    """Latency and error counters collected during a run."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.overloaded = 0
+        self.rss_samples: List[Dict[str, float]] = []
+
+    def record(self, name: str, latency: float, error: bool, overloaded: bool) -> None:
+        self.latencies.setdefault(name, []).append(latency)
+        if error:
+            self.errors[name] = self.errors.get(name, 0) + 1
+        if overloaded:
+            self.overloaded += 1
+
+
+def percentile(sorted_values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(percent / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def latency_summary(latencies: List[float]) -> Dict[str, float]:
+    """Summarize a list of latencies (seconds) in milliseconds."""
+    values = sorted(latencies)
+    return {
+        "count": len(values),
+        "p50Ms": round(percentile(values, 50) * 1000, 3),
+        "p95Ms": round(percentile(values, 95) * 1000, 3),
+        "p99Ms": round(percentile(values, 99) * 1000, 3),
+        "maxMs": round(values[-1] * 1000, 3) if values else 0.0
+    }
+
+
+def server_pids() -> List[int]:
+    """Find the server processes started by this load generator (direct children)."""
+    pids = []
+    for entry in os.listdir("/proc") if os.path.isdir("/proc") else []:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", 'r') as f:
+                # The parent pid is the 4th field, after the parenthesized command name
+                fields = f.read().rsplit(")", 1)[1].split()
+            if int(fields[1]) == os.getpid():
+                pids.append(int(entry))
+        except (OSError, IndexError, ValueError):
+            continue
+    return pids
+
+
+def rss_mb(pid: int) -> Optional[float]:
+    """Resident set size of a process in MB (Linux only)."""
+    try:
+        with open(f"/proc/{pid}/status", 'r') as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+async def sample_rss(stats: LoadStats, start: float, interval: float, stop: asyncio.Event) -> None:
+    """Sample the server's RSS every `interval` seconds until `stop` is set."""
+    while not stop.is_set():
+        samples = [rss for rss in (rss_mb(pid) for pid in server_pids()) if rss is not None]
+        if samples:
+            stats.rss_samples.append({
+                "elapsedS": round(time.perf_counter() - start, 2),
+                "rssMb": round(sum(samples), 1)
+            })
+        try:
+            await asyncio.wait_for(stop.wait(), interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_agent(session: ClientSession, generator: ArgumentGenerator, tools: List[str],
+                    weights: List[float], stats: LoadStats, deadline: float,
+                    remaining: Optional[List[int]]) -> None:
+    """Issue tool calls back to back until the deadline (or the request budget) is reached."""
+    while time.perf_counter() < deadline:
+        if remaining is not None:
+            if remaining[0] <= 0:
+                return
+            remaining[0] -= 1
+        name, arguments = generator.next_call(tools, weights)
+        start = time.perf_counter()
+        error = overloaded = False
+        try:
+            result = await session.call_tool(name, arguments)
+            text = result.content[0].text if result.content else ""
+            error = bool(result.isError) or text.lstrip().startswith('{\n  "error"')
+            overloaded = '"overloaded": true' in text
+        except Exception:
+            error = True
+        stats.record(name, time.perf_counter() - start, error, overloaded)
+
+
+def free_port() -> int:
+    """Find a free local TCP port."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def server_command() -> List[str]:
+    """Command running the server's `main()` entry point."""
+    return [sys.executable, "-m", "elections_canada_mcp.server"]
+
+
+def server_env(args) -> Dict[str, str]:
+    """Environment for the server process, with any --server-env overrides."""
+    env = dict(os.environ)
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [project_root, env.get("PYTHONPATH")]))
+    for override in args.server_env:
+        key, _, value = override.partition("=")
+        env[key] = value
+    return env
+
+
+@asynccontextmanager
+async def http_server(args):
+    """Run the server over streamable HTTP for the duration of the context."""
+    port = free_port()
+    process = subprocess.Popen(
+        server_command() + ["--transport", "streamable-http", "--host", "127.0.0.1",
+                                "--port", str(port)],
+        env=server_env(args),
+        stdout=subprocess.DEVNULL,
+        stderr=None if args.verbose else subprocess.DEVNULL
+    )
+    try:
+        # Wait until the server accepts connections
+        deadline = time.perf_counter() + args.startup_timeout
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError("Server exited during startup")
+            try:
+                with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                    break
+            except OSError:
+                if time.perf_counter() > deadline:
+                    raise RuntimeError("Timed out waiting for the server to start")
+                await asyncio.sleep(0.1)
+        yield f"http://127.0.0.1:{port}/mcp"
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+async def run_load(args) -> Dict[str, Any]:
+    """Run the load test described by the command line arguments and return the report."""
+    mix = parse_mix(args.mix) if args.mix else DEFAULT_MIX
+    tools, weights = list(mix.keys()), list(mix.values())
+    generator = ArgumentGenerator(args.seed)
+    unknown = [name for name in tools if name not in generator.generators]
+    if unknown:
+        raise ValueError(f"No argument generator for tools: {', '.join(unknown)}")
+
+    stats = LoadStats()
+    stop = asyncio.Event()
+    remaining = [args.requests] if args.requests else None
+
+    async def drive(sessions: List[ClientSession]) -> float:
+        start = time.perf_counter()
+        sampler = asyncio.create_task(sample_rss(stats, start, args.rss_interval, stop))
+        deadline = start + args.duration
+        await asyncio.gather(*[
+            run_agent(sessions[i % len(sessions)], generator, tools, weights, stats, deadline, remaining)
+            for i in range(args.concurrency)
+        ])
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await sampler
+        return elapsed
+
+    if args.transport == "stdio":
+        # A stdio server serves a single session: all agents share it concurrently
+        params = StdioServerParameters(command=server_command()[0], args=server_command()[1:],
+                                       env=server_env(args))
+        with open(os.devnull, 'w') as devnull:
+            async with stdio_client(params, errlog=sys.stderr if args.verbose else devnull) as (read, write):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    elapsed = await drive([session])
+    else:
+        # One HTTP session per agent, like independent MCP clients
+        async with http_server(args) as url:
+            async with _http_sessions(url, args.concurrency) as sessions:
+                elapsed = await drive(sessions)
+
+    return build_report(args, stats, elapsed, mix)
+
+
+@asynccontextmanager
+async def _http_sessions(url: str, count: int):
+    """Open `count` independent MCP sessions against an HTTP server."""
+    async with AsyncExitStack() as stack:
+        sessions = []
+        for _ in range(count):
+            read, write, _ = await stack.enter_async_context(streamablehttp_client(url))
+            session = await stack.enter_async_context(ClientSession(read, write))
+            await session.initialize()
+            sessions.append(session)
+        yield sessions
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """Parse a 'tool=weight,tool=weight' mix specification."""
+    weights = {}
+    for item in mix.split(","):
+        name, _, weight = item.strip().partition("=")
+        weights[name] = float(weight) if weight else 1.0
+    return weights
+
+
+def build_report(args, stats: LoadStats, elapsed: float, mix: Dict[str, float]) -> Dict[str, Any]:
+    """Build the JSON report of a run."""
+    all_latencies = [latency for values in stats.latencies.values() for latency in values]
+    total = len(all_latencies)
+    errors = sum(stats.errors.values())
+    rss = [sample["rssMb"] for sample in stats.rss_samples]
+    return {
+        "transport": args.transport,
+        "concurrency": args.concurrency,
+        "mix": mix,
+        "elapsedS": round(elapsed, 3),
+        "requests": total,
+        "throughputRps": round(total / elapsed, 1) if elapsed > 0 else 0.0,
+        "errors": errors,
+        "overloaded": stats.overloaded,
+        "errorRate": round(errors / total, 4) if total else 0.0,
+        "latency": latency_summary(all_latencies),
+        "byTool": {
+            name: {**latency_summary(values), "errors": stats.errors.get(name, 0)}
+            for name, values in sorted(stats.latencies.items())
+        },
+        "serverRssMb": {
+            "start": rss[0] if rss else None,
+            "peak": max(rss) if rss else None,
+            "end": rss[-1] if rss else None,
+            "samples": stats.rss_samples
+        }
+    }
+
+
+def check_gates(args, report: Dict[str, Any]) -> List[str]:
+    """Return the capacity gates that the report fails."""
+    failures = []
+    if args.max_p99_ms is not None and report["latency"]["p99Ms"] > args.max_p99_ms:
+        failures.append(f"p99 latency {report['latency']['p99Ms']} ms > {args.max_p99_ms} ms")
+    if args.max_error_rate is not None and report["errorRate"] > args.max_error_rate:
+        failures.append(f"error rate {report['errorRate']} > {args.max_error_rate}")
+    if args.min_throughput is not None and report["throughputRps"] < args.min_throughput:
+        failures.append(f"throughput {report['throughputRps']} req/s < {args.min_throughput} req/s")
+    return failures
+
+
+def main():
+    """Entry point for the elections_canada_loadgen command."""
+    parser = argparse.ArgumentParser(description="Load generator for the Elections Canada MCP server")
+    parser.add_argument("--transport", choices=["stdio", "streamable-http"], default="stdio")
+    parser.add_argument("--concurrency", type=int, default=50, help="Number of concurrent agents")
+    parser.add_argument("--duration", type=float, default=30.0, help="Test duration in seconds")
+    parser.add_argument("--requests", type=int, default=None,
+                        help="Stop after this many requests (in addition to the duration)")
+    parser.add_argument("--mix", default=None,
+                        help="Weighted tool mix, e.g. 'search_ridings=5,get_party_votes=5'")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for the arguments")
+    parser.add_argument("--rss-interval", type=float, default=1.0, help="Seconds between RSS samples")
+    parser.add_argument("--startup-timeout", type=float, default=30.0)
+    parser.add_argument("--server-env", action="append", default=[], metavar="KEY=VALUE",
+                        help="Environment variable for the server (repeatable), "
+                             "e.g. ADMISSION_CAPACITY=128")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--max-p99-ms", type=float, default=None, help="Fail if p99 latency exceeds this")
+    parser.add_argument("--max-error-rate", type=float, default=None, help="Fail if the error rate exceeds this")
+    parser.add_argument("--min-throughput", type=float, default=None, help="Fail if throughput is below this")
+    parser.add_argument("--verbose", action="store_true", help="Show the server's logs")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load(args))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
+
+    failures = check_gates(args, report)
+    for failure in failures:
+        print(f"FAILED: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Localized (English/French) output for the Elections Canada MCP Server.
+
+Every tool takes a `language` ('EN' or 'FR') and renders its display names in
+that language directly from the name tables of a `Localizer`, built once when
+a dataset is loaded:
+
+- party and province names in each language
+- the name of every riding in each language, by row (the dataset's interned
+  `ridingName_EN`/`ridingName_FR` strings)
+- region names: a province name, or the name of the whole country
+
+Codes, numbers and field names do not depend on the language, so results in
+both languages have the same structure. The server caches the results of each
+language under their own keys.
+"""
+
+import sys
+from typing import List, Optional
+
+from .constants import (
+    PARTY_CODE_TO_NAME,
+    PARTY_CODE_TO_NAME_FR,
+    PROVINCE_CODE_TO_NAME,
+    PROVINCE_CODE_TO_NAME_FR
+)
+from .utils import normalize_text
+
+LANGUAGES = ("EN", "FR")
+DEFAULT_LANGUAGE = "EN"
+# Accepted spellings of each language (normalized)
+LANGUAGE_ALIASES = {
+    "en": "EN", "eng": "EN", "english": "EN", "anglais": "EN",
+    "fr": "FR", "fra": "FR", "fre": "FR", "french": "FR", "francais": "FR"
+}
+# Party and province names in each language
+PARTY_NAMES = {"EN": PARTY_CODE_TO_NAME, "FR": PARTY_CODE_TO_NAME_FR}
+PROVINCE_NAMES = {"EN": PROVINCE_CODE_TO_NAME, "FR": PROVINCE_CODE_TO_NAME_FR}
+# Name of the whole country in region names
+NATIONAL_REGION_NAMES = {"EN": "National", "FR": "Canada"}
+# Separator of combined region names
+REGION_NAME_SEPARATOR = " + "
+
+
+def get_language(language: Optional[str]) -> Optional[str]:
+    """Convert a language name or code (e.g. 'fr', 'Français') to 'EN' or 'FR' (default: 'EN')."""
+    if not language:
+        return DEFAULT_LANGUAGE
+    return LANGUAGE_ALIASES.get(normalize_text(language))
+
+
+def party_name(party_code: str, language: str = DEFAULT_LANGUAGE) -> str:
+    """Return the name of a party in a language (the code itself for unknown parties)."""
+    return PARTY_NAMES[language].get(party_code, party_code)
+
+
+def province_name(province_code: str, language: str = DEFAULT_LANGUAGE) -> str:
+    """Return the name of a province in a language (the code itself for unknown provinces)."""
+    return PROVINCE_NAMES[language].get(province_code, province_code)
+
+
+def region_name(province_code: Optional[str], language: str = DEFAULT_LANGUAGE) -> str:
+    """Return the name of a province, or of the whole country when the code is None."""
+    if province_code is None:
+        return NATIONAL_REGION_NAMES[language]
+    return province_name(province_code, language)
+
+
+class Localizer:
+    """Riding names of one dataset in each language, by row."""
+
+    def __init__(self, names_en: List[str], names_fr: List[str]):
+        self.riding_names = {
+            "EN": names_en,
+            "FR": [sys.intern(name.strip()) for name in names_fr]
+        }
+
+    def riding_name(self, row: int, language: str = DEFAULT_LANGUAGE) -> str:
+        """Return the name of the riding in a row in a language."""
+        return self.riding_names[language][row]
@@ -0,0 +1,301 @@
+"""
+Differential correctness oracle for the Elections Canada MCP Server.
+
+The pure-Python implementations in `utils.py` (`summarize_results`,
+`closest_ridings`, `best_and_worst`) are the reference: they define the tools'
+answers, including how ties are broken and how percentages are rounded. Any
+alternative engine (vectorized, cached or incremental) is run on the same
+arguments and its serialized output must be byte-for-byte identical to the
+reference's. Reference engines are functions `(ridings, **args) -> dict` over the
+raw riding records, exactly as parsed from the data file (so each riding keeps its
+own ballot order, which decides ties); candidate engines are functions
+`(dataset, **args) -> dict` over the `ElectionDataset` built from those records.
+
+The engines are compared on the bundled dataset and on randomized synthetic
+datasets designed to hit the edge cases: tied winners and runners-up, tied
+percentages, parties on the ballot with zero votes, ridings with a single party
+and ridings where nobody voted. The report lists the mismatches (with the first
+differing path) and the speedup of each engine over the reference.
+
+Examples:
+    elections_canada_oracle
+    elections_canada_oracle --seeds 50 --ridings 500 --tools find_closest_ridings
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .constants import PARTY_CODE_TO_NAME, PROVINCE_CODE_TO_NAME
+from .dataset import ElectionDataset
+from .utils import best_and_worst, closest_ridings, summarize_results
+
+DATA_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "datafiles/2021_riding_vote_redistributed_ElectionsCanada.json"
+)
+
+Engine = Callable[..., Dict[str, Any]]
+
+# Party codes used by synthetic datasets, beyond the main parties
+EXTRA_PARTY_CODES = ("Ind", "OTH", "CHP", "MLP")
+# Number of mismatches kept in the report for each tool
+MAX_EXAMPLES = 5
+
+
+def _province_ridings(ridings: List[Dict[str, Any]], province_code: Optional[str]) -> List[Dict[str, Any]]:
+    """Return the ridings of a province (all ridings when None)."""
+    if province_code is None:
+        return ridings
+    return [riding for riding in ridings if riding["provCode"] == province_code]
+
+
+def _region_name(province_code: Optional[str]) -> str:
+    return PROVINCE_CODE_TO_NAME.get(province_code, province_code) if province_code else "National"
+
+
+def _reference_summary(ridings: List[Dict[str, Any]], province: Optional[str] = None) -> Dict[str, Any]:
+    return summarize_results(_province_ridings(ridings, province), _region_name(province), province)
+
+
+def _vectorized_summary(dataset: ElectionDataset, province: Optional[str] = None) -> Dict[str, Any]:
+    mask = dataset.province_masks[province] if province else np.ones(dataset.num_ridings, dtype=bool)
+    return dataset.summarize_mask(mask, _region_name(province), province)
+
+
+REFERENCE_ENGINES: Dict[str, Engine] = {
+    "summarize_results": _reference_summary,
+    "find_closest_ridings": closest_ridings,
+    "best_and_worst_results": best_and_worst,
+}
+
+VECTORIZED_ENGINES: Dict[str, Engine] = {
+    "summarize_results": _vectorized_summary,
+    "find_closest_ridings": lambda dataset, **args: dataset.closest_ridings(**args),
+    "best_and_worst_results": lambda dataset, **args: dataset.best_and_worst(**args),
+}
+
+
+def cases(tool: str, dataset: ElectionDataset) -> List[Dict[str, Any]]:
+    """Return the arguments to compare a tool's engines on for a dataset."""
+    sizes = (10, dataset.num_ridings)
+    parties = list(dict.fromkeys(list(dataset.party_codes) + list(PARTY_CODE_TO_NAME)))
+    if tool == "summarize_results":
+        return [{"province": None}] + [{"province": code} for code in dataset.province_list]
+    if tool == "find_closest_ridings":
+        return [{"num_results": n, "party_code": code} for n in sizes for code in [None] + parties]
+    if tool == "best_and_worst_results":
+        return [{"party_code": code, "num_entries": n} for n in sizes for code in parties]
+    raise ValueError(f"Unknown tool {tool}")
+
+
+def synthetic_ridings(seed: int, num_ridings: int = 343, num_parties: int = 8,
+                      tie_rate: float = 0.2, zero_rate: float = 0.15) -> List[Dict[str, Any]]:
+    """
+    Generate random riding records in the data file's format.
+
+    Args:
+        seed: Random seed
+        num_ridings: Number of ridings
+        num_parties: Number of parties (main parties first, then minor ones)
+        tie_rate: Probability that a riding's two leading parties are tied
+        zero_rate: Probability that a party on the ballot receives no votes
+
+    Returns:
+        List of riding records
+    """
+    rng = random.Random(seed)
+    codes = (list(PARTY_CODE_TO_NAME) + list(EXTRA_PARTY_CODES))[:num_parties]
+    provinces = list(PROVINCE_CODE_TO_NAME)
+    ridings = []
+    for i in range(num_ridings):
+        # Random ballot in random order; small vote scales make tied percentages likely
+        ballot = rng.sample(codes, rng.randint(1, len(codes)))
+        scale = rng.choice((3, 20, 1000, 50000))
+        votes = [0 if rng.random() < zero_rate else rng.randint(0, scale) for _ in ballot]
+        if len(ballot) > 1 and rng.random() < tie_rate:
+            leader = max(range(len(votes)), key=lambda j: votes[j])
+            other = rng.choice([j for j in range(len(votes)) if j != leader])
+            votes[other] = votes[leader]
+        if rng.random() < zero_rate / 5:
+            votes = [0] * len(ballot)
+        total = sum(votes)
+        rejected = rng.randint(0, 50)
+        registered = total + rejected + rng.randint(0, 2 * scale)
+        ridings.append({
+            "ridingCode": 10000 + i,
+            "ridingName_EN": f"Synthetic riding {i}",
+            "ridingName_FR": f"Circonscription synthétique {i}",
+            "provCode": rng.choice(provinces),
+            "voteDistribution": [
+                {
+                    "partyCode": code,
+                    "votes": count,
+                    "votePercent": round(count / total * 100, 2) if total else 0.0
+                }
+                for code, count in zip(ballot, votes)
+            ],
+            "validVotes": total,
+            "rejectedVotes": rejected,
+            "totalVotes": total + rejected,
+            "registeredVoters": registered,
+            "turnout": round((total + rejected) / registered * 100, 2) if registered else 0.0
+        })
+    return ridings
+
+
+def first_difference(expected: Any, actual: Any, path: str = "$") -> Optional[Tuple[str, Any, Any]]:
+    """Return the path and values of the first difference between two JSON values, or None."""
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        if list(expected) != list(actual):
+            return f"{path} (keys)", list(expected), list(actual)
+        for key in expected:
+            difference = first_difference(expected[key], actual[key], f"{path}.{key}")
+            if difference:
+                return difference
+        return None
+    if isinstance(expected, list) and isinstance(actual, list):
+        for i, (a, b) in enumerate(zip(expected, actual)):
+            difference = first_difference(a, b, f"{path}[{i}]")
+            if difference:
+                return difference
+        if len(expected) != len(actual):
+            return f"{path} (length)", len(expected), len(actual)
+        return None
+    if type(expected) is not type(actual) or expected != actual:
+        return path, expected, actual
+    return None
+
+
+def _best_time(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def compare(tool: str, ridings: List[Dict[str, Any]], dataset: ElectionDataset, label: str,
+            candidate: Engine, reference: Optional[Engine] = None, repeat: int = 3) -> Dict[str, Any]:
+    """
+    Compare an engine with the reference on every case of a tool for one dataset.
+
+    The reference runs on the raw riding records and the candidate on the dataset
+    built from them.
+
+    Returns:
+        Dictionary with the number of cases, the mismatches and the best-of-`repeat`
+        time of both engines summed over the cases
+    """
+    reference = reference or REFERENCE_ENGINES[tool]
+    result = {"cases": 0, "mismatches": [], "referenceSeconds": 0.0, "candidateSeconds": 0.0}
+    for args in cases(tool, dataset):
+        expected = json.dumps(reference(ridings, **args), indent=2)
+        try:
+            actual = json.dumps(candidate(dataset, **args), indent=2)
+        except Exception as e:
+            actual = json.dumps({"exception": repr(e)})
+        result["cases"] += 1
+        if actual != expected:
+            path, want, got = first_difference(json.loads(expected), json.loads(actual)) or ("$", None, None)
+            result["mismatches"].append({
+                "dataset": label, "args": args, "path": path, "expected": want, "actual": got
+            })
+            continue
+        result["referenceSeconds"] += _best_time(lambda: reference(ridings, **args), repeat)
+        result["candidateSeconds"] += _best_time(lambda: candidate(dataset, **args), repeat)
+    return result
+
+
+def run(seeds: int = 20, num_ridings: int = 343, num_parties: int = 8, tie_rate: float = 0.2,
+        zero_rate: float = 0.15, repeat: int = 3, tools: Optional[List[str]] = None,
+        candidates: Optional[Dict[str, Engine]] = None, data_file: str = DATA_FILE) -> Dict[str, Any]:
+    """
+    Run the oracle on the bundled dataset and on synthetic datasets.
+
+    Args:
+        seeds: Number of synthetic datasets
+        num_ridings: Ridings per synthetic dataset
+        num_parties: Parties per synthetic dataset
+        tie_rate: Probability of a tie between the two leading parties of a synthetic riding
+        zero_rate: Probability that a party on a synthetic ballot receives no votes
+        repeat: Timing repetitions per case (the best time is kept)
+        tools: Tools to check (default: every tool with a candidate engine)
+        candidates: Engines to check against the reference (default: VECTORIZED_ENGINES)
+        data_file: Riding-level data file of the real dataset
+
+    Returns:
+        Report with, per tool, the number of cases, mismatches and the speedup
+    """
+    candidates = candidates or VECTORIZED_ENGINES
+    tools = tools or list(candidates)
+    unknown = [tool for tool in tools if tool not in REFERENCE_ENGINES or tool not in candidates]
+    if unknown:
+        raise ValueError(f"No reference or candidate engine for {', '.join(unknown)}")
+
+    with open(data_file, 'r', encoding='utf-8') as f:
+        sources = [("real", json.load(f))]
+    sources += [
+        (f"synthetic-{seed}", synthetic_ridings(seed, num_ridings, num_parties, tie_rate, zero_rate))
+        for seed in range(seeds)
+    ]
+    datasets = [(label, ridings, ElectionDataset(ridings)) for label, ridings in sources]
+
+    report: Dict[str, Any] = {"datasets": len(datasets), "tools": {}, "mismatches": 0}
+    for tool in tools:
+        totals = {"cases": 0, "mismatches": [], "referenceSeconds": 0.0, "candidateSeconds": 0.0}
+        for label, ridings, dataset in datasets:
+            result = compare(tool, ridings, dataset, label, candidates[tool], repeat=repeat)
+            totals["cases"] += result["cases"]
+            totals["mismatches"] += result["mismatches"]
+            totals["referenceSeconds"] += result["referenceSeconds"]
+            totals["candidateSeconds"] += result["candidateSeconds"]
+        report["tools"][tool] = {
+            "cases": totals["cases"],
+            "mismatches": len(totals["mismatches"]),
+            "referenceMs": round(totals["referenceSeconds"] * 1000, 2),
+            "candidateMs": round(totals["candidateSeconds"] * 1000, 2),
+            "speedup": round(totals["referenceSeconds"] / totals["candidateSeconds"], 1)
+            if totals["candidateSeconds"] else None,
+            "examples": totals["mismatches"][:MAX_EXAMPLES]
+        }
+        report["mismatches"] += len(totals["mismatches"])
+    return report
+
+
+def main():
+    """Entry point for the elections_canada_oracle command."""
+    parser = argparse.ArgumentParser(
+        description="Check the Elections Canada MCP server's engines against the reference implementations"
+    )
+    parser.add_argument("--seeds", type=int, default=20, help="Number of synthetic datasets")
+    parser.add_argument("--ridings", type=int, default=343, help="Ridings per synthetic dataset")
+    parser.add_argument("--parties", type=int, default=8, help="Parties per synthetic dataset")
+    parser.add_argument("--tie-rate", type=float, default=0.2, help="Probability of a tie for the lead")
+    parser.add_argument("--zero-rate", type=float, default=0.15,
+                        help="Probability that a party on the ballot receives no votes")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions per case")
+    parser.add_argument("--tools", default=None,
+                        help=f"Comma-separated tools to check (default: {','.join(VECTORIZED_ENGINES)})")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = run(args.seeds, args.ridings, args.parties, args.tie_rate, args.zero_rate, args.repeat,
+                 args.tools.split(",") if args.tools else None)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
+    sys.exit(1 if report["mismatches"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Ahead-of-time materialization of common tool results for the Elections Canada MCP Server.
+
+Most calls use the same few parameterizations, and every tool result is a pure
+function of the (immutable) dataset and of the code. The build step computes
+those results once and writes them to a gzipped JSON artifact next to the data
+file (`<data file>.precomputed.json.gz`):
+
+    {"snapshot": ..., "codeVersion": ..., "entries": [{"tool": ..., "args": {...}, "result": "..."}]}
+
+At startup the server pins the results into the result cache under the same keys
+the tools use, so these calls are answered without any computation and other
+arguments fall back to live computation. The artifact is ignored when its dataset
+snapshot or code version does not match the running server.
+
+Examples:
+    elections_canada_precompute
+    elections_canada_precompute --output /tmp/results.precomputed.json.gz
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .constants import PARTY_CODE_TO_NAME, PROVINCE_CODE_TO_NAME
+
+PRECOMPUTED_SUFFIX = ".precomputed.json.gz"
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def precomputed_path(data_file: str) -> str:
+    """Return the path of the precomputed artifact shipped next to a data file."""
+    return os.path.splitext(data_file)[0] + PRECOMPUTED_SUFFIX
+
+
+def code_version() -> str:
+    """Return a hash of the package's source files, which the results depend on."""
+    digest = hashlib.sha256()
+    for filename in sorted(os.listdir(PACKAGE_DIR)):
+        if filename.endswith(".py"):
+            digest.update(filename.encode())
+            with open(os.path.join(PACKAGE_DIR, filename), 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def default_calls() -> List[Tuple[str, Dict[str, Any]]]:
+    """Return the tool calls to materialize: the most common parameterizations."""
+    calls: List[Tuple[str, Dict[str, Any]]] = [("summarize_national_results", {})]
+    calls += [("summarize_province_results", {"province_name_or_code": code})
+              for code in PROVINCE_CODE_TO_NAME]
+    calls.append(("find_closest_ridings", {}))
+    calls += [("find_closest_ridings", {"party": code}) for code in PARTY_CODE_TO_NAME]
+    calls += [("best_and_worst_results", {"party": code}) for code in PARTY_CODE_TO_NAME]
+    return calls
+
+
+def build(tools: Dict[str, Callable[..., str]], snapshot: str, path: str,
+          calls: Optional[List[Tuple[str, Dict[str, Any]]]] = None) -> Dict[str, Any]:
+    """
+    Compute tool results live and write them to an artifact.
+
+    Args:
+        tools: Cached tool functions by name (their `__wrapped__` function is called,
+               so results are never taken from the cache or a previous artifact)
+        snapshot: Snapshot of the dataset the results are computed from
+        path: Path of the artifact to write
+        calls: Tool calls to materialize (default: `default_calls()`)
+
+    Returns:
+        Dictionary describing the artifact
+    """
+    start = time.perf_counter()
+    entries = []
+    for name, args in calls if calls is not None else default_calls():
+        fn = getattr(tools[name], "__wrapped__", tools[name])
+        entries.append({"tool": name, "args": args, "result": fn(**args)})
+    artifact = {"snapshot": snapshot, "codeVersion": code_version(), "entries": entries}
+    content = gzip.compress(json.dumps(artifact, separators=(",", ":")).encode("utf-8"), mtime=0)
+    with open(path, 'wb') as f:
+        f.write(content)
+    return {
+        "path": path,
+        "entries": len(entries),
+        "bytes": len(content),
+        "snapshot": snapshot,
+        "codeVersion": artifact["codeVersion"],
+        "seconds": round(time.perf_counter() - start, 3)
+    }
+
+
+def load(path: str, snapshot: str) -> List[Dict[str, Any]]:
+    """
+    Read the entries of an artifact.
+
+    Returns:
+        The artifact's entries, or an empty list if the file does not exist or was
+        built from another dataset snapshot or another version of the code
+    """
+    if not os.path.isfile(path):
+        return []
+    with gzip.open(path, 'rb') as f:
+        artifact = json.loads(f.read().decode("utf-8"))
+    if artifact.get("snapshot") != snapshot or artifact.get("codeVersion") != code_version():
+        return []
+    return artifact.get("entries", [])
+
+
+def main():
+    """Entry point for the elections_canada_precompute command."""
+    parser = argparse.ArgumentParser(
+        description="Precompute the most common tool results of the Elections Canada MCP server"
+    )
+    parser.add_argument("--output", default=None,
+                        help="Artifact to write (default: next to the bundled data file)")
+    args = parser.parse_args()
+
+    # Imported here so that the server does not depend on this command being run
+    from . import server
+
+    path = args.output or precomputed_path(server.DATA_FILE)
+    tools = {name: getattr(server, name) for name, _ in default_calls()}
+    report = build(tools, server.DATASET.snapshot, path)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
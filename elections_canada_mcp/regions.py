@@ -0,0 +1,199 @@
+"""
+Custom region support for the Elections Canada MCP Server.
+
+Regions are named sets of ridings stored as packed bitsets over the rows of an
+`ElectionDataset`. Set algebra (union, intersection, difference) and riding
+filters are bitwise operations on those bitsets, and region summaries are
+computed with masked vectorized sums.
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .dataset import ElectionDataset
+from .localization import DEFAULT_LANGUAGE, province_name
+from .utils import normalize_text, get_province_code, get_party_code
+
+NATIONAL_REGION_NAMES = {"national", "canada"}
+# Default maximum number of custom regions per election
+MAX_REGIONS = 256
+
+
+class RegionError(ValueError):
+    """Raised when a region reference or filter cannot be resolved."""
+
+
+class RegionRegistry:
+    """Registry of named riding bitsets over an `ElectionDataset`."""
+
+    def __init__(self, dataset: ElectionDataset, max_regions: int = MAX_REGIONS):
+        self.dataset = dataset
+        self.max_regions = max_regions
+        self.regions: Dict[str, Dict[str, object]] = {}
+        # Incremented on every change so that cached summaries can be invalidated
+        self.version = 0
+
+    # Bitset helpers
+
+    def to_bits(self, mask: np.ndarray) -> np.ndarray:
+        """Pack a boolean riding mask into a bitset."""
+        return np.packbits(mask)
+
+    def to_mask(self, bits: np.ndarray) -> np.ndarray:
+        """Unpack a bitset into a boolean riding mask."""
+        return np.unpackbits(bits, count=self.dataset.num_ridings).astype(bool)
+
+    def empty(self) -> np.ndarray:
+        """Return an empty bitset."""
+        return np.zeros((self.dataset.num_ridings + 7) // 8, dtype=np.uint8)
+
+    def full(self) -> np.ndarray:
+        """Return a bitset containing every riding."""
+        return self.to_bits(np.ones(self.dataset.num_ridings, dtype=bool))
+
+    # Region definitions
+
+    def define(self, name: str, bits: np.ndarray) -> Dict[str, object]:
+        """
+        Store a named region, replacing any existing region with the same name.
+
+        Raises:
+            RegionError: If the name is empty or reserved, or if `max_regions` regions
+                         are already defined and the name is new
+        """
+        key = normalize_text(name)
+        if not key:
+            raise RegionError("Region name is required")
+        if key in NATIONAL_REGION_NAMES or get_province_code(name):
+            raise RegionError(f"Region name {name} is reserved for a built-in region")
+        if key not in self.regions and len(self.regions) >= self.max_regions:
+            raise RegionError(
+                f"Too many custom regions (at most {self.max_regions}); redefine or reuse an existing name"
+            )
+        self.regions[key] = {"name": name, "bits": bits}
+        self.version += 1
+        return self.describe(name, bits)
+
+    def delete(self, name: str) -> bool:
+        """Remove a named region. Returns False if it did not exist."""
+        if self.regions.pop(normalize_text(name), None) is None:
+            return False
+        self.version += 1
+        return True
+
+    def describe(self, name: str, bits: np.ndarray) -> Dict[str, object]:
+        """Describe a region by name, riding count and riding codes."""
+        mask = self.to_mask(bits)
+        return {
+            "regionName": name,
+            "totalRidings": int(np.count_nonzero(mask)),
+            "ridingCodes": [int(code) for code in self.dataset.riding_codes[mask]]
+        }
+
+    def list(self) -> List[Dict[str, object]]:
+        """List the custom regions with their riding counts."""
+        return [
+            {
+                "regionName": region["name"],
+                "totalRidings": int(np.count_nonzero(self.to_mask(region["bits"])))
+            }
+            for region in self.regions.values()
+        ]
+
+    # Region resolution
+
+    def resolve(self, reference) -> np.ndarray:
+        """
+        Resolve a region reference to a bitset.
+
+        A reference can be a custom region name, a province name or code,
+        'National'/'Canada', or a riding code.
+        """
+        if isinstance(reference, int) or (isinstance(reference, str) and reference.strip().isdigit()):
+            code = int(reference)
+            if code not in self.dataset.row_by_code:
+                raise RegionError(f"Riding code {code} not found")
+            return self.to_bits(self.dataset.rows_for_codes([code]))
+
+        key = normalize_text(reference)
+        if key in self.regions:
+            return self.regions[key]["bits"]
+        if key in NATIONAL_REGION_NAMES:
+            return self.full()
+
+        province_code = get_province_code(reference)
+        if province_code and province_code in self.dataset.province_masks:
+            return self.to_bits(self.dataset.province_masks[province_code])
+
+        raise RegionError(f"Unknown region: {reference}")
+
+    def union(self, references: Iterable) -> np.ndarray:
+        """Return the union of the bitsets of several region references."""
+        bits = self.empty()
+        for reference in references:
+            bits = np.bitwise_or(bits, self.resolve(reference))
+        return bits
+
+    def intersection(self, references: Iterable) -> np.ndarray:
+        """Return the intersection of the bitsets of several region references."""
+        bits = self.full()
+        for reference in references:
+            bits = np.bitwise_and(bits, self.resolve(reference))
+        return bits
+
+    # Filters
+
+    def won_by(self, party: str) -> np.ndarray:
+        """Return the bitset of ridings won by a party."""
+        party_code = get_party_code(party)
+        if not party_code:
+            raise RegionError(f"Invalid party name or code: {party}")
+        col = self.dataset.party_index.get(party_code)
+        if col is None:
+            return self.empty()
+        return self.to_bits(self.dataset.winner == col)
+
+    def margin_below(self, max_margin: float) -> np.ndarray:
+        """Return the bitset of ridings with a winning margin below `max_margin` percentage points."""
+        return self.to_bits(self.dataset.percent_margin < max_margin)
+
+    def build(self, include: Optional[List] = None, intersect: Optional[List] = None,
+              exclude: Optional[List] = None, won_by: Optional[str] = None,
+              max_margin: Optional[float] = None) -> np.ndarray:
+        """
+        Build a bitset from region references and filters.
+
+        Args:
+            include: Region references to union (defaults to all ridings)
+            intersect: Region references the result must also belong to
+            exclude: Region references to remove from the result
+            won_by: Only keep ridings won by this party
+            max_margin: Only keep ridings with a winning margin below this many percentage points
+
+        Returns:
+            Packed bitset of the selected ridings
+        """
+        bits = self.union(include) if include else self.full()
+        if intersect:
+            bits = np.bitwise_and(bits, self.intersection(intersect))
+        if exclude:
+            bits = np.bitwise_and(bits, np.bitwise_not(self.union(exclude)))
+        if won_by:
+            bits = np.bitwise_and(bits, self.won_by(won_by))
+        if max_margin is not None:
+            bits = np.bitwise_and(bits, self.margin_below(max_margin))
+        return bits
+
+    def summarize(self, bits: np.ndarray, region_name: Optional[str] = None,
+                  language: str = DEFAULT_LANGUAGE) -> Dict[str, object]:
+        """Summarize election results for the ridings in a bitset."""
+        return self.dataset.summarize_mask(self.to_mask(bits), region_name, language=language)
+
+
+def region_display_name(reference, language: str = DEFAULT_LANGUAGE) -> str:
+    """Return a readable name for a single region reference, in a language."""
+    province_code = get_province_code(str(reference))
+    if province_code:
+        return province_name(province_code, language)
+    return str(reference)
@@ -0,0 +1,197 @@
+"""
+Admission control for the Elections Canada MCP Server.
+
+Every tool call is priced by its expected work (cheap lookups versus full scans
+of the ridings) and must be admitted before it runs. Calls are admitted while
+the total cost in flight stays within capacity; otherwise they wait in a bounded
+FIFO queue for a limited time. Calls that are too expensive, that exceed the
+per-client concurrency limit, that find the queue full or that wait too long
+are rejected immediately with an `OverloadedError`, so latency stays bounded
+under burst load instead of growing with the backlog.
+"""
+
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Deque, Dict, Mapping, Tuple
+
+# Relative cost of each tool. Lookups of a single riding cost 1, while tools that
+# scan every riding cost more. Tools not listed cost DEFAULT_TOOL_COST.
+DEFAULT_TOOL_COST = 1
+TOOL_COSTS = {
+    "search_ridings": 2,
+    "get_party_votes": 1,
+    "get_winning_party": 1,
+    "summarize_province_results": 2,
+    "summarize_national_results": 4,
+    "find_closest_ridings": 8,
+    "best_and_worst_results": 8,
+    "define_region": 2,
+    "list_regions": 1,
+    "summarize_region": 2,
+    "party_finish_positions": 2,
+    "head_to_head": 2,
+    "find_similar_ridings": 2,
+    "find_similar_ridings_batch": 4,
+    "export_votes": 4,
+    "turnout_statistics": 2,
+    "list_elections": 1,
+    "compare_elections": 4,
+    "transpose_election": 8,
+    "simulate_electoral_systems": 4,
+    "votes_to_flip": 2,
+    "path_to_majority": 4,
+    "vote_efficiency": 2,
+    "vote_share_distribution": 2,
+}
+
+# Arguments that control the size of the output, and how many requested entries
+# add one unit of cost
+SIZE_ARGUMENTS = ("num_entries", "num_results")
+ENTRIES_PER_COST_UNIT = 50
+
+
+class OverloadedError(Exception):
+    """Raised when a tool call is rejected by admission control."""
+
+
+def tool_cost(name: str, arguments: Mapping[str, Any]) -> int:
+    """
+    Estimate the cost of a tool call from the tool and the size of its output.
+
+    Args:
+        name: Tool name
+        arguments: Tool arguments
+
+    Returns:
+        Cost in capacity units (at least 1)
+    """
+    cost = TOOL_COSTS.get(name, DEFAULT_TOOL_COST)
+    for argument in SIZE_ARGUMENTS:
+        size = arguments.get(argument)
+        if isinstance(size, int) and size > 0:
+            cost += size // ENTRIES_PER_COST_UNIT
+    batch = arguments.get("riding_codes")
+    if isinstance(batch, (list, tuple)):
+        cost += len(batch) // ENTRIES_PER_COST_UNIT
+    return max(1, cost)
+
+
+class AdmissionController:
+    """
+    Cost-based admission control with a bounded wait queue and per-client limits.
+
+    Must be used from a single event loop.
+    """
+
+    def __init__(self, capacity: int = 64, max_queue: int = 128,
+                 per_client_limit: int = 8, max_wait: float = 2.0):
+        self.capacity = capacity
+        self.max_queue = max_queue
+        self.per_client_limit = per_client_limit
+        self.max_wait = max_wait
+        self.in_flight_cost = 0
+        self._clients: Dict[str, int] = {}
+        self._queue: Deque[Tuple[int, asyncio.Future]] = deque()
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = 0
+
+    @asynccontextmanager
+    async def admit(self, client_id: str, cost: int):
+        """
+        Admit a call for its duration, waiting in the queue if capacity is exhausted.
+
+        Raises:
+            OverloadedError: if the call cannot be admitted
+        """
+        await self._acquire(client_id, cost)
+        try:
+            yield
+        finally:
+            self._release(client_id, cost)
+
+    async def _acquire(self, client_id: str, cost: int) -> None:
+        if cost > self.capacity:
+            self.rejected += 1
+            raise OverloadedError(
+                f"Request cost {cost} exceeds the server capacity of {self.capacity}; "
+                "request fewer entries"
+            )
+        if self._clients.get(client_id, 0) >= self.per_client_limit:
+            self.rejected += 1
+            raise OverloadedError(
+                f"Too many concurrent requests from this client (limit {self.per_client_limit})"
+            )
+
+        # Queued calls count towards the client's limit as well as running ones
+        self._clients[client_id] = self._clients.get(client_id, 0) + 1
+        try:
+            await self._reserve(cost)
+        except BaseException as e:
+            self._forget_client(client_id)
+            if isinstance(e, OverloadedError):
+                self.rejected += 1
+            raise
+        self.admitted += 1
+
+    async def _reserve(self, cost: int) -> None:
+        """Reserve capacity for a call, waiting in the queue if needed."""
+        if not self._queue and self.in_flight_cost + cost <= self.capacity:
+            self.in_flight_cost += cost
+            return
+
+        if len(self._queue) >= self.max_queue:
+            raise OverloadedError("Server is overloaded, please retry later")
+        waiter = asyncio.get_running_loop().create_future()
+        entry = (cost, waiter)
+        self._queue.append(entry)
+        self.queued += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.max_wait)
+        except BaseException as e:
+            # Timed out or cancelled while queued
+            if waiter.done() and not waiter.cancelled():
+                # Admitted just as the wait ended; give the capacity back
+                self.in_flight_cost -= cost
+                self._wake_waiters()
+            else:
+                self._queue.remove(entry)
+                waiter.cancel()
+            if isinstance(e, asyncio.TimeoutError):
+                raise OverloadedError("Server is overloaded, please retry later") from None
+            raise
+
+    def _release(self, client_id: str, cost: int) -> None:
+        self.in_flight_cost -= cost
+        self._forget_client(client_id)
+        self._wake_waiters()
+
+    def _forget_client(self, client_id: str) -> None:
+        remaining = self._clients.get(client_id, 0) - 1
+        if remaining > 0:
+            self._clients[client_id] = remaining
+        else:
+            self._clients.pop(client_id, None)
+
+    def _wake_waiters(self) -> None:
+        """Admit queued calls in FIFO order while they fit in the capacity."""
+        while self._queue and self.in_flight_cost + self._queue[0][0] <= self.capacity:
+            cost, waiter = self._queue.popleft()
+            self.in_flight_cost += cost
+            waiter.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the admission counters and current load."""
+        return {
+            "capacity": self.capacity,
+            "inFlightCost": self.in_flight_cost,
+            "queueLength": len(self._queue),
+            "maxQueue": self.max_queue,
+            "perClientLimit": self.per_client_limit,
+            "maxWait": self.max_wait,
+            "activeClients": len(self._clients),
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected": self.rejected
+        }
@@ -14,10 +14,32 @@ Available tools:
 - summarize_national_results: Summarize national election results
 - find_closest_ridings: Find the closest ridings by vote margin
 - best_and_worst_results: Get best and worst results for a party
+- define_region: Define a named custom region from ridings, provinces and other regions
+- list_regions: List the custom regions that have been defined
+- summarize_region: Summarize results for any combination of regions and riding filters
+- party_finish_positions: Count and list the ridings where a party finished 1st, 2nd, 3rd, ...
+- head_to_head: Compare two parties riding by riding, including two-way contests
+- find_similar_ridings: Find the ridings that voted most like a given riding
+- find_similar_ridings_batch: Find the most similar ridings for several ridings at once
+- export_votes: Export the vote table (or a slice) in chunks as CSV, NDJSON or columnar data
+- turnout_statistics: Turnout and rejected-ballot rankings, quantiles and correlations
+- list_elections: List the elections that are loaded
+- compare_elections: Compare two elections riding by riding (swings, seat flips, gainers and losers)
+- transpose_election: Project an election's results onto other riding boundaries
+- simulate_electoral_systems: Re-allocate seats under D'Hondt, Sainte-Laguë, largest remainder or MMP
+- votes_to_flip: Votes each party needs to win a riding, or a party's cheapest ridings to flip
+- path_to_majority: Fewest additional votes a party needs to reach a seat target, and where
+- vote_efficiency: Wasted votes, votes per seat, efficiency gap and disproportionality indices
+- vote_share_distribution: Ridings within a party's vote-share range, percentile ranks and a histogram
+
+Every tool that queries results takes an optional `election` argument: a loaded
+election (e.g. '2019') or a transposed election ('<election>@<table>').
 """
 
+import functools
 import json
-import pandas as pd
+import anyio
+import numpy as np
 import os
 from typing import Dict, List, Optional, Union
 from mcp.server.fastmcp import FastMCP
@@ -32,13 +54,28 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 from elections_canada_mcp.utils import (
     normalize_text,
     get_province_code,
-    get_party_code,
-    summarize_results
+    get_party_code
 )
-from elections_canada_mcp.constants import (
-    PARTY_CODE_TO_NAME,
-    PROVINCE_CODE_TO_NAME
+from elections_canada_mcp.cache import ResultCache
+from elections_canada_mcp.dataset import ElectionDataset
+from elections_canada_mcp.electoral_systems import ALLOCATION_METHODS, ElectoralSystemError, get_method
+from elections_canada_mcp.elections import ElectionError, ElectionRegistry, ELECTION_FILE_PATTERN
+from elections_canada_mcp.export import ExportError
+from elections_canada_mcp.flips import FLIP_MODES, UNFLIPPABLE
+from elections_canada_mcp.localization import (
+    DEFAULT_LANGUAGE,
+    LANGUAGES,
+    REGION_NAME_SEPARATOR,
+    get_language,
+    party_name,
+    province_name,
+    region_name
 )
+from elections_canada_mcp.precompute import load as load_precomputed, precomputed_path
+from elections_canada_mcp.regions import MAX_REGIONS, RegionError, region_display_name
+from elections_canada_mcp.shares import DEFAULT_BUCKET_WIDTH
+from elections_canada_mcp.turnout import TURNOUT_METRICS
+from elections_canada_mcp.scheduler import AdmissionController, OverloadedError, tool_cost
 
 # Configure logging to stderr only
 logging.basicConfig(
@@ -57,50 +94,226 @@ DATA_FILE = os.path.join(
     "datafiles/2021_riding_vote_redistributed_ElectionsCanada.json"
 )
 
-# Load the election data
-with open(DATA_FILE, 'r') as f:
-    ELECTION_DATA = json.load(f)
-
-# Create a lookup dictionary for faster access
-RIDING_LOOKUP = {riding["ridingCode"]: riding for riding in ELECTION_DATA}
-PROVINCE_LOOKUP = {}
-for riding in ELECTION_DATA:
-    prov = riding["provCode"]
-    if prov not in PROVINCE_LOOKUP:
-        PROVINCE_LOOKUP[prov] = []
-    PROVINCE_LOOKUP[prov].append(riding)
-
-# Create a pandas DataFrame for more complex queries
-vote_rows = []
-for riding in ELECTION_DATA:
-    for party_vote in riding["voteDistribution"]:
-        vote_rows.append({
-            "ridingCode": riding["ridingCode"],
-            "ridingName": riding["ridingName_EN"],
-            "province": riding["provCode"],
-            "partyCode": party_vote["partyCode"],
-            "votes": party_vote["votes"],
-            "votePercent": party_vote["votePercent"]
-        })
-DF = pd.DataFrame(vote_rows)
+# Load the election data and build the vectorized riding x party matrices.
+# Ridings are compact records backed by the dataset's arrays.
+DATASET = ElectionDataset.from_file(DATA_FILE)
+ELECTION_DATA = DATASET.ridings
+
+# Log the in-memory footprint of the dataset
+logger.info("Loaded %d ridings (%.0f bytes per riding)",
+            DATASET.num_ridings, DATASET.memory_usage()["bytesPerRiding"])
+
+# Register the bundled election, plus any other elections and transposition tables
+# found next to it or in ELECTIONS_DATA_DIR (riding-level files named like
+# <year>_riding_vote*.json, tables named like <name>_transposition.csv), each with
+# at most MAX_CUSTOM_REGIONS custom regions
+ELECTIONS = ElectionRegistry(max_regions=int(os.environ.get("MAX_CUSTOM_REGIONS", MAX_REGIONS)))
+DEFAULT_ELECTION = ELECTIONS.add(ELECTION_FILE_PATTERN.match(os.path.basename(DATA_FILE)).group(1),
+                                 DATASET, DATA_FILE, default=True)
+for directory in (os.path.dirname(DATA_FILE), os.environ.get("ELECTIONS_DATA_DIR")):
+    for name in ELECTIONS.load_directory(directory):
+        logger.info("Loaded %s from %s", name, directory)
+
+# Lookup dictionaries and indexes of the bundled election (they share the same records)
+RIDING_LOOKUP = DEFAULT_ELECTION.riding_lookup
+PROVINCE_LOOKUP = DEFAULT_ELECTION.province_lookup
+REGIONS = DEFAULT_ELECTION.regions
+SIMILARITY = DEFAULT_ELECTION.similarity
+EXPORTER = DEFAULT_ELECTION.exporter
+TURNOUT = DEFAULT_ELECTION.turnout
+
+# Maximum number of candidate ridings listed when a riding name is ambiguous
+MAX_RIDING_CANDIDATES = 10
+
+# Shared cache of serialized tool results, invalidated by the dataset snapshot
+RESULT_CACHE = ResultCache(
+    max_entries=int(os.environ.get("RESULT_CACHE_MAX_ENTRIES", 1024)),
+    max_bytes=int(os.environ.get("RESULT_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+)
+RESULT_CACHE.set_snapshot(DATASET.snapshot)
+
+def _riding_key(riding: Union[int, str]):
+    """Return the canonical form of a riding code or name for cache keys."""
+    if isinstance(riding, int) or str(riding).strip().isdigit():
+        return int(riding)
+    return normalize_text(str(riding))
+
+def _riding_keys(ridings: List[Union[int, str]]):
+    """Return the canonical forms of a list of riding codes or names for cache keys."""
+    return [_riding_key(riding) for riding in ridings]
+
+def cached(normalizers=None, depends_on=None):
+    """
+    Cache a tool's results, keying the election argument on its dataset snapshot and
+    each language's results separately.
+    """
+    return RESULT_CACHE.cached(
+        {"election": ELECTIONS.snapshot, "language": get_language, **(normalizers or {})}, depends_on
+    )
+
+def _regions_version(arguments) -> int:
+    """Return the custom region version of the election a cached call is for."""
+    return ELECTIONS.regions_version(arguments.get("election"))
+
+# Admission control in front of the tool handlers
+ADMISSION = AdmissionController(
+    capacity=int(os.environ.get("ADMISSION_CAPACITY", 64)),
+    max_queue=int(os.environ.get("ADMISSION_MAX_QUEUE", 128)),
+    per_client_limit=int(os.environ.get("ADMISSION_PER_CLIENT_LIMIT", 8)),
+    max_wait=float(os.environ.get("ADMISSION_MAX_WAIT", 2.0))
+)
+
+def _client_id() -> str:
+    """Identify the client making the current request (MCP session, else remote address)."""
+    try:
+        request_context = mcp.get_context().request_context
+    except ValueError:
+        return "local"
+    request = request_context.request
+    if request is not None:
+        session_id = request.headers.get("mcp-session-id")
+        if session_id:
+            return session_id
+        if request.client:
+            return request.client.host
+    return str(id(request_context.session))
+
+def _call_cost(fn, name: str, kwargs: dict) -> int:
+    """Price a tool call, treating results already in the cache as cheap lookups."""
+    cache_key = getattr(fn, "cache_key", None)
+    if cache_key is not None:
+        try:
+            if RESULT_CACHE.contains(cache_key(**kwargs)):
+                return 1
+        except TypeError:
+            pass
+    return tool_cost(name, kwargs)
+
+def _election(election: Optional[str]):
+    """Return the context of an election (default: the bundled election), or None and an error message."""
+    try:
+        return ELECTIONS.context(election), None
+    except ElectionError as e:
+        return None, str(e)
+
+def _riding_name(dataset: ElectionDataset, riding_code: int, language: str = DEFAULT_LANGUAGE) -> str:
+    """Return the name of a riding in a language."""
+    return dataset.localizer.riding_name(dataset.row_by_code[riding_code], language)
+
+def _riding(context, riding: Union[int, str], language: str = DEFAULT_LANGUAGE):
+    """
+    Return the record of a riding given by code or name, or None and an error payload
+    (listing the candidate ridings, named in a language, when a name is ambiguous).
+    """
+    code, candidates = context.resolve_riding(riding)
+    if code is not None:
+        return context.riding_lookup[code], None
+    if not candidates:
+        if isinstance(riding, int) or str(riding).strip().isdigit():
+            return None, {"error": f"Riding code {riding} not found"}
+        return None, {"error": f"No riding matches {riding}"}
+    return None, {
+        "error": f"Riding name {riding} is ambiguous; use one of the riding codes below",
+        "candidates": [
+            {
+                "ridingCode": code,
+                "ridingName": _riding_name(context.dataset, code, language),
+                "province": context.riding_lookup[code]["provCode"]
+            }
+            for code in candidates[:MAX_RIDING_CANDIDATES]
+        ],
+        "totalCandidates": len(candidates)
+    }
+
+def tool():
+    """
+    Register a function as an MCP tool that runs in a worker thread.
+    
+    Calls go through admission control first and are rejected with an overloaded
+    error when the server is saturated. Running tools off the event loop lets
+    concurrent sessions proceed in parallel, and lets concurrent identical calls be
+    coalesced by the result cache. Every tool takes a `language` parameter ('EN' or
+    'FR'), which is validated and normalized here. The decorated function itself is
+    returned unchanged.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def run_in_worker_thread(**kwargs):
+            language = get_language(kwargs.get("language"))
+            if language is None:
+                return _language_error()
+            kwargs["language"] = language
+            cost = _call_cost(fn, fn.__name__, kwargs)
+            try:
+                async with ADMISSION.admit(_client_id(), cost):
+                    return await anyio.to_thread.run_sync(functools.partial(fn, **kwargs))
+            except OverloadedError as e:
+                logger.warning("Rejected %s (cost %d): %s", fn.__name__, cost, e)
+                return json.dumps({"error": str(e), "overloaded": True}, indent=2)
+        mcp.add_tool(run_in_worker_thread)
+        return fn
+    return decorator
+
+def _language_error():
+    """Return the error payload of an invalid language."""
+    return json.dumps({"error": f"Invalid language; expected one of {', '.join(LANGUAGES)}"}, indent=2)
+
+def _localized_record(riding, language: str):
+    """
+    Return a riding record with its riding, province and party names in a language, in
+    the fields of the tools' output (ridingName, province, provinceName, partyName).
+    """
+    dataset = DEFAULT_ELECTION.dataset
+    record = _riding_entry(dataset.row_by_code[riding["ridingCode"]], dataset, language)
+    record.update((key, value) for key, value in riding.items()
+                  if key not in ("ridingCode", "ridingName_EN", "ridingName_FR", "provCode"))
+    for vote in record["voteDistribution"]:
+        vote["partyName"] = party_name(vote["partyCode"], language)
+    return record
 
 # Resource to get all ridings
 @mcp.resource("elections-canada://ridings")
 def get_all_ridings():
     """Get a list of all ridings in the 2021 Canadian federal election."""
+    return get_all_ridings_localized(DEFAULT_LANGUAGE)
+
+# Resource to get all ridings with their names in a language
+@mcp.resource("elections-canada://ridings/{language}")
+def get_all_ridings_localized(language: str):
+    """Get a list of all ridings with their names in English ('EN') or French ('FR')."""
+    language = get_language(language)
+    if language is None:
+        return _language_error()
+    names = DATASET.localizer.riding_names[language]
     return json.dumps([{
         "ridingCode": riding["ridingCode"],
-        "ridingName": riding["ridingName_EN"],
+        "ridingName": names[row],
         "province": riding["provCode"]
-    } for riding in ELECTION_DATA], indent=2)
+    } for row, riding in enumerate(ELECTION_DATA)], indent=2)
 
-# Resource to get a specific riding by code
+# Resource to get a specific riding by code or name
 @mcp.resource("elections-canada://riding/{riding_code}")
-def get_riding(riding_code: int):
-    """Get detailed information about a specific riding by its code."""
-    if riding_code in RIDING_LOOKUP:
-        return json.dumps(RIDING_LOOKUP[riding_code], indent=2)
-    return json.dumps({"error": f"Riding code {riding_code} not found"}, indent=2)
+def get_riding(riding_code: str):
+    """Get detailed information about a specific riding by its code or name."""
+    riding, error = _riding(DEFAULT_ELECTION, riding_code)
+    if error:
+        return json.dumps(error, indent=2)
+    return json.dumps(riding.to_dict(), indent=2)
+
+# Resource to get a specific riding with its names in a language
+@mcp.resource("elections-canada://riding/{riding_code}/{language}")
+def get_riding_localized(riding_code: str, language: str):
+    """
+    Get detailed information about a specific riding by its code or name, with its
+    riding, province and party names in English ('EN') or French ('FR').
+    """
+    language = get_language(language)
+    if language is None:
+        return _language_error()
+    riding, error = _riding(DEFAULT_ELECTION, riding_code, language)
+    if error:
+        return json.dumps(error, indent=2)
+    return json.dumps(_localized_record(riding, language), indent=2)
 
 # Resource to get ridings by province
 @mcp.resource("elections-canada://province/{province_code}")
@@ -108,18 +321,72 @@ def get_province_ridings(province_code: str):
     """Get all ridings in a specific province by province code."""
     province_code = province_code.upper()
     if province_code in PROVINCE_LOOKUP:
-        return json.dumps(PROVINCE_LOOKUP[province_code], indent=2)
+        return json.dumps([riding.to_dict() for riding in PROVINCE_LOOKUP[province_code]], indent=2)
     return json.dumps({"error": f"Province code {province_code} not found"}, indent=2)
 
+# Resource to get ridings by province with their names in a language
+@mcp.resource("elections-canada://province/{province_code}/{language}")
+def get_province_ridings_localized(province_code: str, language: str):
+    """
+    Get all ridings in a specific province by province code, with their riding, province
+    and party names in English ('EN') or French ('FR').
+    """
+    language = get_language(language)
+    if language is None:
+        return _language_error()
+    province_code = province_code.upper()
+    if province_code in PROVINCE_LOOKUP:
+        return json.dumps([_localized_record(riding, language) for riding in PROVINCE_LOOKUP[province_code]],
+                          indent=2)
+    return json.dumps({"error": f"Province code {province_code} not found"}, indent=2)
+
+# Resource to export the vote table in chunks
+@mcp.resource("elections-canada://export/{export_format}/{cursor}")
+def get_vote_table_chunk(export_format: str, cursor: str):
+    """
+    Get one chunk of the full vote table as 'csv', 'ndjson' or 'columnar'.
+    Use 'start' as the cursor for the first chunk, then the returned nextCursor.
+    """
+    return export_votes(export_format, cursor=None if cursor == "start" else cursor)
+
+# Resource to get the memory footprint of the dataset
+@mcp.resource("elections-canada://memory")
+def get_memory_usage():
+    """Get the approximate in-memory size of the loaded dataset, including bytes per riding."""
+    return json.dumps(DATASET.memory_usage(), indent=2)
+
+# Resource to get the result cache statistics
+@mcp.resource("elections-canada://cache")
+def get_cache_stats():
+    """Get hit/miss counters and the current size of the tool result cache."""
+    return json.dumps(RESULT_CACHE.stats(), indent=2)
+
+# Resource to get the admission control statistics
+@mcp.resource("elections-canada://admission")
+def get_admission_stats():
+    """Get the current load and admitted/queued/rejected counters of admission control."""
+    return json.dumps(ADMISSION.stats(), indent=2)
+
 # Tool to search for ridings by name
-@mcp.tool()
-def search_ridings(search_term: str):
+@tool()
+@cached({"search_term": normalize_text})
+def search_ridings(search_term: str, election: Optional[str] = None, language: str = DEFAULT_LANGUAGE):
     """
     Search for ridings by name.
     
     This search is accent-insensitive and ignores spaces and hyphens,
     so searches like 'montreal' will match 'Montréal' and 'st laurent' will match 'Saint-Laurent'.
+    
+    Args:
+        search_term: Part of the riding name, in English or French
+        election: Optional election to query (default: 2021; see list_elections)
+        language: Language of the party, province and riding names, 'EN' or 'FR' (default: 'EN')
     """
+    context, error = _election(election)
+    if error:
+        return json.dumps({"error": error}, indent=2)
+    dataset = context.dataset
+    
     if not search_term:
         return json.dumps({"error": "Search term is required"}, indent=2)
     
@@ -127,7 +394,7 @@ def search_ridings(search_term: str):
     
     # Search for ridings with matching names
     matches = []
-    for riding in ELECTION_DATA:
+    for row, riding in enumerate(dataset.ridings):
         riding_name_en = riding["ridingName_EN"]
         riding_name_fr = riding.get("ridingName_FR", "")
         
@@ -135,9 +402,9 @@ def search_ridings(search_term: str):
             (riding_name_fr and normalized_search in normalize_text(riding_name_fr))):
             matches.append({
                 "ridingCode": riding["ridingCode"],
-                "ridingName": riding["ridingName_EN"],
+                "ridingName": dataset.localizer.riding_name(row, language),
                 "province": riding["provCode"],
-                "provinceName": PROVINCE_CODE_TO_NAME.get(riding["provCode"], riding["provCode"])
+                "provinceName": province_name(riding["provCode"], language)
             })
     
     # Sort by province, then by riding name
@@ -146,13 +413,27 @@ def search_ridings(search_term: str):
     return json.dumps(matches, indent=2)
 
 # Tool to get party vote distribution for a riding
-@mcp.tool()
-def get_party_votes(riding_code: int, party_code: Optional[str] = None):
-    """Get vote distribution for a specific party in a riding, or all parties if no party code is provided."""
-    if riding_code not in RIDING_LOOKUP:
-        return json.dumps({"error": f"Riding code {riding_code} not found"}, indent=2)
+@tool()
+@cached({"riding_code": _riding_key, "party_code": get_party_code})
+def get_party_votes(riding_code: Union[int, str], party_code: Optional[str] = None, election: Optional[str] = None, language: str = DEFAULT_LANGUAGE):
+    """
+    Get vote distribution for a specific party in a riding, or all parties if no party code is provided.
+    
+    Args:
+        riding_code: Code or name of the riding (e.g., 35020 or 'Carleton'; names are
+                     accent-insensitive and may be partial, ambiguous names list the candidates)
+        party_code: Optional party name or code
+        election: Optional election to query (default: 2021; see list_elections)
+        language: Language of the party, province and riding names, 'EN' or 'FR' (default: 'EN')
+    """
+    context, error = _election(election)
+    if error:
+        return json.dumps({"error": error}, indent=2)
     
-    riding = RIDING_LOOKUP[riding_code]
+    riding, error = _riding(context, riding_code, language)
+    if error:
+        return json.dumps(error, indent=2)
+    riding_code = riding["ridingCode"]
     
     # If party code is provided, standardize it
     if party_code:
@@ -160,8 +441,9 @@ def get_party_votes(riding_code: int, party_code: Optional[str] = None):
         if not party_code:
             return json.dumps({"error": f"Invalid party code or name: {party_code}"}, indent=2)
     
-    # Filter vote distribution by party if specified
-    vote_distribution = riding["voteDistribution"]
+    # Filter vote distribution by party if specified (on a copy, as the entries are
+    # annotated and sorted below)
+    vote_distribution = [dict(vote) for vote in riding["voteDistribution"]]
     if party_code:
         vote_distribution = [v for v in vote_distribution if v["partyCode"] == party_code]
         if not vote_distribution:
@@ -169,26 +451,38 @@ def get_party_votes(riding_code: int, party_code: Optional[str] = None):
     
     # Add party names to the results
     for vote in vote_distribution:
-        vote["partyName"] = PARTY_CODE_TO_NAME.get(vote["partyCode"], vote["partyCode"])
+        vote["partyName"] = party_name(vote["partyCode"], language)
     
     # Sort by votes (descending)
     vote_distribution.sort(key=lambda x: x["votes"], reverse=True)
     
     return json.dumps({
         "ridingCode": riding["ridingCode"],
-        "ridingName": riding["ridingName_EN"],
+        "ridingName": _riding_name(context.dataset, riding_code, language),
         "province": riding["provCode"],
         "voteDistribution": vote_distribution
     }, indent=2)
 
 # Tool to get the winning party in a riding
-@mcp.tool()
-def get_winning_party(riding_code: int):
-    """Get the party that won a specific riding."""
-    if riding_code not in RIDING_LOOKUP:
-        return json.dumps({"error": f"Riding code {riding_code} not found"}, indent=2)
+@tool()
+@cached({"riding_code": _riding_key})
+def get_winning_party(riding_code: Union[int, str], election: Optional[str] = None, language: str = DEFAULT_LANGUAGE):
+    """
+    Get the party that won a specific riding.
     
-    riding = RIDING_LOOKUP[riding_code]
+    Args:
+        riding_code: Code or name of the riding (e.g., 35020 or 'Carleton'; names are
+                     accent-insensitive and may be partial, ambiguous names list the candidates)
+        election: Optional election to query (default: 2021; see list_elections)
+        language: Language of the party, province and riding names, 'EN' or 'FR' (default: 'EN')
+    """
+    context, error = _election(election)
+    if error:
+        return json.dumps({"error": error}, indent=2)
+    
+    riding, error = _riding(context, riding_code, language)
+    if error:
+        return json.dumps(error, indent=2)
     
     # Find the party with the most votes
     max_votes = 0
@@ -200,11 +494,11 @@ def get_winning_party(riding_code: int):
             winning_party = party_vote
     
     if winning_party:
-        winning_party["partyName"] = PARTY_CODE_TO_NAME.get(winning_party["partyCode"], winning_party["partyCode"])
+        winning_party["partyName"] = party_name(winning_party["partyCode"], language)
         
         return json.dumps({
             "ridingCode": riding["ridingCode"],
-            "ridingName": riding["ridingName_EN"],
+            "ridingName": _riding_name(context.dataset, riding["ridingCode"], language),
             "province": riding["provCode"],
             "winningParty": winning_party
         }, indent=2)
@@ -212,8 +506,9 @@ def get_winning_party(riding_code: int):
     return json.dumps({"error": "No winning party found"}, indent=2)
 
 # Tool to summarize election results for a province
-@mcp.tool()
-def summarize_province_results(province_name_or_code: str):
+@tool()
+@cached({"province_name_or_code": get_province_code})
+def summarize_province_results(province_name_or_code: str, election: Optional[str] = None, language: str = DEFAULT_LANGUAGE):
     """
     Summarize election results for a province, showing seats won, votes received,
     and vote percentages for each party.
@@ -221,47 +516,64 @@ def summarize_province_results(province_name_or_code: str):
     Args:
         province_name_or_code: Province name or code (e.g., 'Ontario', 'ON', 'Quebec', 'QC')
                               Handles variations in spelling and language.
+        election: Optional election to query (default: 2021; see list_elections)
+        language: Language of the party, province and riding names, 'EN' or 'FR' (default: 'EN')
     
     Returns:
         JSON with summary statistics including seat counts, vote counts, and vote percentages
         for each party in the specified province.
     """
+    context, error = _election(election)
+    if error:
+        return json.dumps({"error": error}, indent=2)
+    dataset = context.dataset
+    
     # Get standardized province code
     province_code = get_province_code(province_name_or_code)
     if not province_code:
         return json.dumps({"error": f"Invalid province name or code: {province_name_or_code}"}, indent=2)
     
     # Get all ridings in the province
-    if province_code not in PROVINCE_LOOKUP:
+    if province_code not in dataset.province_masks:
         return json.dumps({"error": f"Province code {province_code} not found"}, indent=2)
     
-    province_ridings = PROVINCE_LOOKUP[province_code]
-    province_name = PROVINCE_CODE_TO_NAME.get(province_code, province_code)
-    
     # Summarize the results
-    summary = summarize_results(province_ridings, province_name, province_code)
+    summary = dataset.summarize_mask(dataset.province_masks[province_code], province_name(province_code, language),
+                                     province_code, language)
     
     return json.dumps(summary, indent=2)
 
 # Tool to summarize national election results
-@mcp.tool()
-def summarize_national_results():
+@tool()
+@cached()
+def summarize_national_results(election: Optional[str] = None, language: str = DEFAULT_LANGUAGE):
     """
-    Summarize national election results for the 2021 Canadian federal election,
-    showing seats won, votes received, and vote percentages for each party across Canada.
+    Summarize national election results for the 2021 Canadian federal election (or another
+    election), showing seats won, votes received, and vote percentages for each party across Canada.
+    
+    Args:
+        election: Optional election to query (default: 2021; see list_elections)
+        language: Language of the party, province and riding names, 'EN' or 'FR' (default: 'EN')
     
     Returns:
         JSON with summary statistics including seat counts, vote counts, and vote percentages
         for each party at the national level.
     """
+    context, error = _election(election)
+    if error:
+        return json.dumps({"error": error}, indent=2)
+    dataset = context.dataset
+    
     # Summarize the results for all ridings
-    summary = summarize_results(ELECTION_DATA, "National")
+    summary = dataset.summarize_mask(np.ones(dataset.num_ridings, dtype=bool), region_name(None, language),
+                                     language=language)
     
     return json.dumps(summary, indent=2)
 
 # Tool to find the closest ridings by vote margin
-@mcp.tool()
-def find_closest_ridings(num_results: int = 10, party: Optional[str] = None):
+@tool()
+@cached({"party": get_party_code})
+def find_closest_ridings(num_results: int = 10, party: Optional[str] = None, election: Optional[str] = None, language: str = DEFAULT_LANGUAGE):
     """
     Find the closest ridings in the 2021 Canadian federal election based on vote margin.
     
@@ -272,11 +584,18 @@ def find_closest_ridings(num_results: int = 10, party: Optional[str] = None):
         num_results: Number of results to return (default: 10)
         party: Optional party name or code (e.g., 'Liberal', 'LPC', 'Conservative', 'CPC').
                If provided, only shows close ridings won by this party.
+        election: Optional election to query (default: 2021; see list_elections)
+        language: Language of the party, province and riding names, 'EN' or 'FR' (default: 'EN')
     
     Returns:
         JSON with the closest ridings sorted by both raw vote margin and percentage margin,
         including details about the winner and runner-up in each riding.
     """
+    context, error = _election(election)
+    if error:
+        return json.dumps({"error": error}, indent=2)
+    dataset = context.dataset
+    
     # Validate party code if provided
     party_code = None
     if party:
@@ -284,68 +603,20 @@ def find_closest_ridings(num_results: int = 10, party: Optional[str] = None):
         if not party_code:
             return json.dumps({"error": f"Invalid party name or code: {party}"}, indent=2)
     
-    # Calculate margins for all ridings
-    ridings_with_margins = []
-    
-    for riding in ELECTION_DATA:
-        # Sort vote distribution by votes (descending)
-        vote_dist = sorted(riding["voteDistribution"], key=lambda x: x["votes"], reverse=True)
-        
-        if len(vote_dist) < 2:
-            continue  # Skip ridings with fewer than 2 parties
-        
-        winner = vote_dist[0]
-        runner_up = vote_dist[1]
-        
-        # Skip if we're filtering by party and this riding wasn't won by that party
-        if party_code and winner["partyCode"] != party_code:
-            continue
-        
-        # Calculate margins
-        vote_margin = winner["votes"] - runner_up["votes"]
-        percent_margin = winner["votePercent"] - runner_up["votePercent"]
-        
-        ridings_with_margins.append({
-            "ridingCode": riding["ridingCode"],
-            "ridingName": riding["ridingName_EN"],
-            "province": riding["provCode"],
-            "provinceName": PROVINCE_CODE_TO_NAME.get(riding["provCode"], riding["provCode"]),
-            "winner": {
-                "partyCode": winner["partyCode"],
-                "partyName": PARTY_CODE_TO_NAME.get(winner["partyCode"], winner["partyCode"]),
-                "votes": winner["votes"],
-                "votePercent": winner["votePercent"]
-            },
-            "runnerUp": {
-                "partyCode": runner_up["partyCode"],
-                "partyName": PARTY_CODE_TO_NAME.get(runner_up["partyCode"], runner_up["partyCode"]),
-                "votes": runner_up["votes"],
-                "votePercent": runner_up["votePercent"]
-            },
-            "voteMargin": vote_margin,
-            "percentMargin": percent_margin
-        })
-    
-    # Sort by percentage margin (ascending)
-    ridings_by_percent = sorted(ridings_with_margins, key=lambda x: x["percentMargin"])[:num_results]
-    
-    # Sort by vote margin (ascending)
-    ridings_by_votes = sorted(ridings_with_margins, key=lambda x: x["voteMargin"])[:num_results]
-    
-    return json.dumps({
-        "byVoteMargin": ridings_by_votes,
-        "byPercentMargin": ridings_by_percent
-    }, indent=2)
+    return json.dumps(dataset.closest_ridings(num_results, party_code, language), indent=2)
 
 # Tool to get best and worst results for a party
-@mcp.tool()
-def best_and_worst_results(party: str, num_entries: int = 10):
+@tool()
+@cached({"party": get_party_code})
+def best_and_worst_results(party: str, num_entries: int = 10, election: Optional[str] = None, language: str = DEFAULT_LANGUAGE):
     """
     Get the best and worst results for a specific party across all ridings.
     
     Args:
         party: Party name or code (e.g., 'Liberal', 'LPC', 'Conservative', 'CPC')
         num_entries: Number of entries to return for each category (default: 10)
+        election: Optional election to query (default: 2021; see list_elections)
+        language: Language of the party, province and riding names, 'EN' or 'FR' (default: 'EN')
         
     Returns:
         JSON with four categories:
@@ -354,101 +625,1067 @@ def best_and_worst_results(party: str, num_entries: int = 10):
         3. Worst ridings by vote percentage
         4. Worst ridings by losing margin (when party lost)
     """
+    context, error = _election(election)
+    if error:
+        return json.dumps({"error": error}, indent=2)
+    dataset = context.dataset
+    
     # Validate party code
     party_code = get_party_code(party)
     if not party_code:
         return json.dumps({"error": f"Invalid party name or code: {party}"}, indent=2)
     
-    # Lists to store results
-    by_percent = []
-    by_margin_win = []
-    by_margin_loss = []
-    
-    for riding in ELECTION_DATA:
-        # Get party's result in this riding
-        party_result = None
-        for vote in riding["voteDistribution"]:
-            if vote["partyCode"] == party_code:
-                party_result = vote
-                break
-        
-        if not party_result:
-            continue  # Party didn't run in this riding
-        
-        # Sort vote distribution by votes (descending)
-        vote_dist = sorted(riding["voteDistribution"], key=lambda x: x["votes"], reverse=True)
-        winner = vote_dist[0]
-        
-        # Add to by_percent list
-        by_percent.append({
-            "ridingCode": riding["ridingCode"],
-            "ridingName": riding["ridingName_EN"],
-            "province": riding["provCode"],
-            "provinceName": PROVINCE_CODE_TO_NAME.get(riding["provCode"], riding["provCode"]),
-            "votes": party_result["votes"],
-            "votePercent": party_result["votePercent"]
-        })
-        
-        # Check if party won or lost
-        if winner["partyCode"] == party_code:
-            # Party won - calculate winning margin
-            if len(vote_dist) > 1:
-                runner_up = vote_dist[1]
-                margin = party_result["votePercent"] - runner_up["votePercent"]
-                
-                by_margin_win.append({
-                    "ridingCode": riding["ridingCode"],
-                    "ridingName": riding["ridingName_EN"],
-                    "province": riding["provCode"],
-                    "provinceName": PROVINCE_CODE_TO_NAME.get(riding["provCode"], riding["provCode"]),
-                    "votes": party_result["votes"],
-                    "votePercent": party_result["votePercent"],
-                    "runnerUp": {
-                        "partyCode": runner_up["partyCode"],
-                        "partyName": PARTY_CODE_TO_NAME.get(runner_up["partyCode"], runner_up["partyCode"]),
-                        "votes": runner_up["votes"],
-                        "votePercent": runner_up["votePercent"]
-                    },
-                    "margin": margin
-                })
-        else:
-            # Party lost - calculate losing margin
-            margin = winner["votePercent"] - party_result["votePercent"]
-            
-            by_margin_loss.append({
-                "ridingCode": riding["ridingCode"],
-                "ridingName": riding["ridingName_EN"],
-                "province": riding["provCode"],
-                "provinceName": PROVINCE_CODE_TO_NAME.get(riding["provCode"], riding["provCode"]),
-                "votes": party_result["votes"],
-                "votePercent": party_result["votePercent"],
-                "winner": {
-                    "partyCode": winner["partyCode"],
-                    "partyName": PARTY_CODE_TO_NAME.get(winner["partyCode"], winner["partyCode"]),
-                    "votes": winner["votes"],
-                    "votePercent": winner["votePercent"]
-                },
-                "margin": margin
-            })
+    return json.dumps(dataset.best_and_worst(party_code, num_entries, language), indent=2)
+
+# Tool to define a custom region
+@tool()
+def define_region(name: str, riding_codes: Optional[List[int]] = None,
+                  provinces: Optional[List[str]] = None, regions: Optional[List[str]] = None,
+                  election: Optional[str] = None, language: str = DEFAULT_LANGUAGE):
+    """
+    Define a named custom region (e.g. 'GTA 905 belt', 'Island of Montreal') that can be
+    used with summarize_region. The region is the union of all ridings, provinces and
+    previously defined regions given. Defining an existing name replaces it. Each election
+    holds a limited number of custom regions.
+    
+    Args:
+        name: Name of the region
+        riding_codes: Riding codes to include
+        provinces: Province names or codes to include (e.g., 'Ontario', 'QC')
+        regions: Names of previously defined regions to include
+        election: Optional election to query (default: 2021; see list_elections)
+        language: Language of the party, province and riding names, 'EN' or 'FR' (default: 'EN')
     
-    # Sort the lists
-    top_by_percent = sorted(by_percent, key=lambda x: x["votePercent"], reverse=True)[:num_entries]
-    worst_by_percent = sorted(by_percent, key=lambda x: x["votePercent"])[:num_entries]
-    top_by_margin = sorted(by_margin_win, key=lambda x: x["margin"], reverse=True)[:num_entries]
-    worst_by_margin = sorted(by_margin_loss, key=lambda x: x["margin"], reverse=True)[:num_entries]
+    Returns:
+        JSON with the region name, number of ridings and riding codes.
+    """
+    context, error = _election(election)
+    if error:
+        return json.dumps({"error": error}, indent=2)
     
-    return json.dumps({
-        "topByVotePercent": top_by_percent,
-        "topByWinningMargin": top_by_margin,
-        "worstByVotePercent": worst_by_percent,
-        "worstByLosingMargin": worst_by_margin
-    }, indent=2)
+    if not (riding_codes or provinces or regions):
+        return json.dumps({"error": "At least one riding code, province or region is required"}, indent=2)
+    
+    try:
+        bits = context.regions.union(list(riding_codes or []) + list(provinces or []) + list(regions or []))
+        region = context.regions.define(name, bits)
+    except RegionError as e:
+        return json.dumps({"error": str(e)}, indent=2)
+    
+    return json.dumps(region, indent=2)
+
+# Tool to list custom regions
+@tool()
+@cached(depends_on=_regions_version)
+def list_regions(election: Optional[str] = None, language: str = DEFAULT_LANGUAGE):
+    """
+    List the custom regions that have been defined, with their number of ridings.
+    
+    Args:
+        election: Optional election to query (default: 2021; see list_elections)
+        language: Language of the party, province and riding names, 'EN' or 'FR' (default: 'EN')
+    """
+    context, error = _election(election)
+    if error:
+        return json.dumps({"error": error}, indent=2)
+    
+    return json.dumps(context.regions.list(), indent=2)
+
+# Tool to summarize election results for a custom region
+@tool()
+@cached({"won_by": get_party_code}, depends_on=_regions_version)
+def summarize_region(include: Optional[List[str]] = None, intersect: Optional[List[str]] = None,
+                     exclude: Optional[List[str]] = None, won_by: Optional[str] = None,
+                     max_margin: Optional[float] = None, election: Optional[str] = None, language: str = DEFAULT_LANGUAGE):
+    """
+    Summarize election results for any combination of regions, showing seats won,
+    votes received, and vote percentages for each party.
+    
+    Regions can be custom region names (see define_region), province names or codes,
+    'National', or riding codes.
+    
+    Args:
+        include: Regions to combine (union). Defaults to all ridings.
+        intersect: Regions the ridings must also belong to (intersection)
+        exclude: Regions to remove (difference)
+        won_by: Only keep ridings won by this party (e.g., 'Liberal', 'CPC')
+        max_margin: Only keep ridings where the winning margin was below this many
+                    percentage points
+        election: Optional election to query (default: 2021; see list_elections)
+        language: Language of the party, province and riding names, 'EN' or 'FR' (default: 'EN')
+    
+    Returns:
+        JSON with summary statistics including seat counts, vote counts, and vote percentages
+        for each party in the selected ridings.
+    """
+    context, error = _election(election)
+    if error:
+        return json.dumps({"error": error}, indent=2)
+    
+    try:
+        bits = context.regions.build(include, intersect, exclude, won_by, max_margin)
+    except RegionError as e:
+        return json.dumps({"error": str(e)}, indent=2)
+    
+    name = (REGION_NAME_SEPARATOR.join(region_display_name(r, language) for r in include) if include
+            else region_name(None, language))
+    summary = context.regions.summarize(bits, name, language)
+    
+    return json.dumps(summary, indent=2)
+
+def _province_mask(province: Optional[str], dataset: Optional[ElectionDataset] = None):
+    """Return the riding mask and province code for an optional province filter."""
+    dataset = dataset or DATASET
+    if not province:
+        return np.ones(dataset.num_ridings, dtype=bool), None
+    province_code = get_province_code(province)
+    if not province_code or province_code not in dataset.province_masks:
+        return None, None
+    return dataset.province_masks[province_code], province_code
+
+def _riding_entry(row: int, dataset: Optional[ElectionDataset] = None, language: str = DEFAULT_LANGUAGE):
+    """Return the common identifying fields for a riding row of a dataset (default: DATASET), in a language."""
+    return (dataset or DATASET)._riding_fields(row, language)
+
+def _party_entry(row: int, col: int, dataset: Optional[ElectionDataset] = None, language: str = DEFAULT_LANGUAGE):
+    """Return the party fields for a riding row and party column of a dataset (default: DATASET), in a language."""
+    return (dataset or DATASET)._party_fields(row, col, language)
+
+# Tool to get where a party finished in each riding
+@tool()
+@cached({"party": get_party_code, "province": get_province_code})
+def party_finish_positions(party: str, position: Optional[int] = None,
+                           province: Optional[str] = None, num_entries: int = 10,
+                           election: Optional[str] = None, language: str = DEFAULT_LANGUAGE):
+    """
+    Count the ridings where a party finished 1st, 2nd, 3rd, and so on.
+    
+    Args:
+        party: Party name or code (e.g., 'Liberal', 'LPC', 'NDP')
+        position: Optional finishing position (1 = won). If provided, also lists the
+                  ridings where the party finished in that position, sorted by vote percentage.
+        province: Optional province name or code to restrict the ridings
+        num_entries: Number of ridings to list for the requested position (default: 10)
+        election: Optional election to query (default: 2021; see list_elections)
+        language: Language of the party, province and riding names, 'EN' or 'FR' (default: 'EN')
+    
+    Returns:
+        JSON with the number of ridings per finishing position (ridings where the party
+        received no votes are counted separately) and, if requested, the matching ridings.
+    """
+    context, error = _election(election)
+    if error:
+        return json.dumps({"error": error}, indent=2)
+    dataset = context.dataset
+    
+    party_code = get_party_code(party)
+    if not party_code or party_code not in dataset.party_index:
+        return json.dumps({"error": f"Invalid party name or code: {party}"}, indent=2)
+    
+    mask, province_code = _province_mask(province, dataset)
+    if mask is None:
+        return json.dumps({"error": f"Invalid province name or code: {province}"}, indent=2)
+    
+    col = dataset.party_index[party_code]
+    ranks = dataset.rank[mask, col]
+    counts = np.bincount(ranks, minlength=dataset.num_parties + 1)
+    
+    result = {
+        "partyCode": party_code,
+        "partyName": party_name(party_code, language),
+        "totalRidings": int(np.count_nonzero(mask)),
+        "positions": {str(rank): int(counts[rank]) for rank in range(1, len(counts)) if counts[rank]},
+        "noVotes": int(counts[0])
+    }
+    if province_code:
+        result["province"] = province_code
+    
+    if position is not None:
+        rows = np.flatnonzero(mask & (dataset.rank[:, col] == position))
+        # Sort by the party's vote percentage (descending)
+        rows = rows[np.argsort(-dataset.vote_percent[rows, col], kind="stable")][:num_entries]
+        ridings = []
+        for row in rows:
+            entry = _riding_entry(row, dataset, language)
+            entry["votes"] = int(dataset.votes[row, col])
+            entry["votePercent"] = float(dataset.vote_percent[row, col])
+            if dataset.winner[row] >= 0:
+                entry["winner"] = _party_entry(row, dataset.winner[row], dataset, language)
+            ridings.append(entry)
+        result["position"] = position
+        result["ridings"] = ridings
+    
+    return json.dumps(result, indent=2)
+
+# Tool to compare two parties head to head
+@tool()
+@cached({"party_a": get_party_code, "party_b": get_party_code, "province": get_province_code})
+def head_to_head(party_a: str, party_b: str, province: Optional[str] = None, num_entries: int = 10,
+                 election: Optional[str] = None, language: str = DEFAULT_LANGUAGE):
+    """
+    Compare two parties riding by riding (e.g. Liberal vs Conservative).
+    
+    Args:
+        party_a: First party name or code (e.g., 'Liberal', 'LPC')
+        party_b: Second party name or code (e.g., 'Conservative', 'CPC')
+        province: Optional province name or code to restrict the ridings
+        num_entries: Number of closest two-way contests to list (default: 10)
+        election: Optional election to query (default: 2021; see list_elections)
+        language: Language of the party, province and riding names, 'EN' or 'FR' (default: 'EN')
+    
+    Returns:
+        JSON with the number of ridings where each party finished ahead of the other,
+        the average percentage-point margin, and the two-way contests (ridings where
+        the two parties finished first and second), including the closest ones.
+    """
+    context, error = _election(election)
+    if error:
+        return json.dumps({"error": error}, indent=2)
+    dataset = context.dataset
+    
+    code_a = get_party_code(party_a)
+    code_b = get_party_code(party_b)
+    if not code_a or code_a not in dataset.party_index:
+        return json.dumps({"error": f"Invalid party name or code: {party_a}"}, indent=2)
+    if not code_b or code_b not in dataset.party_index:
+        return json.dumps({"error": f"Invalid party name or code: {party_b}"}, indent=2)
+    if code_a == code_b:
+        return json.dumps({"error": "Two different parties are required"}, indent=2)
+    
+    mask, province_code = _province_mask(province, dataset)
+    if mask is None:
+        return json.dumps({"error": f"Invalid province name or code: {province}"}, indent=2)
+    
+    col_a = dataset.party_index[code_a]
+    col_b = dataset.party_index[code_b]
+    
+    if province_code:
+        # Restrict the comparison to the province
+        votes_a = dataset.votes[mask, col_a]
+        votes_b = dataset.votes[mask, col_b]
+        a_ahead = int(np.count_nonzero((votes_a > votes_b) & (votes_a > 0)))
+        b_ahead = int(np.count_nonzero((votes_b > votes_a) & (votes_b > 0)))
+    else:
+        # Use the table precomputed at load time
+        a_ahead = int(dataset.head_to_head[col_a, col_b])
+        b_ahead = int(dataset.head_to_head[col_b, col_a])
+    
+    margin = dataset.pair_margin(col_a, col_b)
+    contested = mask & (dataset.votes[:, col_a] > 0) & (dataset.votes[:, col_b] > 0)
+    
+    # Two-way contests: the two parties finished first and second
+    ranks_a = dataset.rank[:, col_a]
+    ranks_b = dataset.rank[:, col_b]
+    two_way = mask & (((ranks_a == 1) & (ranks_b == 2)) | ((ranks_a == 2) & (ranks_b == 1)))
+    rows = np.flatnonzero(two_way)
+    rows = rows[np.argsort(np.abs(margin[rows]), kind="stable")][:num_entries]
+    
+    closest = []
+    for row in rows:
+        entry = _riding_entry(row, dataset, language)
+        entry["partyA"] = _party_entry(row, col_a, dataset, language)
+        entry["partyB"] = _party_entry(row, col_b, dataset, language)
+        entry["margin"] = float(margin[row])
+        closest.append(entry)
+    
+    result = {
+        "partyA": code_a,
+        "partyB": code_b,
+        "totalRidings": int(np.count_nonzero(mask)),
+        "partyAAhead": a_ahead,
+        "partyBAhead": b_ahead,
+        "averageMargin": round(float(margin[contested].mean()), 2) if contested.any() else None,
+        "twoWayContests": {
+            "total": int(np.count_nonzero(two_way)),
+            "partyAWins": int(np.count_nonzero(two_way & (ranks_a == 1))),
+            "partyBWins": int(np.count_nonzero(two_way & (ranks_b == 1))),
+            "closest": closest
+        }
+    }
+    if province_code:
+        result["province"] = province_code
+    
+    return json.dumps(result, indent=2)
+
+def _similar_ridings(riding_codes: List[int], num_results: int, province: Optional[str], context,
+                     language: str = DEFAULT_LANGUAGE):
+    """Find similar ridings for each riding code of an election, or return an error message."""
+    dataset = context.dataset
+    missing = [code for code in riding_codes if code not in dataset.row_by_code]
+    if missing:
+        return None, f"Riding code {missing[0]} not found"
+    
+    mask, _ = _province_mask(province, dataset)
+    if mask is None:
+        return None, f"Invalid province name or code: {province}"
+    
+    anchor_rows = [dataset.row_by_code[code] for code in riding_codes]
+    neighbours = context.similarity.nearest(np.array(anchor_rows), num_results, mask)
+    
+    results = []
+    for row, matches in zip(anchor_rows, neighbours):
+        entry = _riding_entry(row, dataset, language)
+        entry["similarRidings"] = []
+        for match_row, distance in matches:
+            match = _riding_entry(match_row, dataset, language)
+            match["distance"] = round(distance, 2)
+            if dataset.winner[match_row] >= 0:
+                match["winner"] = dataset.party_codes[dataset.winner[match_row]]
+            entry["similarRidings"].append(match)
+        results.append(entry)
+    return results, None
+
+# Tool to find the ridings that voted most like a given riding
+@tool()
+@cached({"riding_code": _riding_key, "province": get_province_code})
+def find_similar_ridings(riding_code: Union[int, str], num_results: int = 5, province: Optional[str] = None,
+                         election: Optional[str] = None, language: str = DEFAULT_LANGUAGE):
+    """
+    Find the ridings that voted most like a given riding.
+    
+    Similarity is the distance between the ridings' vote percentages for every party
+    and their turnout, in percentage points (smaller is more similar).
+    
+    Args:
+        riding_code: Code or name of the riding to compare against (e.g., 35020 or
+                     'Carleton'; ambiguous names list the candidates)
+        num_results: Number of similar ridings to return (default: 5)
+        province: Optional province name or code to restrict the candidate ridings
+        election: Optional election to query (default: 2021; see list_elections)
+        language: Language of the party, province and riding names, 'EN' or 'FR' (default: 'EN')
+    
+    Returns:
+        JSON with the riding and its most similar ridings, with their distance and winner.
+    """
+    context, error = _election(election)
+    if error:
+        return json.dumps({"error": error}, indent=2)
+    
+    riding, error = _riding(context, riding_code, language)
+    if error:
+        return json.dumps(error, indent=2)
+    
+    results, error = _similar_ridings([riding["ridingCode"]], num_results, province, context, language)
+    if error:
+        return json.dumps({"error": error}, indent=2)
+    
+    return json.dumps(results[0], indent=2)
+
+# Tool to find similar ridings for several ridings at once
+@tool()
+@cached({"riding_codes": _riding_keys, "province": get_province_code})
+def find_similar_ridings_batch(riding_codes: List[Union[int, str]], num_results: int = 5, province: Optional[str] = None,
+                               election: Optional[str] = None, language: str = DEFAULT_LANGUAGE):
+    """
+    Find the ridings that voted most like each of several ridings in a single call.
+    
+    Args:
+        riding_codes: Codes or names of the ridings to compare against
+        num_results: Number of similar ridings to return per riding (default: 5)
+        province: Optional province name or code to restrict the candidate ridings
+        election: Optional election to query (default: 2021; see list_elections)
+        language: Language of the party, province and riding names, 'EN' or 'FR' (default: 'EN')
+    
+    Returns:
+        JSON list with, for each riding, its most similar ridings.
+    """
+    context, error = _election(election)
+    if error:
+        return json.dumps({"error": error}, indent=2)
+    
+    if not riding_codes:
+        return json.dumps({"error": "At least one riding code is required"}, indent=2)
+    
+    codes = []
+    for riding_code in riding_codes:
+        riding, error = _riding(context, riding_code, language)
+        if error:
+            return json.dumps(error, indent=2)
+        codes.append(riding["ridingCode"])
+    
+    results, error = _similar_ridings(codes, num_results, province, context, language)
+    if error:
+        return json.dumps({"error": error}, indent=2)
+    
+    return json.dumps(results, indent=2)
+
+# Tool to export the vote table (not cached: each chunk is read once, and caching
+# the chunks would keep the whole table in the result cache)
+@tool()
+def export_votes(export_format: str = "csv", province: Optional[str] = None, party: Optional[str] = None,
+                 cursor: Optional[str] = None, chunk_size: int = 1000, election: Optional[str] = None, language: str = DEFAULT_LANGUAGE):
+    """
+    Export the vote table (one row per riding and party) in chunks, instead of
+    calling get_party_votes for every riding.
+    
+    Call repeatedly, passing the returned nextCursor, until nextCursor is null.
+    
+    Args:
+        export_format: 'csv', 'ndjson', or 'columnar' (schema plus base64 column buffers)
+        province: Optional province name or code to export only that province
+        party: Optional party name or code to export only that party
+        cursor: Cursor returned by the previous call (omit for the first chunk)
+        chunk_size: Maximum number of rows per chunk (default: 1000, maximum: 10000)
+        election: Optional election to query (default: 2021; see list_elections)
+        language: Language of the party, province and riding names, 'EN' or 'FR' (default: 'EN')
+    
+    Returns:
+        JSON with the chunk data, the number of rows in the chunk, the total number of
+        rows, and the cursor of the next chunk.
+    """
+    context, error = _election(election)
+    if error:
+        return json.dumps({"error": error}, indent=2)
+    
+    province_code = None
+    if province:
+        province_code = get_province_code(province)
+        if not province_code:
+            return json.dumps({"error": f"Invalid province name or code: {province}"}, indent=2)
+    
+    party_code = None
+    if party:
+        party_code = get_party_code(party)
+        if not party_code:
+            return json.dumps({"error": f"Invalid party name or code: {party}"}, indent=2)
+    
+    try:
+        chunk = context.exporter.export_chunk(export_format, cursor, chunk_size, province_code, party_code, language)
+    except ExportError as e:
+        return json.dumps({"error": str(e)}, indent=2)
+    
+    return json.dumps(chunk, indent=2)
+
+# Tool to analyze turnout and rejected ballots
+@tool()
+@cached({"province": get_province_code, "riding_code": _riding_key})
+def turnout_statistics(province: Optional[str] = None, metric: str = "turnout",
+                       num_entries: int = 10, riding_code: Optional[Union[int, str]] = None,
+                       election: Optional[str] = None, language: str = DEFAULT_LANGUAGE):
+    """
+    Analyze voter turnout and rejected ballots nationally or in a province.
+    
+    Args:
+        province: Optional province name or code (national if omitted)
+        metric: Metric used to rank ridings: 'turnout' (ballots cast as a percentage of
+                registered voters) or 'rejected_rate' (rejected ballots as a percentage
+                of ballots cast)
+        num_entries: Number of highest and lowest ridings to return (default: 10)
+        riding_code: Optional riding code or name; if provided, also returns the riding's
+                     figures and its percentile within the province or country
+        election: Optional election to query (default: 2021; see list_elections)
+        language: Language of the party, province and riding names, 'EN' or 'FR' (default: 'EN')
+    
+    Returns:
+        JSON with weighted turnout and rejected-ballot rates, quantiles, the correlation
+        between turnout and each party's vote share, and the highest and lowest ridings
+        by the chosen metric.
+    """
+    context, error = _election(election)
+    if error:
+        return json.dumps({"error": error}, indent=2)
+    dataset = context.dataset
+    
+    if metric not in TURNOUT_METRICS:
+        return json.dumps({"error": f"Invalid metric {metric}; expected one of {', '.join(TURNOUT_METRICS)}"}, indent=2)
+    
+    province_code = None
+    if province:
+        province_code = get_province_code(province)
+        if not province_code or province_code not in dataset.province_masks:
+            return json.dumps({"error": f"Invalid province name or code: {province}"}, indent=2)
+    
+    def ranked(rows):
+        entries = []
+        for row in rows:
+            entry = _riding_entry(row, dataset, language)
+            entry.update(context.turnout.riding_metrics(row))
+            entries.append(entry)
+        return entries
+    
+    result = context.turnout.summary(province_code)
+    result["regionName"] = region_name(province_code, language)
+    result["metric"] = metric
+    result["highest"] = ranked(context.turnout.top(province_code, metric, num_entries, highest=True))
+    result["lowest"] = ranked(context.turnout.top(province_code, metric, num_entries, highest=False))
+    
+    if riding_code is not None:
+        riding, error = _riding(context, riding_code, language)
+        if error:
+            return json.dumps(error, indent=2)
+        riding_code = riding["ridingCode"]
+        row = dataset.row_by_code[riding_code]
+        if province_code and dataset.province_codes[row] != province_code:
+            return json.dumps({"error": f"Riding code {riding_code} is not in {province_code}"}, indent=2)
+        riding = ranked([row])[0]
+        riding["turnoutPercentile"] = context.turnout.percentile(province_code, "turnout", row)
+        riding["rejectedRatePercentile"] = context.turnout.percentile(province_code, "rejected_rate", row)
+        result["riding"] = riding
+    
+    return json.dumps(result, indent=2)
+
+# Tool to list the loaded elections
+@tool()
+@cached(depends_on=lambda arguments: ELECTIONS.version)
+def list_elections(language: str = DEFAULT_LANGUAGE):
+    """
+    List the elections that are loaded and can be compared with compare_elections or
+    passed as the election argument of the other tools, and the transposition tables.
+    
+    An election can be projected onto the boundaries of a transposition table by
+    using '<election>@<table>' as the election (e.g. '2021@fed2023').
+    
+    Args:
+        language: Language of the party, province and riding names, 'EN' or 'FR' (default: 'EN')
+    
+    Returns:
+        JSON with the elections (number of ridings and parties) and the transposition
+        tables (number of source units and target ridings).
+    """
+    return json.dumps(ELECTIONS.list(), indent=2)
+
+# Tool to compare two elections
+@tool()
+@cached({"province": get_province_code, "party": get_party_code, "riding_code": _riding_key},
+        depends_on=lambda arguments: ELECTIONS.version)
+def compare_elections(base_election: str, target_election: Optional[str] = None,
+                      province: Optional[str] = None, party: Optional[str] = None,
+                      riding_code: Optional[Union[int, str]] = None, num_entries: int = 10, language: str = DEFAULT_LANGUAGE):
+    """
+    Compare two elections riding by riding, instead of calling get_party_votes for
+    each riding in each election.
+    
+    Ridings are matched by riding code; ridings that exist in only one of the
+    elections are counted but left out of the comparison.
+    
+    Args:
+        base_election: Earlier election (e.g., '2019'; see list_elections)
+        target_election: Later election (default: the bundled 2021 election)
+        province: Optional province name or code to restrict the comparison
+        party: Optional party name or code; if provided, lists the ridings where the
+               party gained and lost the most vote share
+        riding_code: Optional riding code or name (in the target election); if provided,
+                     also returns the change in that riding
+        num_entries: Number of ridings to list (default: 10)
+        language: Language of the party, province and riding names, 'EN' or 'FR' (default: 'EN')
+    
+    Returns:
+        JSON with the vote share and seat changes of each party, the seats that changed
+        hands and between which parties, the flipped ridings, and either the biggest
+        gains and losses of the party or the most volatile ridings.
+    """
+    try:
+        base_id, target_id = ELECTIONS.resolve(base_election), ELECTIONS.resolve(target_election)
+        comparison = ELECTIONS.compare(base_id, target_id)
+    except ElectionError as e:
+        return json.dumps({"error": str(e)}, indent=2)
+    
+    province_code = None
+    if province:
+        province_code = get_province_code(province)
+        if not province_code or province_code not in comparison.target.province_masks:
+            return json.dumps({"error": f"Invalid province name or code: {province}"}, indent=2)
+    
+    col = None
+    if party:
+        party_code = get_party_code(party)
+        if not party_code or party_code not in comparison.party_index:
+            return json.dumps({"error": f"Invalid party name or code: {party}"}, indent=2)
+        col = comparison.party_index[party_code]
+    
+    def entries(rows, party_col=None):
+        result = []
+        for row in rows:
+            entry = _riding_entry(comparison.target_rows[row], comparison.target, language)
+            entry.update(comparison.riding_change(row, party_col, language))
+            if party_col is None:
+                entry.pop("parties")
+            result.append(entry)
+        return result
+    
+    mask = comparison.scope_mask(province_code)
+    result = {
+        "baseElection": base_id,
+        "targetElection": target_id,
+        "regionName": region_name(province_code, language),
+        "unmatchedBaseRidings": int(len(comparison.unmatched_base)),
+        "unmatchedTargetRidings": int(len(comparison.unmatched_target))
+    }
+    result.update(comparison.aggregate(mask, language))
+    result["flippedRidings"] = entries(comparison.ranked(mask & comparison.flipped, comparison.volatility, num_entries))
+    
+    if col is not None:
+        swing = comparison.percent_change[:, col]
+        result["partyCode"] = comparison.party_codes[col]
+        result["biggestGains"] = entries(comparison.ranked(mask, swing, num_entries, highest=True), col)
+        result["biggestLosses"] = entries(comparison.ranked(mask, swing, num_entries, highest=False), col)
+    else:
+        result["mostVolatile"] = entries(comparison.ranked(mask, comparison.volatility, num_entries))
+    
+    if riding_code is not None:
+        riding, error = _riding(ELECTIONS.context(target_id), riding_code, language)
+        if error:
+            return json.dumps(error, indent=2)
+        riding_code = riding["ridingCode"]
+        if riding_code not in comparison.row_by_code:
+            return json.dumps({"error": f"Riding code {riding_code} not found in both elections"}, indent=2)
+        row = comparison.row_by_code[riding_code]
+        riding = _riding_entry(comparison.target_rows[row], comparison.target, language)
+        riding.update(comparison.riding_change(row, language=language))
+        result["riding"] = riding
+    
+    return json.dumps(result, indent=2)
+
+# Tool to transpose an election onto other riding boundaries
+@tool()
+@cached(depends_on=lambda arguments: ELECTIONS.version)
+def transpose_election(table: str, election: Optional[str] = None, language: str = DEFAULT_LANGUAGE):
+    """
+    Project an election's results onto other riding boundaries using a transposition
+    table (see list_elections), e.g. to compare past results with the current ridings.
+    
+    The projected election can then be used with every tool by passing
+    '<election>@<table>' as the election argument.
+    
+    Args:
+        table: Name of the transposition table
+        election: Optional election to project (default: 2021; see list_elections)
+        language: Language of the party, province and riding names, 'EN' or 'FR' (default: 'EN')
+    
+    Returns:
+        JSON with the identifier of the projected election, the share of the source
+        votes it retains, and its national results.
+    """
+    source, error = _election(election)
+    if error:
+        return json.dumps({"error": error}, indent=2)
+    
+    try:
+        election_id = ELECTIONS.transpose(source.election_id, table)
+    except ElectionError as e:
+        return json.dumps({"error": str(e)}, indent=2)
+    
+    dataset = ELECTIONS.get(election_id)
+    source_votes = int(source.dataset.valid_votes.sum(dtype=np.int64))
+    projected_votes = int(dataset.valid_votes.sum(dtype=np.int64))
+    result = {
+        "election": election_id,
+        "sourceElection": source.election_id,
+        "table": ELECTIONS.tables[table].describe(),
+        "ridings": dataset.num_ridings,
+        "votesRetainedPercent": round(projected_votes / source_votes * 100, 2) if source_votes else None,
+        "national": dataset.summarize_mask(np.ones(dataset.num_ridings, dtype=bool), region_name(None, language),
+                                       language=language)
+    }
+    
+    return json.dumps(result, indent=2)
+
+# Tool to simulate other electoral systems
+@tool()
+@cached({"province": get_province_code, "methods": lambda methods: [get_method(m) or m for m in methods]})
+def simulate_electoral_systems(methods: Optional[List[str]] = None, province: Optional[str] = None,
+                               threshold: float = 0.0, regional: bool = True,
+                               list_seat_share: float = 0.4, election: Optional[str] = None, language: str = DEFAULT_LANGUAGE):
+    """
+    Re-allocate seats under proportional or mixed-member electoral systems and compare
+    them with the first-past-the-post result.
+    
+    Args:
+        methods: Methods to simulate: 'dhondt', 'sainte_lague', 'largest_remainder'
+                 (Hare quota) and/or 'mmp' (default: all of them)
+        province: Optional province name or code to simulate on its own
+        threshold: Minimum vote percentage a party needs in an allocation region to receive
+                   proportional or list seats (default: 0)
+        regional: Allocate seats within each province, keeping its number of ridings
+                  (default: true), or in one national pool
+        list_seat_share: For mmp, the share of all seats that are compensatory list seats
+                         added to the ridings (default: 0.4)
+        election: Optional election to query (default: 2021; see list_elections)
+        language: Language of the party, province and riding names, 'EN' or 'FR' (default: 'EN')
+    
+    Returns:
+        JSON with the first-past-the-post seats and, for each method, the seats, seat
+        percentage and change from first-past-the-post of each party (in seats and in
+        percentage points, as mmp adds list seats to the ridings), the seats added to the
+        chamber, and whether a party would have a majority.
+    """
+    context, error = _election(election)
+    if error:
+        return json.dumps({"error": error}, indent=2)
+    
+    canonical = []
+    for method in methods or ALLOCATION_METHODS:
+        name = get_method(method)
+        if not name:
+            return json.dumps({"error": f"Invalid method {method}; expected one of {', '.join(ALLOCATION_METHODS)}"}, indent=2)
+        canonical.append(name)
+    
+    province_code = None
+    if province:
+        province_code = get_province_code(province)
+        if not province_code or province_code not in context.dataset.province_masks:
+            return json.dumps({"error": f"Invalid province name or code: {province}"}, indent=2)
+    
+    try:
+        result = context.seats.simulate(canonical, province_code, threshold, regional, list_seat_share, language)
+    except ElectoralSystemError as e:
+        return json.dumps({"error": str(e)}, indent=2)
+    
+    result["regionName"] = region_name(province_code, language)
+    return json.dumps(result, indent=2)
+
+# Tool to get the votes needed to flip ridings
+@tool()
+@cached({"riding_code": _riding_key, "party": get_party_code, "province": get_province_code})
+def votes_to_flip(riding_code: Optional[Union[int, str]] = None, party: Optional[str] = None,
+                  province: Optional[str] = None, mode: str = "added", num_entries: int = 10,
+                  election: Optional[str] = None, language: str = DEFAULT_LANGUAGE):
+    """
+    Get the exact number of votes a party needs to win a riding.
+    
+    With a riding code, returns the votes every party needs to win that riding. With a
+    party, returns the ridings the party could win with the fewest votes.
+    
+    Args:
+        riding_code: Optional riding code or name (e.g., 35020 or 'Carleton'; ambiguous
+                     names list the candidates)
+        party: Optional party name or code (required if no riding is given)
+        province: Optional province name or code to restrict the ridings listed for a party
+        mode: 'added' (new votes for the party) or 'switched' (votes switching from the
+              winner to the party, each counting twice) (default: 'added')
+        num_entries: Number of ridings to list for a party (default: 10)
+        election: Optional election to query (default: 2021; see list_elections)
+        language: Language of the party, province and riding names, 'EN' or 'FR' (default: 'EN')
+    
+    Returns:
+        JSON with the votes needed under both modes for each party in the riding, or the
+        party's cheapest ridings to flip with their current winner and votes needed.
+    """
+    context, error = _election(election)
+    if error:
+        return json.dumps({"error": error}, indent=2)
+    dataset = context.dataset
+    flips = context.flips
+    
+    if mode not in FLIP_MODES:
+        return json.dumps({"error": f"Invalid mode {mode}; expected one of {', '.join(FLIP_MODES)}"}, indent=2)
+    
+    col = None
+    if party:
+        party_code = get_party_code(party)
+        if not party_code or party_code not in dataset.party_index:
+            return json.dumps({"error": f"Invalid party name or code: {party}"}, indent=2)
+        col = dataset.party_index[party_code]
+    
+    if riding_code is not None:
+        riding, error = _riding(context, riding_code, language)
+        if error:
+            return json.dumps(error, indent=2)
+        row = dataset.row_by_code[riding["ridingCode"]]
+        result = _riding_entry(row, dataset, language)
+        if dataset.winner[row] >= 0:
+            result["winner"] = _party_entry(row, dataset.winner[row], dataset, language)
+        cols = [col] if col is not None else np.flatnonzero(dataset.has_party[row]).tolist()
+        parties = []
+        for c in cols:
+            entry = _party_entry(row, c, dataset, language)
+            entry["held"] = bool(dataset.winner[row] == c)
+            for flip_mode in FLIP_MODES:
+                cost = int(flips.costs[flip_mode][row, c])
+                entry[f"{flip_mode}VotesNeeded"] = cost if cost != UNFLIPPABLE else None
+            parties.append(entry)
+        parties.sort(key=lambda x: (x["addedVotesNeeded"] is None, x["addedVotesNeeded"] or 0))
+        result["parties"] = parties
+        return json.dumps(result, indent=2)
+    
+    if col is None:
+        return json.dumps({"error": "A riding code or a party is required"}, indent=2)
+    
+    mask, province_code = _province_mask(province, dataset)
+    if mask is None:
+        return json.dumps({"error": f"Invalid province name or code: {province}"}, indent=2)
+    
+    cost = flips.costs[mode][:, col]
+    rows = np.flatnonzero(mask & (dataset.winner != col) & (cost != UNFLIPPABLE))
+    rows = rows[np.argsort(cost[rows], kind="stable")][:num_entries]
+    ridings = []
+    for row in rows:
+        entry = _riding_entry(row, dataset, language)
+        entry["party"] = _party_entry(row, col, dataset, language)
+        entry["winner"] = _party_entry(row, dataset.winner[row], dataset, language)
+        entry["votesNeeded"] = int(cost[row])
+        ridings.append(entry)
+    
+    result = {
+        "partyCode": dataset.party_codes[col],
+        "mode": mode,
+        "seats": int(flips.seats[col]),
+        "ridings": ridings
+    }
+    if province_code:
+        result["province"] = province_code
+    
+    return json.dumps(result, indent=2)
+
+# Tool to find the cheapest path to a seat target
+@tool()
+@cached({"party": get_party_code, "province": get_province_code})
+def path_to_majority(party: Optional[str] = None, seat_target: Optional[int] = None,
+                     mode: str = "added", province: Optional[str] = None,
+                     election: Optional[str] = None, language: str = DEFAULT_LANGUAGE):
+    """
+    Find the fewest additional votes a party needs to reach a seat target (a majority
+    by default), and the ridings it would need to flip.
+    
+    Every riding is worth one seat, so the cheapest plan is to flip the ridings that need
+    the fewest votes; the other ridings are assumed to keep their winners.
+    
+    Args:
+        party: Optional party name or code; if omitted, only the summary for every party is returned
+        seat_target: Number of seats to reach (default: a majority, 172 of 343)
+        mode: 'added' (new votes for the party) or 'switched' (votes switching from the
+              winner to the party) (default: 'added')
+        province: Optional province name or code to restrict the ridings that may be flipped
+        election: Optional election to query (default: 2021; see list_elections)
+        language: Language of the party, province and riding names, 'EN' or 'FR' (default: 'EN')
+    
+    Returns:
+        JSON with, for every party, the seats, flips and total votes needed, and for the
+        requested party the ridings to flip (cheapest first) with the votes needed in each.
+    """
+    context, error = _election(election)
+    if error:
+        return json.dumps({"error": error}, indent=2)
+    dataset = context.dataset
+    flips = context.flips
+    
+    if mode not in FLIP_MODES:
+        return json.dumps({"error": f"Invalid mode {mode}; expected one of {', '.join(FLIP_MODES)}"}, indent=2)
+    
+    mask, province_code = _province_mask(province, dataset)
+    if mask is None:
+        return json.dumps({"error": f"Invalid province name or code: {province}"}, indent=2)
+    
+    target = seat_target if seat_target is not None else flips.majority()
+    if target < 1 or target > dataset.num_ridings:
+        return json.dumps({"error": f"Seat target must be between 1 and {dataset.num_ridings}"}, indent=2)
+    
+    result = {
+        "seatTarget": target,
+        "totalRidings": dataset.num_ridings,
+        "mode": mode,
+        "parties": flips.summary(target, mode, mask if province_code else None)
+    }
+    if province_code:
+        result["province"] = province_code
+    
+    if party:
+        party_code = get_party_code(party)
+        if not party_code or party_code not in dataset.party_index:
+            return json.dumps({"error": f"Invalid party name or code: {party}"}, indent=2)
+        col = dataset.party_index[party_code]
+        plan = flips.plan(col, target, mode, mask if province_code else None)
+        ridings = []
+        cumulative = 0
+        for row, cost in zip(plan["rows"].tolist(), plan["costs"].tolist()):
+            cumulative += cost
+            entry = _riding_entry(row, dataset, language)
+            entry["winner"] = dataset.party_codes[dataset.winner[row]]
+            entry["votesNeeded"] = cost
+            entry["cumulativeVotes"] = cumulative
+            ridings.append(entry)
+        result["plan"] = {
+            "partyCode": party_code,
+            "seats": plan["seats"],
+            "flipsNeeded": plan["flipsNeeded"],
+            "feasible": plan["feasible"],
+            "totalVotesNeeded": plan["totalVotes"],
+            "ridings": ridings
+        }
+    
+    return json.dumps(result, indent=2)
+
+# Tool to measure how efficiently votes converted to seats
+@tool()
+@cached({"province": get_province_code}, depends_on=_regions_version)
+def vote_efficiency(province: Optional[str] = None, regions: Optional[List[str]] = None,
+                    by_province: bool = False, election: Optional[str] = None, language: str = DEFAULT_LANGUAGE):
+    """
+    Measure how efficiently each party's votes converted to seats.
+    
+    Wasted votes are the votes for losing candidates plus the winner's votes beyond the
+    one it needed to beat the runner-up. The efficiency gap compares the wasted votes of
+    the two leading parties as a share of all votes; the Gallagher and Loosemore-Hanby
+    indices measure the disproportionality between vote and seat shares.
+    
+    Args:
+        province: Optional province name or code
+        regions: Optional regions to combine instead of a province: custom region names
+                 (see define_region), province names or codes, or riding codes
+        by_province: Also return the metrics of every province (default: false)
+        election: Optional election to query (default: 2021; see list_elections)
+        language: Language of the party, province and riding names, 'EN' or 'FR' (default: 'EN')
+    
+    Returns:
+        JSON with the total and per-party wasted votes and votes per seat, the efficiency
+        gap, and the Gallagher and Loosemore-Hanby indices.
+    """
+    context, error = _election(election)
+    if error:
+        return json.dumps({"error": error}, indent=2)
+    dataset = context.dataset
+    efficiency = context.efficiency
+    
+    if regions:
+        try:
+            mask = context.regions.to_mask(context.regions.union(regions))
+        except RegionError as e:
+            return json.dumps({"error": str(e)}, indent=2)
+        result = efficiency.metrics(mask=mask, language=language)
+        result["regionName"] = REGION_NAME_SEPARATOR.join(region_display_name(r, language) for r in regions)
+    else:
+        mask, province_code = _province_mask(province, dataset)
+        if mask is None:
+            return json.dumps({"error": f"Invalid province name or code: {province}"}, indent=2)
+        result = efficiency.metrics(province_code, language=language)
+        result["regionName"] = region_name(province_code, language)
+    
+    if by_province:
+        result["provinces"] = []
+        for code in dataset.province_list:
+            metrics = efficiency.metrics(code, language=language)
+            del metrics["parties"]
+            metrics["province"] = code
+            metrics["provinceName"] = province_name(code, language)
+            result["provinces"].append(metrics)
+    
+    return json.dumps(result, indent=2)
+
+# Tool to query the distribution of a party's vote share across ridings
+@tool()
+@cached({"party": get_party_code, "province": get_province_code, "riding_code": _riding_key})
+def vote_share_distribution(party: str, min_percent: Optional[float] = None,
+                            max_percent: Optional[float] = None, province: Optional[str] = None,
+                            riding_code: Optional[Union[int, str]] = None,
+                            bucket_width: float = DEFAULT_BUCKET_WIDTH, num_entries: int = 10,
+                            election: Optional[str] = None, language: str = DEFAULT_LANGUAGE):
+    """
+    Get the distribution of a party's vote share across the ridings where it ran, e.g.
+    the ridings where it got between 20% and 30%, or a riding's percentile rank.
+    
+    Args:
+        party: Party name or code
+        min_percent: Optional lowest vote share of the ridings to list (default: 0)
+        max_percent: Optional highest vote share of the ridings to list (default: 100)
+        province: Optional province name or code (national if omitted)
+        riding_code: Optional riding code or name; if provided, also returns the riding's
+                     rank and percentile by the party's vote share
+        bucket_width: Width of the histogram buckets in percentage points (default: 10)
+        num_entries: Number of ridings in the range to list, highest vote share first (default: 10)
+        election: Optional election to query (default: 2021; see list_elections)
+        language: Language of the party, province and riding names, 'EN' or 'FR' (default: 'EN')
+    
+    Returns:
+        JSON with a histogram of the party's vote share, the number of ridings within the
+        range and the highest of them when a range is given, and the riding's rank.
+    """
+    context, error = _election(election)
+    if error:
+        return json.dumps({"error": error}, indent=2)
+    dataset = context.dataset
+    shares = context.shares
+    
+    party_code = get_party_code(party)
+    if not party_code or party_code not in dataset.party_index:
+        return json.dumps({"error": f"Invalid party name or code: {party}"}, indent=2)
+    col = dataset.party_index[party_code]
+    
+    mask, province_code = _province_mask(province, dataset)
+    if mask is None:
+        return json.dumps({"error": f"Invalid province name or code: {province}"}, indent=2)
+    
+    if not 1 <= bucket_width <= 100:
+        return json.dumps({"error": "bucket_width must be between 1 and 100"}, indent=2)
+    
+    rows, _ = shares.scope(col, province_code)
+    result = {
+        "partyCode": party_code,
+        "partyName": party_name(party_code, language),
+        "regionName": region_name(province_code, language),
+        "totalRidings": len(rows),
+        "histogram": shares.histogram(col, bucket_width, province_code)
+    }
+    
+    if min_percent is not None or max_percent is not None:
+        low = min_percent if min_percent is not None else 0.0
+        high = max_percent if max_percent is not None else 100.0
+        if low > high:
+            return json.dumps({"error": "min_percent must not be greater than max_percent"}, indent=2)
+        count, selected = shares.between(col, low, high, province_code, num_entries)
+        ridings = []
+        for row in selected.tolist():
+            entry = _riding_entry(row, dataset, language)
+            entry.update(_party_entry(row, col, dataset, language))
+            entry["won"] = bool(dataset.winner[row] == col)
+            ridings.append(entry)
+        result["range"] = {"minPercent": low, "maxPercent": high, "totalRidings": count, "ridings": ridings}
+    
+    if riding_code is not None:
+        riding, error = _riding(context, riding_code, language)
+        if error:
+            return json.dumps(error, indent=2)
+        row = dataset.row_by_code[riding["ridingCode"]]
+        if province_code and dataset.province_codes[row] != province_code:
+            return json.dumps({"error": f"Riding {riding['ridingCode']} is not in {province_code}"}, indent=2)
+        if not dataset.has_party[row, col]:
+            return json.dumps({"error": f"{party_code} did not run in riding {riding['ridingCode']}"}, indent=2)
+        entry = _riding_entry(row, dataset, language)
+        entry.update(_party_entry(row, col, dataset, language))
+        entry.update(shares.percentile(col, row, province_code))
+        result["riding"] = entry
+    
+    return json.dumps(result, indent=2)
+
+def _pin_precomputed(path: str) -> int:
+    """Pin the results materialized by elections_canada_precompute into the result cache."""
+    try:
+        entries = load_precomputed(path, DATASET.snapshot)
+    except (OSError, ValueError) as e:
+        logger.warning("Could not read precomputed results from %s: %s", path, e)
+        return 0
+    if not entries and os.path.isfile(path):
+        logger.warning("Ignoring precomputed results in %s: built from another dataset or code version", path)
+    pinned = 0
+    for entry in entries:
+        fn = globals().get(entry["tool"])
+        cache_key = getattr(fn, "cache_key", None)
+        if cache_key is None:
+            continue
+        RESULT_CACHE.pin(cache_key(**entry["args"]), entry["result"])
+        pinned += 1
+    return pinned
+
+# Serve the most common calls from the precomputed artifact shipped next to the data file
+PRECOMPUTED_FILE = os.environ.get("PRECOMPUTED_RESULTS_FILE") or precomputed_path(DATA_FILE)
+_pinned = _pin_precomputed(PRECOMPUTED_FILE)
+if _pinned:
+    logger.info("Pinned %d precomputed results from %s", _pinned, PRECOMPUTED_FILE)
 
 def main():
     """Entry point for the elections-canada-mcp command."""
-    import mcp.cli
-    import sys
-    mcp.cli.main(mcp, sys.argv[1:])
+    import argparse
+    parser = argparse.ArgumentParser(description="Elections Canada MCP server")
+    parser.add_argument("--transport", choices=["stdio", "sse", "streamable-http"], default="stdio",
+                        help="Transport to serve (default: stdio)")
+    parser.add_argument("--host", default=os.environ.get("HOST", "127.0.0.1"),
+                        help="Host to bind for the HTTP transports")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", 8000)),
+                        help="Port to bind for the HTTP transports")
+    args = parser.parse_args()
+    
+    mcp.settings.host = args.host
+    mcp.settings.port = args.port
+    mcp.run(transport=args.transport)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,116 @@
+"""
+Vote-share distribution queries for the Elections Canada MCP Server.
+
+For every party, the ridings where it ran are sorted once by its vote share,
+nationally and grouped by province (one sorted block per province, located with
+the province's start and end offsets). Queries are then binary searches on the
+sorted shares:
+
+- ridings within a share range: two bisections and a slice, O(log n + k)
+- percentile rank of a riding: one bisection, O(log n)
+- histogram: one bisection per bucket edge, O(b log n)
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .dataset import ElectionDataset
+
+# Default width of the histogram buckets, in percentage points
+DEFAULT_BUCKET_WIDTH = 10.0
+
+
+class ShareIndex:
+    """Ridings sorted by each party's vote share, nationally and per province."""
+
+    def __init__(self, dataset: ElectionDataset):
+        self.dataset = dataset
+        num_provinces = len(dataset.province_list)
+        self.national_rows: List[np.ndarray] = []
+        self.national_shares: List[np.ndarray] = []
+        self.province_rows: List[np.ndarray] = []
+        self.province_shares: List[np.ndarray] = []
+        self.province_bounds: List[np.ndarray] = []
+        for col in range(dataset.num_parties):
+            rows = np.flatnonzero(dataset.has_party[:, col])
+            shares = dataset.vote_percent[rows, col]
+            order = np.argsort(shares, kind="stable")
+            self.national_rows.append(rows[order])
+            self.national_shares.append(shares[order])
+
+            # Sorted by province, then by share within each province
+            provinces = dataset.province_index[rows]
+            order = np.lexsort((shares, provinces))
+            self.province_rows.append(rows[order])
+            self.province_shares.append(shares[order])
+            self.province_bounds.append(np.searchsorted(provinces[order], np.arange(num_provinces + 1)))
+
+    def scope(self, col: int, province_code: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the rows and the ascending shares of a party in a province (or nationally when None)."""
+        if province_code is None:
+            return self.national_rows[col], self.national_shares[col]
+        i = self.dataset.province_list.index(province_code)
+        start, end = self.province_bounds[col][i], self.province_bounds[col][i + 1]
+        return self.province_rows[col][start:end], self.province_shares[col][start:end]
+
+    def between(self, col: int, low: float, high: float, province_code: Optional[str] = None,
+                num_entries: Optional[int] = None) -> Tuple[int, np.ndarray]:
+        """
+        Find the ridings where a party's vote share is between two bounds.
+
+        Args:
+            col: Party column
+            low: Lowest vote share (inclusive)
+            high: Highest vote share (inclusive)
+            province_code: Optional province (national when None)
+            num_entries: Maximum number of rows to return (default: all)
+
+        Returns:
+            The number of ridings in the range, and their rows by descending vote share
+        """
+        rows, shares = self.scope(col, province_code)
+        start = int(np.searchsorted(shares, low, side="left"))
+        end = int(np.searchsorted(shares, high, side="right"))
+        count = max(end - start, 0)
+        if num_entries is not None:
+            start = max(start, end - num_entries)
+        return count, rows[start:end][::-1]
+
+    def percentile(self, col: int, row: int, province_code: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Return the rank of a riding among the ridings where a party ran.
+
+        Returns:
+            Dictionary with the riding's rank by vote share (1 = highest), the number of
+            ridings ranked and the percentage of them with a lower vote share
+        """
+        _, shares = self.scope(col, province_code)
+        share = self.dataset.vote_percent[row, col]
+        below = int(np.searchsorted(shares, share, side="left"))
+        above = len(shares) - int(np.searchsorted(shares, share, side="right"))
+        return {
+            "rank": above + 1,
+            "rankedRidings": len(shares),
+            "percentile": round(below / len(shares) * 100, 2) if len(shares) else None
+        }
+
+    def histogram(self, col: int, bucket_width: float = DEFAULT_BUCKET_WIDTH,
+                  province_code: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Count the ridings of a party in vote-share buckets of equal width from 0 to 100%.
+
+        Each bucket includes its lower bound; the last bucket also includes 100%.
+        """
+        _, shares = self.scope(col, province_code)
+        edges = np.arange(0.0, 100.0, bucket_width)
+        positions = np.searchsorted(shares, edges, side="left")
+        counts = np.diff(np.append(positions, len(shares)))
+        return [
+            {
+                "fromPercent": round(float(low), 2),
+                "toPercent": round(float(min(low + bucket_width, 100.0)), 2),
+                "ridings": int(count)
+            }
+            for low, count in zip(edges, counts)
+        ]
@@ -0,0 +1,77 @@
+"""
+Similar-ridings search for the Elections Canada MCP Server.
+
+Each riding is represented by its vote-share vector (one entry per party) plus
+its turnout. The feature matrix and its squared row norms are precomputed once,
+so the distances from any batch of anchor ridings to every riding come from a
+single matrix product, and the k nearest ridings are selected with
+`np.argpartition` instead of a full sort.
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .dataset import ElectionDataset
+
+
+class SimilarityIndex:
+    """Nearest-neighbour index over the vote-share (and turnout) vectors of a dataset."""
+
+    def __init__(self, dataset: ElectionDataset, include_turnout: bool = True):
+        self.dataset = dataset
+        # Shares and turnout as fractions so that each feature is on the same 0-1 scale
+        features = [dataset.vote_percent / 100.0]
+        if include_turnout:
+            features.append(dataset.turnout[:, None] / 100.0)
+        self.features = np.hstack(features)
+        self.squared_norms = np.einsum("ij,ij->i", self.features, self.features)
+
+    def distances(self, anchor_rows: np.ndarray) -> np.ndarray:
+        """Return the Euclidean distances (anchors x ridings) in percentage points."""
+        anchors = self.features[anchor_rows]
+        squared = (
+            self.squared_norms[anchor_rows][:, None]
+            + self.squared_norms[None, :]
+            - 2.0 * anchors @ self.features.T
+        )
+        # Clip rounding noise below zero before taking the square root
+        return np.sqrt(np.maximum(squared, 0.0)) * 100.0
+
+    def nearest(self, anchor_rows: np.ndarray, k: int,
+                mask: Optional[np.ndarray] = None) -> List[List[Tuple[int, float]]]:
+        """
+        Find the k ridings closest to each anchor riding.
+
+        Args:
+            anchor_rows: Row indices of the anchor ridings
+            k: Number of neighbours to return per anchor
+            mask: Optional boolean riding mask restricting the candidates
+
+        Returns:
+            One list per anchor of (row, distance) pairs sorted by distance. The
+            anchor itself is never returned as its own neighbour.
+        """
+        anchor_rows = np.asarray(anchor_rows, dtype=np.int64)
+        distances = self.distances(anchor_rows)
+        if mask is not None:
+            distances[:, ~mask] = np.inf
+        distances[np.arange(len(anchor_rows)), anchor_rows] = np.inf
+
+        num_candidates = np.count_nonzero(np.isfinite(distances), axis=1)
+        k = max(0, min(k, distances.shape[1]))
+        if k == 0:
+            return [[] for _ in anchor_rows]
+        if k < distances.shape[1]:
+            candidates = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        else:
+            candidates = np.tile(np.arange(distances.shape[1]), (len(anchor_rows), 1))
+
+        results = []
+        for i, row_candidates in enumerate(candidates):
+            row_distances = distances[i, row_candidates]
+            order = np.argsort(row_distances, kind="stable")[:min(k, num_candidates[i])]
+            results.append([
+                (int(row_candidates[j]), float(row_distances[j])) for j in order
+            ])
+        return results
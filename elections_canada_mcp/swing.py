@@ -0,0 +1,183 @@
+"""
+Cross-election comparison for the Elections Canada MCP Server.
+
+Two elections are aligned on riding code once: the base election's codes are
+sorted and every riding of the target election is found by binary search, which
+yields a pair of row index arrays. The vote matrices of both elections are then
+gathered through those indices onto a common set of party columns, so that the
+per-riding swing of every party, seat flips and aggregated swings for any group
+of ridings are vectorized operations on the aligned difference matrices.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .dataset import ElectionDataset
+from .localization import DEFAULT_LANGUAGE, party_name
+
+
+class ElectionComparison:
+    """Two elections aligned on riding code and party, with their difference matrices."""
+
+    def __init__(self, base: ElectionDataset, target: ElectionDataset):
+        self.base = base
+        self.target = target
+
+        # Join on riding code: sort the base codes once and binary-search every target code
+        order = np.argsort(base.riding_codes, kind="stable")
+        sorted_codes = base.riding_codes[order]
+        positions = np.minimum(np.searchsorted(sorted_codes, target.riding_codes), max(len(order) - 1, 0))
+        matched = (sorted_codes[positions] == target.riding_codes) if len(order) else np.zeros(
+            target.num_ridings, dtype=bool)
+        self.target_rows = np.flatnonzero(matched)
+        self.base_rows = order[positions[matched]]
+        base_matched = np.zeros(base.num_ridings, dtype=bool)
+        base_matched[self.base_rows] = True
+        self.unmatched_base = base.riding_codes[~base_matched]
+        self.unmatched_target = target.riding_codes[~matched]
+        self.num_ridings = len(self.target_rows)
+
+        # Common party columns: the base election's parties, then the target's new parties
+        self.party_codes: List[str] = list(base.party_codes) + [
+            code for code in target.party_codes if code not in base.party_index
+        ]
+        self.party_index = {code: col for col, code in enumerate(self.party_codes)}
+        base_cols = np.array([self.party_index[code] for code in base.party_codes], dtype=np.int64)
+        target_cols = np.array([self.party_index[code] for code in target.party_codes], dtype=np.int64)
+
+        shape = (self.num_ridings, len(self.party_codes))
+
+        def aligned(matrix: np.ndarray, rows: np.ndarray, cols: np.ndarray, dtype) -> np.ndarray:
+            result = np.zeros(shape, dtype=dtype)
+            result[:, cols] = matrix[rows]
+            return result
+
+        self.base_votes = aligned(base.votes, self.base_rows, base_cols, np.int64)
+        self.target_votes = aligned(target.votes, self.target_rows, target_cols, np.int64)
+        self.base_percent = aligned(base.vote_percent, self.base_rows, base_cols, np.float64)
+        self.target_percent = aligned(target.vote_percent, self.target_rows, target_cols, np.float64)
+        self.vote_change = self.target_votes - self.base_votes
+        self.percent_change = self.target_percent - self.base_percent
+
+        # Winners in common columns (-1 when no votes were cast; index -1 maps to -1)
+        self.base_winner = np.append(base_cols, -1)[base.winner[self.base_rows]]
+        self.target_winner = np.append(target_cols, -1)[target.winner[self.target_rows]]
+        self.flipped = (self.base_winner != self.target_winner) & (self.base_winner >= 0) & (
+            self.target_winner >= 0)
+
+        # Pedersen volatility: half the sum of the absolute changes in vote share
+        self.volatility = np.abs(self.percent_change).sum(axis=1) / 2
+
+        self.province_codes = target.province_codes[self.target_rows]
+        self.row_by_code = {
+            code: row for row, code in enumerate(target.riding_codes[self.target_rows].tolist())
+        }
+
+    def scope_mask(self, province_code: Optional[str] = None) -> np.ndarray:
+        """Return the mask of aligned ridings in a province (or all of them when None)."""
+        if province_code is None:
+            return np.ones(self.num_ridings, dtype=bool)
+        return self.province_codes == province_code
+
+    def aggregate(self, mask: np.ndarray, language: str = DEFAULT_LANGUAGE) -> Dict[str, Any]:
+        """
+        Aggregate the swing over the aligned ridings selected by a mask, with the party
+        names in a language ('EN' or 'FR').
+
+        Returns:
+            Dictionary with the vote shares and seats of each party in both elections
+            and their changes, the number of seats that changed hands and the flows
+            between parties
+        """
+        num_parties = len(self.party_codes)
+        base_totals = self.base_votes[mask].sum(axis=0)
+        target_totals = self.target_votes[mask].sum(axis=0)
+        base_sum, target_sum = int(base_totals.sum()), int(target_totals.sum())
+        base_share = base_totals / base_sum * 100 if base_sum else np.zeros(num_parties)
+        target_share = target_totals / target_sum * 100 if target_sum else np.zeros(num_parties)
+        base_winners, target_winners = self.base_winner[mask], self.target_winner[mask]
+        base_seats = np.bincount(base_winners[base_winners >= 0], minlength=num_parties)
+        target_seats = np.bincount(target_winners[target_winners >= 0], minlength=num_parties)
+
+        parties = []
+        for col in np.flatnonzero((base_totals > 0) | (target_totals > 0)):
+            code = self.party_codes[col]
+            parties.append({
+                "partyCode": code,
+                "partyName": party_name(code, language),
+                "baseVotes": int(base_totals[col]),
+                "targetVotes": int(target_totals[col]),
+                "baseVotePercent": round(float(base_share[col]), 2),
+                "targetVotePercent": round(float(target_share[col]), 2),
+                "swing": round(float(target_share[col] - base_share[col]), 2),
+                "baseSeats": int(base_seats[col]),
+                "targetSeats": int(target_seats[col]),
+                "seatChange": int(target_seats[col] - base_seats[col])
+            })
+        parties.sort(key=lambda x: (-x["targetSeats"], -x["targetVotes"]))
+
+        # Seat flows between parties, counted with one bincount over (from, to) pairs
+        flipped = self.flipped & mask
+        flows = np.bincount(
+            self.base_winner[flipped] * num_parties + self.target_winner[flipped],
+            minlength=num_parties * num_parties
+        ).reshape(num_parties, num_parties)
+        flow_list = [
+            {"from": self.party_codes[a], "to": self.party_codes[b], "seats": int(flows[a, b])}
+            for a, b in zip(*np.nonzero(flows))
+        ]
+        flow_list.sort(key=lambda x: -x["seats"])
+
+        count = int(np.count_nonzero(mask))
+        return {
+            "totalRidings": count,
+            "baseTotalVotes": base_sum,
+            "targetTotalVotes": target_sum,
+            "seatFlips": int(np.count_nonzero(flipped)),
+            "seatFlows": flow_list,
+            "averageVolatility": round(float(self.volatility[mask].mean()), 2) if count else None,
+            "parties": parties
+        }
+
+    def ranked(self, mask: np.ndarray, key: np.ndarray, k: int, highest: bool = True) -> np.ndarray:
+        """Return the aligned rows in a mask with the k highest (or lowest) values of a key."""
+        rows = np.flatnonzero(mask)
+        values = -key[rows] if highest else key[rows]
+        return rows[np.argsort(values, kind="stable")][:k]
+
+    def riding_change(self, row: int, col: Optional[int] = None,
+                      language: str = DEFAULT_LANGUAGE) -> Dict[str, Any]:
+        """
+        Return the change in an aligned riding, for one party column or for every party,
+        with the party names in a language ('EN' or 'FR').
+        """
+        base_winner, target_winner = int(self.base_winner[row]), int(self.target_winner[row])
+        result = {
+            "baseWinner": self.party_codes[base_winner] if base_winner >= 0 else None,
+            "targetWinner": self.party_codes[target_winner] if target_winner >= 0 else None,
+            "flipped": bool(self.flipped[row]),
+            "volatility": round(float(self.volatility[row]), 2)
+        }
+        cols = [col] if col is not None else np.flatnonzero(
+            (self.base_votes[row] > 0) | (self.target_votes[row] > 0)).tolist()
+        parties = [self._party_change(row, c, language) for c in cols]
+        if col is not None:
+            result.update(parties[0])
+        else:
+            parties.sort(key=lambda x: -x["targetVotes"])
+            result["parties"] = parties
+        return result
+
+    def _party_change(self, row: int, col: int, language: str = DEFAULT_LANGUAGE) -> Dict[str, Any]:
+        code = self.party_codes[col]
+        return {
+            "partyCode": code,
+            "partyName": party_name(code, language),
+            "baseVotes": int(self.base_votes[row, col]),
+            "targetVotes": int(self.target_votes[row, col]),
+            "voteChange": int(self.vote_change[row, col]),
+            "baseVotePercent": float(self.base_percent[row, col]),
+            "targetVotePercent": float(self.target_percent[row, col]),
+            "swing": round(float(self.percent_change[row, col]), 2)
+        }
@@ -0,0 +1,191 @@
+"""
+Transposition of election results onto other boundaries for the Elections Canada MCP Server.
+
+A transposition table maps source units (ridings of an old representation
+order, or polls) to target ridings with weights: the share of the source unit's
+electors assigned to the target riding. The table is stored as a sparse matrix
+in coordinate form, with entries grouped by target riding. Projecting an
+election multiplies that matrix by the election's riding x party vote matrix
+(and by its counts of valid, rejected and total ballots and registered voters)
+in a single pass: the source rows are gathered by index and accumulated per
+target with one weighted `bincount` per column. The result is a regular
+`ElectionDataset`, so every tool can be used on the transposed results.
+
+Tables are CSV or JSON files with one entry per (source, target) pair:
+
+    fromCode,toCode,weight[,toName_EN,toName_FR,toProvCode]
+
+The optional columns name the target ridings; targets without them take the
+name of the source riding with the same code, if any.
+"""
+
+import csv
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .constants import PROVINCE_NUMBER_TO_CODE
+from .dataset import ElectionDataset
+
+
+class TranspositionError(ValueError):
+    """Raised when a transposition table is invalid or cannot be applied."""
+
+
+class TranspositionTable:
+    """Sparse source-unit -> target-riding weight matrix."""
+
+    def __init__(self, name: str, entries: List[Dict[str, Any]], snapshot: Optional[str] = None):
+        if not entries:
+            raise TranspositionError(f"Transposition table {name} is empty")
+        self.name = name
+        try:
+            from_codes = np.array([int(e["fromCode"]) for e in entries], dtype=np.int64)
+            to_codes = np.array([int(e["toCode"]) for e in entries], dtype=np.int64)
+            weights = np.array([float(e["weight"]) for e in entries], dtype=np.float64)
+        except (KeyError, TypeError, ValueError) as e:
+            raise TranspositionError(f"Invalid entry in transposition table {name}: {e}")
+        if (weights < 0).any():
+            raise TranspositionError(f"Transposition table {name} has negative weights")
+
+        # Target ridings in code order; entries in coordinate form grouped by target
+        self.target_codes, target_index = np.unique(to_codes, return_inverse=True)
+        order = np.argsort(target_index, kind="stable")
+        self.target_index = target_index[order]
+        self.from_codes = from_codes[order]
+        self.weights = weights[order]
+        self.num_targets = len(self.target_codes)
+
+        # Optional names and provinces of the target ridings
+        self.target_names: Dict[int, Dict[str, str]] = {}
+        for entry in entries:
+            if entry.get("toName_EN"):
+                self.target_names[int(entry["toCode"])] = {
+                    "ridingName_EN": entry["toName_EN"],
+                    "ridingName_FR": entry.get("toName_FR") or entry["toName_EN"],
+                    "provCode": entry.get("toProvCode") or None
+                }
+
+        self.snapshot = snapshot or hashlib.sha256(
+            self.from_codes.tobytes() + self.target_index.tobytes() + self.weights.tobytes()
+        ).hexdigest()[:16]
+
+    @classmethod
+    def from_file(cls, path: str, name: Optional[str] = None) -> "TranspositionTable":
+        """Load a table from a CSV or JSON file (named after the file unless a name is given)."""
+        name = name or os.path.splitext(os.path.basename(path))[0]
+        with open(path, 'rb') as f:
+            content = f.read()
+        text = content.decode("utf-8-sig")
+        if path.endswith(".json"):
+            entries = json.loads(text)
+        else:
+            entries = list(csv.DictReader(text.splitlines()))
+        return cls(name, entries, hashlib.sha256(content).hexdigest()[:16])
+
+    def project(self, dataset: ElectionDataset) -> ElectionDataset:
+        """
+        Project an election onto the target ridings of the table.
+
+        Source units missing from the election are ignored. Vote and voter counts
+        are rounded to whole numbers after weighting.
+
+        Args:
+            dataset: Election results on the source boundaries
+
+        Returns:
+            Dataset of the election results on the target boundaries
+        """
+        # Join the table's source codes to the dataset rows by binary search
+        order = np.argsort(dataset.riding_codes, kind="stable")
+        sorted_codes = dataset.riding_codes[order]
+        positions = np.minimum(np.searchsorted(sorted_codes, self.from_codes), len(order) - 1)
+        found = sorted_codes[positions] == self.from_codes
+        if not found.any():
+            raise TranspositionError(
+                f"No source unit of transposition table {self.name} is in the election"
+            )
+        source_rows = order[positions[found]]
+        target_index = self.target_index[found]
+        weights = self.weights[found]
+
+        # Sparse (targets x sources) matrix times the dense (sources x columns) matrix
+        counts = np.column_stack((
+            dataset.votes, dataset.valid_votes, dataset.rejected_votes,
+            dataset.total_votes, dataset.registered_voters
+        )).astype(np.float64)
+        projected = np.rint(self._multiply(target_index, source_rows, weights, counts)).astype(np.int64)
+        has_party = self._multiply(target_index, source_rows, weights,
+                                   dataset.has_party.astype(np.float64)) > 0
+        num_parties = dataset.num_parties
+        votes = projected[:, :num_parties]
+        valid_votes, rejected_votes, total_votes, registered = projected[:, num_parties:].T
+        party_totals = votes.sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            vote_percent = np.where(party_totals[:, None] > 0,
+                                    np.round(votes / party_totals[:, None] * 100, 2), 0.0)
+            turnout = np.where(registered > 0, np.round(total_votes / registered * 100, 2), 0.0)
+
+        ridings = []
+        for target, code in enumerate(self.target_codes.tolist()):
+            riding = self._target_metadata(dataset, code)
+            riding.update({
+                "ridingCode": code,
+                "voteDistribution": [
+                    {
+                        "partyCode": dataset.party_codes[col],
+                        "votes": int(votes[target, col]),
+                        "votePercent": float(vote_percent[target, col])
+                    }
+                    for col in np.flatnonzero(has_party[target]).tolist()
+                ],
+                "validVotes": int(valid_votes[target]),
+                "rejectedVotes": int(rejected_votes[target]),
+                "totalVotes": int(total_votes[target]),
+                "registeredVoters": int(registered[target]),
+                "turnout": float(turnout[target])
+            })
+            ridings.append(riding)
+
+        snapshot = hashlib.sha256(f"{dataset.snapshot}:{self.snapshot}".encode()).hexdigest()[:16]
+        return ElectionDataset(ridings, snapshot)
+
+    def _multiply(self, target_index: np.ndarray, source_rows: np.ndarray, weights: np.ndarray,
+                  matrix: np.ndarray) -> np.ndarray:
+        """Multiply the sparse weight matrix by a dense matrix over the source rows."""
+        result = np.empty((self.num_targets, matrix.shape[1]), dtype=np.float64)
+        for col in range(matrix.shape[1]):
+            result[:, col] = np.bincount(target_index, weights=matrix[source_rows, col] * weights,
+                                         minlength=self.num_targets)
+        return result
+
+    def _target_metadata(self, dataset: ElectionDataset, code: int) -> Dict[str, Any]:
+        """Return the names and province of a target riding."""
+        metadata = dict(self.target_names.get(code, {}))
+        if code in dataset.row_by_code:
+            source = dataset.ridings[dataset.row_by_code[code]]
+            metadata.setdefault("ridingName_EN", source["ridingName_EN"])
+            metadata.setdefault("ridingName_FR", source["ridingName_FR"])
+            if not metadata.get("provCode"):
+                metadata["provCode"] = source["provCode"]
+        metadata.setdefault("ridingName_EN", f"Riding {code}")
+        metadata.setdefault("ridingName_FR", metadata["ridingName_EN"])
+        if not metadata.get("provCode"):
+            province = PROVINCE_NUMBER_TO_CODE.get(code // 1000)
+            if province is None:
+                raise TranspositionError(f"Cannot determine the province of target riding {code}")
+            metadata["provCode"] = province
+        return metadata
+
+    def describe(self) -> Dict[str, Any]:
+        """Describe the table."""
+        return {
+            "table": self.name,
+            "entries": int(len(self.weights)),
+            "sourceUnits": int(len(np.unique(self.from_codes))),
+            "targetRidings": int(self.num_targets),
+            "snapshot": self.snapshot
+        }
@@ -0,0 +1,140 @@
+"""
+Turnout and ballot-quality analytics for the Elections Canada MCP Server.
+
+Everything is precomputed once per dataset: for Canada and for each province,
+the ridings sorted by turnout and by rejected-ballot rate, prefix sums of
+registered voters, ballots cast and rejected ballots over the ridings grouped by
+province, and the correlation between turnout and each party's vote share.
+Quantiles and top-k lists are then O(1)/O(k) slices of the sorted arrays, and a
+riding's percentile is an O(log n) binary search.
+"""
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from .dataset import ElectionDataset
+
+TURNOUT_METRICS = ("turnout", "rejected_rate")
+QUANTILES = (("min", 0.0), ("p10", 0.1), ("p25", 0.25), ("median", 0.5),
+             ("p75", 0.75), ("p90", 0.9), ("max", 1.0))
+
+
+class TurnoutIndex:
+    """Sorted turnout and rejected-ballot arrays per province and nationally."""
+
+    def __init__(self, dataset: ElectionDataset):
+        self.dataset = dataset
+        total_votes = dataset.total_votes.astype(np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rejected_rate = np.where(total_votes > 0, dataset.rejected_votes / total_votes * 100, 0.0)
+        self.metrics = {"turnout": dataset.turnout, "rejected_rate": rejected_rate}
+
+        # Ridings grouped by province, with prefix sums of the vote counts so that
+        # the totals of any province are a difference of two prefix sums
+        self.grouped_rows = np.argsort(dataset.province_index, kind="stable")
+        boundaries = np.searchsorted(dataset.province_index[self.grouped_rows],
+                                     np.arange(len(dataset.province_list) + 1))
+        self.province_bounds = {
+            code: (int(boundaries[i]), int(boundaries[i + 1]))
+            for i, code in enumerate(dataset.province_list)
+        }
+        self.prefix_sums = {
+            name: np.concatenate(([0], np.cumsum(values[self.grouped_rows], dtype=np.int64)))
+            for name, values in (("registeredVoters", dataset.registered_voters),
+                                 ("totalVotes", dataset.total_votes),
+                                 ("rejectedVotes", dataset.rejected_votes))
+        }
+
+        # Rows sorted by each metric (ascending) per scope (None = national)
+        self.sorted_rows: Dict[Optional[str], Dict[str, np.ndarray]] = {}
+        self.sorted_values: Dict[Optional[str], Dict[str, np.ndarray]] = {}
+        self.correlations: Dict[Optional[str], Dict[str, Optional[float]]] = {}
+        for scope in [None] + list(dataset.province_list):
+            rows = self.scope_rows(scope)
+            self.sorted_rows[scope] = {}
+            self.sorted_values[scope] = {}
+            for name, values in self.metrics.items():
+                order = rows[np.argsort(values[rows], kind="stable")]
+                self.sorted_rows[scope][name] = order
+                self.sorted_values[scope][name] = values[order]
+            self.correlations[scope] = self._correlations(rows)
+
+    def scope_rows(self, province_code: Optional[str]) -> np.ndarray:
+        """Return the rows of a province (or of all ridings when None)."""
+        if province_code is None:
+            return np.arange(self.dataset.num_ridings)
+        start, end = self.province_bounds[province_code]
+        return self.grouped_rows[start:end]
+
+    def totals(self, province_code: Optional[str]) -> Dict[str, int]:
+        """Return the registered voters, ballots cast and rejected ballots of a scope."""
+        if province_code is None:
+            start, end = 0, self.dataset.num_ridings
+        else:
+            start, end = self.province_bounds[province_code]
+        return {name: int(sums[end] - sums[start]) for name, sums in self.prefix_sums.items()}
+
+    def _correlations(self, rows: np.ndarray) -> Dict[str, Optional[float]]:
+        """Pearson correlation between turnout and each party's vote share over some rows."""
+        turnout = self.dataset.turnout[rows]
+        shares = self.dataset.vote_percent[rows]
+        turnout_dev = turnout - turnout.mean() if len(rows) else turnout
+        share_dev = shares - shares.mean(axis=0) if len(rows) else shares
+        denominator = np.sqrt((turnout_dev ** 2).sum() * (share_dev ** 2).sum(axis=0))
+        covariance = turnout_dev @ share_dev
+        return {
+            code: (round(float(covariance[col] / denominator[col]), 4) if denominator[col] > 0 else None)
+            for col, code in enumerate(self.dataset.party_codes)
+        }
+
+    def quantiles(self, province_code: Optional[str], metric: str) -> Dict[str, float]:
+        """Return quantiles of a metric, interpolated linearly on the sorted values."""
+        values = self.sorted_values[province_code][metric]
+        result = {}
+        for name, q in QUANTILES:
+            position = q * (len(values) - 1)
+            low = int(np.floor(position))
+            high = min(low + 1, len(values) - 1)
+            value = values[low] + (values[high] - values[low]) * (position - low)
+            result[name] = round(float(value), 2)
+        return result
+
+    def top(self, province_code: Optional[str], metric: str, k: int, highest: bool = True) -> np.ndarray:
+        """Return the rows with the k highest (or lowest) values of a metric."""
+        rows = self.sorted_rows[province_code][metric]
+        return rows[::-1][:k] if highest else rows[:k]
+
+    def percentile(self, province_code: Optional[str], metric: str, row: int) -> float:
+        """Return the percentage of ridings in the scope with a lower value of the metric."""
+        values = self.sorted_values[province_code][metric]
+        below = np.searchsorted(values, self.metrics[metric][row], side="left")
+        return round(float(below / len(values) * 100), 2)
+
+    def summary(self, province_code: Optional[str]) -> Dict[str, Any]:
+        """Return turnout and rejected-ballot statistics for a scope."""
+        totals = self.totals(province_code)
+        registered, cast, rejected = (totals["registeredVoters"], totals["totalVotes"],
+                                      totals["rejectedVotes"])
+        return {
+            "totalRidings": int(len(self.sorted_rows[province_code]["turnout"])),
+            "registeredVoters": registered,
+            "totalVotes": cast,
+            "rejectedVotes": rejected,
+            "weightedTurnout": round(cast / registered * 100, 2) if registered else None,
+            "weightedRejectedRate": round(rejected / cast * 100, 2) if cast else None,
+            "turnoutQuantiles": self.quantiles(province_code, "turnout"),
+            "rejectedRateQuantiles": self.quantiles(province_code, "rejected_rate"),
+            "turnoutShareCorrelation": self.correlations[province_code]
+        }
+
+    def riding_metrics(self, row: int) -> Dict[str, Any]:
+        """Return the turnout figures of a riding."""
+        dataset = self.dataset
+        return {
+            "registeredVoters": int(dataset.registered_voters[row]),
+            "totalVotes": int(dataset.total_votes[row]),
+            "rejectedVotes": int(dataset.rejected_votes[row]),
+            "turnout": float(dataset.turnout[row]),
+            "rejectedRate": round(float(self.metrics["rejected_rate"][row]), 2)
+        }
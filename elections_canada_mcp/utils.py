@@ -154,3 +154,166 @@ def summarize_results(ridings: List[Dict[str, Any]], region_name: Optional[str]
         summary["regionCode"] = region_code
         
     return summary
+
+def closest_ridings(ridings: List[Dict[str, Any]], num_results: int = 10, party_code: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Find the ridings with the smallest margins between the winner and the runner-up.
+    
+    Args:
+        ridings: List of riding data to analyze
+        num_results: Number of results to return for each ordering
+        party_code: Optional party code; only ridings won by this party are included
+        
+    Returns:
+        Dictionary with the closest ridings by vote margin and by percentage margin
+    """
+    # Calculate margins for all ridings
+    ridings_with_margins = []
+    
+    for riding in ridings:
+        # Sort vote distribution by votes (descending)
+        vote_dist = sorted(riding["voteDistribution"], key=lambda x: x["votes"], reverse=True)
+        
+        if len(vote_dist) < 2:
+            continue  # Skip ridings with fewer than 2 parties
+        
+        winner = vote_dist[0]
+        runner_up = vote_dist[1]
+        
+        # Skip if we're filtering by party and this riding wasn't won by that party
+        if party_code and winner["partyCode"] != party_code:
+            continue
+        
+        # Calculate margins
+        vote_margin = winner["votes"] - runner_up["votes"]
+        percent_margin = winner["votePercent"] - runner_up["votePercent"]
+        
+        ridings_with_margins.append({
+            "ridingCode": riding["ridingCode"],
+            "ridingName": riding["ridingName_EN"],
+            "province": riding["provCode"],
+            "provinceName": PROVINCE_CODE_TO_NAME.get(riding["provCode"], riding["provCode"]),
+            "winner": {
+                "partyCode": winner["partyCode"],
+                "partyName": PARTY_CODE_TO_NAME.get(winner["partyCode"], winner["partyCode"]),
+                "votes": winner["votes"],
+                "votePercent": winner["votePercent"]
+            },
+            "runnerUp": {
+                "partyCode": runner_up["partyCode"],
+                "partyName": PARTY_CODE_TO_NAME.get(runner_up["partyCode"], runner_up["partyCode"]),
+                "votes": runner_up["votes"],
+                "votePercent": runner_up["votePercent"]
+            },
+            "voteMargin": vote_margin,
+            "percentMargin": percent_margin
+        })
+    
+    # Sort by percentage margin (ascending)
+    ridings_by_percent = sorted(ridings_with_margins, key=lambda x: x["percentMargin"])[:num_results]
+    
+    # Sort by vote margin (ascending)
+    ridings_by_votes = sorted(ridings_with_margins, key=lambda x: x["voteMargin"])[:num_results]
+    
+    return {
+        "byVoteMargin": ridings_by_votes,
+        "byPercentMargin": ridings_by_percent
+    }
+
+def best_and_worst(ridings: List[Dict[str, Any]], party_code: str, num_entries: int = 10) -> Dict[str, Any]:
+    """
+    Find the best and worst results of a party across a set of ridings.
+    
+    Args:
+        ridings: List of riding data to analyze
+        party_code: Party code (e.g., 'LPC')
+        num_entries: Number of entries to return for each category
+        
+    Returns:
+        Dictionary with the top and worst ridings by vote percentage, the largest
+        winning margins and the largest losing margins
+    """
+    # Lists to store results
+    by_percent = []
+    by_margin_win = []
+    by_margin_loss = []
+    
+    for riding in ridings:
+        # Get party's result in this riding
+        party_result = None
+        for vote in riding["voteDistribution"]:
+            if vote["partyCode"] == party_code:
+                party_result = vote
+                break
+        
+        if not party_result:
+            continue  # Party didn't run in this riding
+        
+        # Sort vote distribution by votes (descending)
+        vote_dist = sorted(riding["voteDistribution"], key=lambda x: x["votes"], reverse=True)
+        winner = vote_dist[0]
+        
+        # Add to by_percent list
+        by_percent.append({
+            "ridingCode": riding["ridingCode"],
+            "ridingName": riding["ridingName_EN"],
+            "province": riding["provCode"],
+            "provinceName": PROVINCE_CODE_TO_NAME.get(riding["provCode"], riding["provCode"]),
+            "votes": party_result["votes"],
+            "votePercent": party_result["votePercent"]
+        })
+        
+        # Check if party won or lost
+        if winner["partyCode"] == party_code:
+            # Party won - calculate winning margin
+            if len(vote_dist) > 1:
+                runner_up = vote_dist[1]
+                margin = party_result["votePercent"] - runner_up["votePercent"]
+                
+                by_margin_win.append({
+                    "ridingCode": riding["ridingCode"],
+                    "ridingName": riding["ridingName_EN"],
+                    "province": riding["provCode"],
+                    "provinceName": PROVINCE_CODE_TO_NAME.get(riding["provCode"], riding["provCode"]),
+                    "votes": party_result["votes"],
+                    "votePercent": party_result["votePercent"],
+                    "runnerUp": {
+                        "partyCode": runner_up["partyCode"],
+                        "partyName": PARTY_CODE_TO_NAME.get(runner_up["partyCode"], runner_up["partyCode"]),
+                        "votes": runner_up["votes"],
+                        "votePercent": runner_up["votePercent"]
+                    },
+                    "margin": margin
+                })
+        else:
+            # Party lost - calculate losing margin
+            margin = winner["votePercent"] - party_result["votePercent"]
+            
+            by_margin_loss.append({
+                "ridingCode": riding["ridingCode"],
+                "ridingName": riding["ridingName_EN"],
+                "province": riding["provCode"],
+                "provinceName": PROVINCE_CODE_TO_NAME.get(riding["provCode"], riding["provCode"]),
+                "votes": party_result["votes"],
+                "votePercent": party_result["votePercent"],
+                "winner": {
+                    "partyCode": winner["partyCode"],
+                    "partyName": PARTY_CODE_TO_NAME.get(winner["partyCode"], winner["partyCode"]),
+                    "votes": winner["votes"],
+                    "votePercent": winner["votePercent"]
+                },
+                "margin": margin
+            })
+    
+    # Sort the lists
+    top_by_percent = sorted(by_percent, key=lambda x: x["votePercent"], reverse=True)[:num_entries]
+    worst_by_percent = sorted(by_percent, key=lambda x: x["votePercent"])[:num_entries]
+    top_by_margin = sorted(by_margin_win, key=lambda x: x["margin"], reverse=True)[:num_entries]
+    worst_by_margin = sorted(by_margin_loss, key=lambda x: x["margin"], reverse=True)[:num_entries]
+    
+    return {
+        "topByVotePercent": top_by_percent,
+        "topByWinningMargin": top_by_margin,
+        "worstByVotePercent": worst_by_percent,
+        "worstByLosingMargin": worst_by_margin
+    }
@@ -0,0 +1,177 @@
+"""Result cache keys, LRU bounds, pinning, snapshot invalidation and coalescing."""
+
+import json
+import threading
+import time
+
+from elections_canada_mcp.cache import ResultCache, SingleFlight
+from elections_canada_mcp.utils import get_party_code
+
+
+def make_tool(cache, calls):
+    @cache.cached({"party": get_party_code})
+    def party_votes(party: str, num_entries: int = 10):
+        calls.append(party)
+        return json.dumps({"party": get_party_code(party), "numEntries": num_entries})
+    return party_votes
+
+
+def test_equivalent_arguments_share_a_key():
+    cache = ResultCache()
+    cache.set_snapshot("a")
+    calls = []
+    tool = make_tool(cache, calls)
+
+    keys = {tool.cache_key(party) for party in ("Liberal", "lpc", "LPC")}
+    assert len(keys) == 1
+    # Defaults are part of the key, so omitting them is the same call
+    assert tool.cache_key("LPC") == tool.cache_key("LPC", num_entries=10)
+    assert tool.cache_key("LPC") != tool.cache_key("LPC", num_entries=5)
+
+    results = {tool(party) for party in ("Liberal", "lpc", "LPC")}
+    assert len(results) == 1
+    assert calls == ["Liberal"]
+
+
+def test_lru_eviction_keeps_pinned_entries():
+    cache = ResultCache(max_entries=2)
+    cache.set_snapshot("a")
+    cache.pin("pinned", "p")
+    for key in ("one", "two", "three"):
+        cache.put(key, key)
+
+    assert cache.get("pinned") == "p"
+    assert cache.get("one") is None
+    assert cache.get("two") == "two" and cache.get("three") == "three"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_larger_than_the_bound_are_not_stored():
+    cache = ResultCache(max_bytes=4)
+    cache.put("key", "too large")
+    assert not cache.contains("key")
+
+
+def test_snapshot_change_clears_entries_and_pins():
+    cache = ResultCache()
+    cache.set_snapshot("a")
+    calls = []
+    tool = make_tool(cache, calls)
+    tool("LPC")
+    cache.pin("pinned", "p")
+
+    cache.set_snapshot("a")
+    assert cache.contains(tool.cache_key("LPC")) and cache.contains("pinned")
+
+    cache.set_snapshot("b")
+    assert not cache.contains(tool.cache_key("LPC")) and not cache.contains("pinned")
+    tool("LPC")
+    assert calls == ["LPC", "LPC"]
+
+
+
+def start(target, *args):
+    thread = threading.Thread(target=target, args=args)
+    thread.start()
+    return thread
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def run_flight(flights, fn, followers=4):
+    """Run a blocked leader and several followers for one key; return what each thread got."""
+    started, release = threading.Event(), threading.Event()
+    calls, outcomes = [], []
+
+    def blocked():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return fn()
+
+    def call():
+        try:
+            outcomes.append(("result", flights.do("key", blocked)))
+        except Exception as e:
+            outcomes.append(("error", e))
+
+    threads = [start(call)]
+    assert started.wait(5)
+    coalesced = flights.coalesced
+    threads += [start(call) for _ in range(followers)]
+    # Every follower is waiting on the leader's flight before it is released
+    wait_until(lambda: flights.coalesced == coalesced + followers)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    return calls, outcomes
+
+
+def test_followers_share_the_leaders_result():
+    flights = SingleFlight()
+    result = object()
+    calls, outcomes = run_flight(flights, lambda: result)
+    assert calls == [1]
+    assert flights.coalesced == 4
+    assert outcomes == [("result", result)] * 5
+
+    # The flight is over: the next call computes again
+    assert flights.do("key", lambda: "again") == "again"
+
+
+def test_errors_reach_every_waiter():
+    flights = SingleFlight()
+    error = RuntimeError("failed")
+
+    def fail():
+        raise error
+
+    calls, outcomes = run_flight(flights, fail)
+    assert calls == [1]
+    assert outcomes == [("error", error)] * 5
+
+
+def test_cached_tool_calls_are_coalesced():
+    cache = ResultCache()
+    cache.set_snapshot("a")
+    started, release = threading.Event(), threading.Event()
+    calls, results = [], []
+
+    @cache.cached()
+    def slow(value: int):
+        calls.append(value)
+        started.set()
+        release.wait(5)
+        return json.dumps({"value": value})
+
+    threads = [start(lambda: results.append(slow(1)))]
+    assert started.wait(5)
+    threads += [start(lambda: results.append(slow(1))) for _ in range(3)]
+    wait_until(lambda: cache.stats()["coalesced"] == 3)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert calls == [1]
+    assert results == [json.dumps({"value": 1})] * 4
+    assert cache.stats()["misses"] == 4
+    assert slow(1) == results[0] and cache.stats()["hits"] == 1
+
+
+def test_leader_rechecks_results_stored_after_its_miss(monkeypatch):
+    cache = ResultCache()
+    cache.set_snapshot("a")
+    calls = []
+    tool = make_tool(cache, calls)
+    # Another flight stores the result between this caller's miss and its flight
+    cache.put(tool.cache_key("LPC"), "stored")
+    monkeypatch.setattr(cache, "get", lambda key: None)
+
+    assert tool("LPC") == "stored"
+    assert calls == []
+    assert cache.stats()["hits"] == 0 and cache.stats()["misses"] == 0
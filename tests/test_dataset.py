@@ -0,0 +1,51 @@
+"""Finishing positions and head-to-head counts of the dataset against a per-riding sort."""
+
+import numpy as np
+import pytest
+
+from elections_canada_mcp.dataset import ElectionDataset
+from elections_canada_mcp.oracle import synthetic_ridings
+
+
+@pytest.fixture(scope="module")
+def ridings():
+    return synthetic_ridings(seed=5, num_ridings=200, tie_rate=0.3, zero_rate=0.2)
+
+
+def test_rank_matches_a_sort_of_each_riding(ridings):
+    dataset = ElectionDataset(ridings)
+    for row, riding in enumerate(ridings):
+        # Stable sort of the ballot: ties keep ballot order
+        ranked = sorted(riding["voteDistribution"], key=lambda vote: -vote["votes"])
+        expected = np.zeros(dataset.num_parties, dtype=np.int8)
+        for position, vote in enumerate(ranked, start=1):
+            if vote["votes"] > 0:
+                expected[dataset.party_index[vote["partyCode"]]] = position
+        assert np.array_equal(dataset.rank[row], expected), riding["ridingCode"]
+        on_ballot = [dataset.party_index[vote["partyCode"]] for vote in ranked]
+        assert dataset.order[row, :len(on_ballot)].tolist() == on_ballot
+
+
+def test_head_to_head_matches_a_loop(ridings):
+    dataset = ElectionDataset(ridings)
+    expected = np.zeros((dataset.num_parties, dataset.num_parties), dtype=np.int64)
+    for riding in ridings:
+        votes = {vote["partyCode"]: vote["votes"] for vote in riding["voteDistribution"]}
+        for a, votes_a in votes.items():
+            if votes_a <= 0:
+                continue
+            for b in dataset.party_codes:
+                if votes_a > votes.get(b, 0):
+                    expected[dataset.party_index[a], dataset.party_index[b]] += 1
+    assert np.array_equal(dataset.head_to_head, expected)
+
+
+def test_ranking_queries_reuse_the_stored_order(ridings, monkeypatch):
+    dataset = ElectionDataset(ridings)
+    expected = dataset.closest_ridings(5), dataset.best_and_worst("LPC", 5)
+
+    def unexpected_sort():
+        raise AssertionError("ranked_parties() called after construction")
+
+    monkeypatch.setattr(dataset, "ranked_parties", unexpected_sort)
+    assert (dataset.closest_ridings(5), dataset.best_and_worst("LPC", 5)) == expected
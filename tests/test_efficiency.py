@@ -0,0 +1,86 @@
+"""Wasted votes and disproportionality indices against a per-riding loop."""
+
+import math
+
+import numpy as np
+import pytest
+
+from elections_canada_mcp.dataset import ElectionDataset
+from elections_canada_mcp.efficiency import EfficiencyIndex
+from elections_canada_mcp.oracle import synthetic_ridings
+
+
+@pytest.fixture(scope="module")
+def ridings():
+    return synthetic_ridings(seed=8, num_ridings=150, tie_rate=0.3)
+
+
+@pytest.fixture(scope="module")
+def index(ridings):
+    return EfficiencyIndex(ElectionDataset(ridings))
+
+
+def loop_totals(ridings):
+    """Votes, seats, losing and surplus votes per party, riding by riding."""
+    totals = {}
+    for riding in ridings:
+        ranked = sorted(riding["voteDistribution"], key=lambda vote: -vote["votes"])
+        winner = ranked[0]["partyCode"] if ranked[0]["votes"] > 0 else None
+        runner_up = ranked[1]["votes"] if len(ranked) > 1 else 0
+        for vote in riding["voteDistribution"]:
+            party = totals.setdefault(vote["partyCode"], {"votes": 0, "seats": 0, "losing": 0, "surplus": 0})
+            party["votes"] += vote["votes"]
+            if vote["partyCode"] == winner:
+                party["seats"] += 1
+                party["surplus"] += max(vote["votes"] - runner_up - 1, 0)
+            else:
+                party["losing"] += vote["votes"]
+    return {code: party for code, party in totals.items() if party["votes"] or party["seats"]}
+
+
+def check(metrics, ridings):
+    expected = loop_totals(ridings)
+    found = {
+        p["partyCode"]: {"votes": p["votes"], "seats": p["seats"],
+                         "losing": p["losingVotes"], "surplus": p["surplusVotes"]}
+        for p in metrics["parties"]
+    }
+    assert found == expected
+    for party in metrics["parties"]:
+        assert party["wastedVotes"] == party["losingVotes"] + party["surplusVotes"]
+    assert metrics["totalRidings"] == len(ridings)
+    assert metrics["wastedVotes"] == sum(p["losing"] + p["surplus"] for p in expected.values())
+
+    total_votes = sum(p["votes"] for p in expected.values())
+    total_seats = sum(p["seats"] for p in expected.values())
+    differences = [p["votes"] / total_votes * 100 - p["seats"] / total_seats * 100 for p in expected.values()]
+    assert metrics["gallagherIndex"] == round(math.sqrt(sum(d * d for d in differences) / 2), 2)
+    assert metrics["loosemoreHanbyIndex"] == round(sum(abs(d) for d in differences) / 2, 2)
+
+
+def test_national_metrics_match_a_loop(index, ridings):
+    check(index.metrics(), ridings)
+
+
+def test_province_and_masked_metrics_match_a_loop(index, ridings):
+    for province in sorted({riding["provCode"] for riding in ridings}):
+        selected = [riding for riding in ridings if riding["provCode"] == province]
+        if sum(vote["votes"] for riding in selected for vote in riding["voteDistribution"]):
+            check(index.metrics(province), selected)
+
+    mask = np.arange(len(ridings)) % 3 == 0
+    check(index.metrics(mask=mask), [riding for riding, keep in zip(ridings, mask) if keep])
+
+
+def test_efficiency_gap():
+    def riding(code, **votes):
+        return {"ridingCode": code, "ridingName_EN": f"Riding {code}", "provCode": "ON",
+                "voteDistribution": [{"partyCode": party, "votes": count, "votePercent": 0.0}
+                                     for party, count in votes.items()]}
+
+    # LPC wins two ridings narrowly and loses one heavily
+    metrics = EfficiencyIndex(ElectionDataset([
+        riding(1, LPC=55, CPC=45), riding(2, LPC=55, CPC=45), riding(3, LPC=10, CPC=90),
+    ])).metrics()
+    # Wasted: LPC 9 + 9 + 10 = 28, CPC 45 + 45 + 79 = 169, of 300 votes
+    assert metrics["efficiencyGap"] == {"parties": ["LPC", "CPC"], "gapPercent": 47.0, "favours": "LPC"}
@@ -0,0 +1,86 @@
+"""Seat allocation methods against known results, and the simulator's error handling."""
+
+import numpy as np
+import pytest
+
+from elections_canada_mcp.dataset import ElectionDataset
+from elections_canada_mcp.electoral_systems import (
+    ElectoralSystemError,
+    SeatSimulator,
+    get_method,
+    highest_averages,
+    largest_remainder
+)
+
+# The textbook example: four parties sharing 8 seats
+VOTES = np.array([100000, 80000, 30000, 20000])
+
+
+def test_dhondt():
+    assert highest_averages(VOTES, 8, "dhondt").tolist() == [4, 3, 1, 0]
+
+
+def test_sainte_lague():
+    assert highest_averages(VOTES, 8, "sainte_lague").tolist() == [3, 3, 1, 1]
+
+
+def test_largest_remainder():
+    assert largest_remainder(VOTES, 8).tolist() == [3, 3, 1, 1]
+
+
+def test_dhondt_with_initial_seats():
+    # Compensatory seats: the seats already held count in the divisors
+    initial = np.array([4, 0, 0, 0])
+    assert highest_averages(VOTES, 4, "dhondt", initial=initial).tolist() == [4, 3, 1, 0]
+
+
+def test_parties_without_votes_get_no_seats():
+    assert highest_averages(np.array([0, 0]), 3).tolist() == [0, 0]
+    assert largest_remainder(np.array([0, 0]), 3).tolist() == [0, 0]
+
+
+def test_method_aliases():
+    assert get_method("D'Hondt") == "dhondt"
+    assert get_method("Sainte-Laguë") == "sainte_lague"
+    assert get_method("Hare") == "largest_remainder"
+    assert get_method("unknown") is None
+
+
+def two_province_dataset():
+    ridings = []
+    for i, (province, votes) in enumerate([
+        ("ON", {"LPC": 500, "CPC": 400, "NDP": 100}),
+        ("ON", {"LPC": 300, "CPC": 450, "NDP": 250}),
+        ("ON", {"LPC": 450, "CPC": 350, "NDP": 200}),
+        ("AB", {"LPC": 100, "CPC": 800, "NDP": 100}),
+        ("AB", {"LPC": 200, "CPC": 600, "NDP": 200})
+    ]):
+        total = sum(votes.values())
+        ridings.append({
+            "ridingCode": 10000 + i,
+            "ridingName_EN": f"Riding {i}",
+            "provCode": province,
+            "voteDistribution": [
+                {"partyCode": code, "votes": count, "votePercent": round(count / total * 100, 2)}
+                for code, count in votes.items()
+            ]
+        })
+    return ElectionDataset(ridings)
+
+
+def test_threshold_above_every_party_is_an_error():
+    simulator = SeatSimulator(two_province_dataset())
+    with pytest.raises(ElectoralSystemError, match="Alberta"):
+        simulator.simulate(["dhondt"], threshold=80)
+
+
+def test_mmp_compares_chambers_by_share():
+    result = SeatSimulator(two_province_dataset()).simulate(["mmp"], regional=False)
+    mmp = result["systems"][0]
+    fptp = result["firstPastThePost"]
+    assert mmp["addedSeats"] == mmp["totalSeats"] - fptp["totalSeats"] > 0
+    for party in mmp["parties"]:
+        fptp_party = next(p for p in fptp["parties"] if p["partyCode"] == party["partyCode"])
+        assert party["seatChangeFromFPTP"] == party["seats"] - fptp_party["seats"]
+        assert party["seatPercentChangeFromFPTP"] == pytest.approx(
+            party["seatPercent"] - fptp_party["seatPercent"], abs=0.02)
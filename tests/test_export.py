@@ -0,0 +1,100 @@
+"""Chunked export of the vote table through cursors."""
+
+import base64
+import csv
+import io
+import json
+
+import numpy as np
+import pytest
+
+from elections_canada_mcp.dataset import ElectionDataset
+from elections_canada_mcp.export import EXPORT_COLUMNS, EXPORT_FORMATS, ExportError, VoteTableExporter
+from elections_canada_mcp.oracle import DATA_FILE
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    return ElectionDataset.from_file(DATA_FILE)
+
+
+def chunk_rows(chunk):
+    """Return the (ridingCode, partyCode, votes) rows of an exported chunk."""
+    data = chunk["data"]
+    if chunk["format"] == "csv":
+        records = list(csv.DictReader(io.StringIO(data), fieldnames=EXPORT_COLUMNS))
+        if chunk["offset"] == 0:
+            assert tuple(records.pop(0).values()) == EXPORT_COLUMNS
+        return [(int(r["ridingCode"]), r["partyCode"], int(r["votes"])) for r in records]
+    if chunk["format"] == "ndjson":
+        records = [json.loads(line) for line in data.splitlines()]
+        return [(r["ridingCode"], r["partyCode"], r["votes"]) for r in records]
+    fields = {field["name"]: field for field in data["fields"]}
+
+    def column(name):
+        field = fields[name]
+        dtype = field["type"][len("dictionary<"):-1] if "dictionary" in field else field["type"]
+        values = np.frombuffer(base64.b64decode(field["buffer"]), dtype=dtype)
+        return [field["dictionary"][i] for i in values] if "dictionary" in field else values.tolist()
+
+    return list(zip(column("ridingCode"), column("partyCode"), column("votes")))
+
+
+def export_all(exporter, export_format, chunk_size, **filters):
+    rows, cursor, chunks = [], None, 0
+    while True:
+        chunk = exporter.export_chunk(export_format, cursor, chunk_size, **filters)
+        assert chunk["rows"] == len(chunk_rows(chunk)) <= chunk_size
+        rows += chunk_rows(chunk)
+        chunks += 1
+        cursor = chunk["nextCursor"]
+        if cursor is None:
+            return rows, chunks
+
+
+@pytest.mark.parametrize("export_format", EXPORT_FORMATS)
+def test_cursors_cover_every_row_once(dataset, export_format):
+    exporter = VoteTableExporter(dataset)
+    expected = [
+        (riding["ridingCode"], vote["partyCode"], vote["votes"])
+        for riding in dataset.ridings for vote in riding["voteDistribution"]
+    ]
+    rows, chunks = export_all(exporter, export_format, 997)
+    assert sorted(rows) == sorted(expected)
+    assert len(set(rows)) == len(rows)
+    assert chunks == -(-len(expected) // 997)
+
+
+@pytest.mark.parametrize("export_format", EXPORT_FORMATS)
+def test_filtered_export(dataset, export_format):
+    exporter = VoteTableExporter(dataset)
+    rows, _ = export_all(exporter, export_format, 50, province_code="PE", party_code="NDP")
+    expected = [
+        (riding["ridingCode"], "NDP", vote["votes"])
+        for riding in dataset.ridings if riding["provCode"] == "PE"
+        for vote in riding["voteDistribution"] if vote["partyCode"] == "NDP"
+    ]
+    assert rows == expected
+
+
+def test_invalid_requests(dataset):
+    exporter = VoteTableExporter(dataset)
+    with pytest.raises(ExportError):
+        exporter.export_chunk("xml")
+    with pytest.raises(ExportError):
+        exporter.export_chunk("csv", chunk_size=0)
+    with pytest.raises(ExportError):
+        exporter.export_chunk("csv", cursor="not a cursor")
+
+
+def test_negative_offset_is_rejected(dataset):
+    exporter = VoteTableExporter(dataset)
+    with pytest.raises(ExportError, match="Invalid cursor"):
+        exporter.export_chunk("csv", cursor=exporter.encode_cursor(-5))
+
+
+def test_cursor_from_another_snapshot_is_rejected(dataset):
+    cursor = VoteTableExporter(dataset).export_chunk("csv", chunk_size=10)["nextCursor"]
+    other = ElectionDataset([riding.to_dict() for riding in dataset.ridings[:5]])
+    with pytest.raises(ExportError, match="snapshot"):
+        VoteTableExporter(other).export_chunk("csv", cursor=cursor)
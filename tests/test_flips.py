@@ -0,0 +1,89 @@
+"""Flip costs of FlipAnalyzer against a brute-force search."""
+
+import random
+
+import numpy as np
+
+from elections_canada_mcp.dataset import ElectionDataset
+from elections_canada_mcp.flips import UNFLIPPABLE, FlipAnalyzer
+
+PARTY_CODES = ("LPC", "CPC", "NDP", "BQ", "GPC")
+
+
+def small_ridings(seed, num_ridings=60, max_votes=40):
+    """Random ridings with small vote counts, so ties are frequent and brute force is cheap."""
+    rng = random.Random(seed)
+    ridings = []
+    for i in range(num_ridings):
+        ballot = rng.sample(PARTY_CODES, rng.randint(1, len(PARTY_CODES)))
+        votes = [rng.randint(0, max_votes) for _ in ballot]
+        if len(ballot) > 1 and rng.random() < 0.3:
+            votes[1] = max(votes)
+        total = sum(votes)
+        ridings.append({
+            "ridingCode": 10000 + i,
+            "ridingName_EN": f"Riding {i}",
+            "provCode": "ON",
+            "voteDistribution": [
+                {"partyCode": code, "votes": count,
+                 "votePercent": round(count / total * 100, 2) if total else 0.0}
+                for code, count in zip(ballot, votes)
+            ]
+        })
+    return ridings
+
+
+def brute_force_cost(votes, col, winner, mode):
+    """Smallest number of votes that puts a party strictly ahead of every other party."""
+    if winner == col:
+        return 0
+    if votes[col] <= 0:
+        return UNFLIPPABLE
+    x = 0
+    while True:
+        x += 1
+        moved = votes.copy()
+        moved[col] += x
+        if mode == "switched":
+            moved[winner] -= x
+        if all(moved[col] > moved[other] for other in range(len(votes)) if other != col):
+            return x
+
+
+def test_costs_match_brute_force():
+    for seed in range(5):
+        dataset = ElectionDataset(small_ridings(seed))
+        flips = FlipAnalyzer(dataset)
+        for mode in ("added", "switched"):
+            for row in range(dataset.num_ridings):
+                votes = [int(v) if present else 0
+                         for v, present in zip(dataset.votes[row], dataset.has_party[row])]
+                for col in range(dataset.num_parties):
+                    if not dataset.has_party[row, col]:
+                        assert flips.costs[mode][row, col] == UNFLIPPABLE
+                        continue
+                    expected = brute_force_cost(votes, col, int(dataset.winner[row]), mode)
+                    assert flips.costs[mode][row, col] == expected, (seed, mode, row, col)
+
+
+def test_plan_flips_cheapest_ridings():
+    dataset = ElectionDataset(small_ridings(7, num_ridings=80))
+    flips = FlipAnalyzer(dataset)
+    col = dataset.party_index["NDP"]
+    target = int(flips.seats[col]) + 5
+    plan = flips.plan(col, target, "added")
+
+    cost = flips.costs["added"][:, col]
+    candidates = np.flatnonzero((dataset.winner != col) & (cost != UNFLIPPABLE))
+    cheapest = np.sort(cost[candidates])[:5]
+    assert plan["flipsNeeded"] == 5
+    assert plan["costs"].tolist() == cheapest.tolist()
+    assert plan["totalVotes"] == int(cheapest.sum())
+
+
+def test_plan_reports_unreachable_target():
+    dataset = ElectionDataset(small_ridings(3, num_ridings=20))
+    flips = FlipAnalyzer(dataset)
+    plan = flips.plan(dataset.party_index["GPC"], dataset.num_ridings + 1)
+    assert not plan["feasible"]
+    assert plan["totalVotes"] is None
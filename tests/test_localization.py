@@ -0,0 +1,62 @@
+"""French output of the tools and resources."""
+
+import json
+
+from elections_canada_mcp import server
+from elections_canada_mcp.localization import get_language
+
+# St. John's East / St. John's-Est
+RIDING_CODE = 10006
+
+
+def test_language_names():
+    assert get_language(None) == "EN"
+    assert get_language("fr") == get_language("Français") == "FR"
+    assert get_language("de") is None
+
+
+def test_party_province_and_region_names():
+    result = json.loads(server.summarize_province_results("QC", language="FR"))
+    assert result["regionName"] == "Québec"
+    names = {party["partyCode"]: party["partyName"] for party in result["parties"]}
+    assert names["LPC"] == "Parti libéral du Canada"
+
+    result = json.loads(server.summarize_national_results(language="FR"))
+    assert result["regionName"] == "Canada"
+
+
+def test_riding_names():
+    english = json.loads(server.get_winning_party(RIDING_CODE))
+    french = json.loads(server.get_winning_party(RIDING_CODE, language="FR"))
+    assert english["ridingName"] == "St. John's East"
+    assert french["ridingName"] == "St. John's-Est"
+    # Only the names change
+    assert french["winningParty"]["votes"] == english["winningParty"]["votes"]
+
+
+def test_languages_are_cached_separately():
+    key = server.get_winning_party.cache_key
+    assert key(RIDING_CODE) == key(RIDING_CODE, language="EN")
+    assert key(RIDING_CODE, language="fr") == key(RIDING_CODE, language="FR")
+    assert key(RIDING_CODE) != key(RIDING_CODE, language="FR")
+
+
+def test_export_riding_names():
+    for export_format in ("csv", "ndjson", "columnar"):
+        chunk = json.loads(server.export_votes(export_format, province="NL", chunk_size=100, language="FR"))
+        data = json.dumps(chunk["data"])
+        assert "St. John's-Est" in data, export_format
+        assert "St. John's East" not in data, export_format
+
+
+def test_localized_resources():
+    riding = json.loads(server.get_riding_localized(str(RIDING_CODE), "fr"))
+    assert riding["ridingName"] == "St. John's-Est"
+    assert riding["provinceName"] == "Terre-Neuve-et-Labrador"
+    assert all(vote["partyName"] for vote in riding["voteDistribution"])
+
+    ridings = json.loads(server.get_province_ridings_localized("NL", "FR"))
+    assert RIDING_CODE in [r["ridingCode"] for r in ridings]
+    assert "St. John's-Est" in [r["ridingName"] for r in ridings]
+
+    assert "error" in json.loads(server.get_all_ridings_localized("xx"))
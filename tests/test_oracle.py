@@ -0,0 +1,28 @@
+"""The vectorized engines against the reference implementations on raw riding records."""
+
+import copy
+
+import numpy as np
+
+from elections_canada_mcp.oracle import run
+
+
+def test_engines_match_the_reference():
+    report = run(seeds=2, repeat=1)
+    assert report["mismatches"] == 0, report
+
+
+def column_order_closest(dataset, **args):
+    """closest_ridings with ties broken by party column instead of ballot position."""
+    dataset = copy.copy(dataset)
+    dataset.ballot_position = np.broadcast_to(
+        np.arange(dataset.num_parties, dtype=np.int8), dataset.ballot_position.shape
+    )
+    dataset.order = dataset.ranked_parties()
+    return dataset.closest_ridings(**args)
+
+
+def test_oracle_detects_tie_order_bugs():
+    report = run(seeds=2, repeat=1, tools=["find_closest_ridings"],
+                 candidates={"find_closest_ridings": column_order_closest})
+    assert report["mismatches"] > 0
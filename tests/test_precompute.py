@@ -0,0 +1,16 @@
+"""Precomputed results are only loaded for the snapshot they were built from."""
+
+import json
+
+from elections_canada_mcp.precompute import build, load
+
+
+def test_precomputed_results_are_tied_to_the_snapshot(tmp_path):
+    path = str(tmp_path / "results.precomputed.json.gz")
+    tools = {"echo": lambda value: json.dumps({"value": value})}
+    build(tools, "a", path, calls=[("echo", {"value": 1})])
+
+    entries = load(path, "a")
+    assert entries == [{"tool": "echo", "args": {"value": 1}, "result": json.dumps({"value": 1})}]
+    assert load(path, "b") == []
+    assert load(str(tmp_path / "missing.json.gz"), "a") == []
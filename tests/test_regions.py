@@ -0,0 +1,124 @@
+"""Custom region bitsets, set algebra, summaries and the per-election region cache key."""
+
+import json
+
+import numpy as np
+import pytest
+
+from elections_canada_mcp import server
+from elections_canada_mcp.dataset import ElectionDataset
+from elections_canada_mcp.oracle import synthetic_ridings
+from elections_canada_mcp.regions import RegionError, RegionRegistry
+
+
+@pytest.fixture(scope="module")
+def ridings():
+    # 37 ridings, so the last byte of a bitset is only partly used
+    return synthetic_ridings(seed=3, num_ridings=37)
+
+
+@pytest.fixture()
+def registry(ridings):
+    return RegionRegistry(ElectionDataset(ridings), max_regions=3)
+
+
+def codes_in(registry, bits):
+    return set(registry.dataset.riding_codes[registry.to_mask(bits)].tolist())
+
+
+def test_bits_round_trip(registry):
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        mask = rng.random(registry.dataset.num_ridings) < 0.5
+        bits = registry.to_bits(mask)
+        assert bits.shape == registry.empty().shape
+        assert np.array_equal(registry.to_mask(bits), mask)
+    assert not registry.to_mask(registry.empty()).any()
+    assert registry.to_mask(registry.full()).all()
+
+
+def test_define_and_resolve(registry, ridings):
+    codes = [riding["ridingCode"] for riding in ridings[:5]]
+    region = registry.define("North", registry.union(codes))
+    assert region == {"regionName": "North", "totalRidings": 5, "ridingCodes": codes}
+    assert codes_in(registry, registry.resolve("north")) == set(codes)
+    assert registry.list() == [{"regionName": "North", "totalRidings": 5}]
+
+    version = registry.version
+    registry.define("North", registry.union(codes[:2]))
+    assert registry.version == version + 1
+    assert registry.list() == [{"regionName": "North", "totalRidings": 2}]
+
+    for name in ("", "Canada", "Ontario", "QC"):
+        with pytest.raises(RegionError):
+            registry.define(name, registry.full())
+    with pytest.raises(RegionError):
+        registry.resolve("South")
+
+
+def test_region_count_is_bounded(registry):
+    for name in ("A", "B", "C"):
+        registry.define(name, registry.full())
+    with pytest.raises(RegionError, match="Too many"):
+        registry.define("D", registry.full())
+    # Redefining an existing name does not add a region
+    registry.define("A", registry.empty())
+    assert registry.delete("B")
+    registry.define("D", registry.full())
+
+
+def test_set_operations(registry, ridings):
+    codes = [riding["ridingCode"] for riding in ridings]
+    registry.define("First", registry.union(codes[:20]))
+    registry.define("Second", registry.union(codes[10:30]))
+    first, second = set(codes[:20]), set(codes[10:30])
+
+    assert codes_in(registry, registry.union(["First", "Second"])) == first | second
+    assert codes_in(registry, registry.intersection(["First", "Second"])) == first & second
+    assert codes_in(registry, registry.build(include=["First"], exclude=["Second"])) == first - second
+    assert codes_in(registry, registry.build(include=["First"], intersect=["Second"])) == first & second
+
+    province = ridings[0]["provCode"]
+    expected = {riding["ridingCode"] for riding in ridings if riding["provCode"] == province} - first
+    assert codes_in(registry, registry.build(include=[province], exclude=["First"])) == expected
+
+
+def test_summarize_matches_a_loop(registry, ridings):
+    codes = [riding["ridingCode"] for riding in ridings]
+    registry.define("Half", registry.union(codes[::2]))
+    bits = registry.build(include=["Half"], max_margin=50)
+    selected = codes_in(registry, bits)
+
+    votes, seats = {}, {}
+    for riding in ridings:
+        if riding["ridingCode"] not in selected:
+            continue
+        winner, max_votes = None, 0
+        for vote in riding["voteDistribution"]:
+            votes[vote["partyCode"]] = votes.get(vote["partyCode"], 0) + vote["votes"]
+            if vote["votes"] > max_votes:
+                winner, max_votes = vote["partyCode"], vote["votes"]
+        if winner:
+            seats[winner] = seats.get(winner, 0) + 1
+
+    summary = registry.summarize(bits, "Half")
+    assert summary["totalRidings"] == len(selected)
+    assert summary["totalVotes"] == sum(votes.values())
+    assert {p["partyCode"]: p["votes"] for p in summary["parties"]} == votes
+    assert {p["partyCode"]: p["seats"] for p in summary["parties"] if p["seats"]} == seats
+
+
+def test_region_cache_key_follows_its_election():
+    other = server.ELECTIONS.add("1999", ElectionDataset(synthetic_ridings(seed=4, num_ridings=10)))
+    try:
+        key = server.summarize_region.cache_key
+        before = key(), key(election="1999")
+        other.regions.define("Elsewhere", other.regions.full())
+        # Only the election whose regions changed gets a new key
+        assert key() == before[0]
+        assert key(election="1999") != before[1]
+
+        result = json.loads(server.summarize_region(["Elsewhere"], election="1999"))
+        assert result["totalRidings"] == 10
+    finally:
+        del server.ELECTIONS.contexts["1999"]
@@ -0,0 +1,65 @@
+"""Riding names and codes resolved by the per-riding tools."""
+
+import json
+
+import pytest
+
+from elections_canada_mcp import server
+
+CONTEXT = server.DEFAULT_ELECTION
+HALIFAX, HALIFAX_WEST = 12006, 12007
+# Terra Nova—The Peninsulas / Terra Nova—Les Péninsules
+TERRA_NOVA = 10007
+
+
+def test_exact_name_wins_over_substrings():
+    # "Halifax" is also part of "Halifax West"
+    assert CONTEXT.resolve_riding("Halifax") == (HALIFAX, [])
+    assert CONTEXT.resolve_riding("halifax west") == (HALIFAX_WEST, [])
+    code, candidates = CONTEXT.resolve_riding("Halif")
+    assert code is None and {HALIFAX, HALIFAX_WEST} <= set(candidates)
+    assert CONTEXT.resolve_riding("Nowhere at all") == (None, [])
+    assert CONTEXT.resolve_riding("  ") == (None, [])
+
+
+def test_french_and_unaccented_names():
+    for name in ("Terra Nova—Les Péninsules", "terra nova les peninsules", "TERRA NOVA-THE PENINSULAS",
+                 "Péninsules"):
+        assert CONTEXT.resolve_riding(name) == (TERRA_NOVA, []), name
+    assert CONTEXT.resolve_riding("Halifax-Ouest") == (HALIFAX_WEST, [])
+
+
+def test_numeric_strings():
+    assert CONTEXT.resolve_riding(TERRA_NOVA) == (TERRA_NOVA, [])
+    assert CONTEXT.resolve_riding(str(TERRA_NOVA)) == (TERRA_NOVA, [])
+    assert CONTEXT.resolve_riding(f" {TERRA_NOVA} ") == (TERRA_NOVA, [])
+    assert CONTEXT.resolve_riding("99999") == (None, [])
+
+
+@pytest.mark.parametrize("call", [
+    lambda riding: server.find_similar_ridings(riding),
+    lambda riding: server.find_similar_ridings_batch([riding, HALIFAX_WEST]),
+    lambda riding: server.turnout_statistics(riding_code=riding, num_entries=1),
+    lambda riding: server.votes_to_flip(riding),
+    lambda riding: server.vote_share_distribution("LPC", riding_code=riding, num_entries=1),
+    lambda riding: server.get_winning_party(riding),
+])
+def test_tools_accept_names(call):
+    expected = call(HALIFAX)
+    assert "error" not in json.loads(expected)
+    assert call("halifax") == call(str(HALIFAX)) == expected
+
+    ambiguous = json.loads(call("Halif"))
+    assert "ambiguous" in ambiguous["error"]
+    assert HALIFAX in [candidate["ridingCode"] for candidate in ambiguous["candidates"]]
+    assert "No riding matches" in json.loads(call("Nowhere at all"))["error"]
+    assert "not found" in json.loads(call(99999))["error"]
+
+
+def test_names_share_cache_entries():
+    for tool in (server.find_similar_ridings, server.votes_to_flip, server.turnout_statistics):
+        key = tool.cache_key
+        assert key(riding_code="Halifax") == key(riding_code=" halifax ")
+        assert key(riding_code=str(HALIFAX)) == key(riding_code=HALIFAX)
+    key = server.find_similar_ridings_batch.cache_key
+    assert key(["Halifax", str(HALIFAX_WEST)]) == key(["HALIFAX", HALIFAX_WEST])
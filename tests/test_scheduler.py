@@ -0,0 +1,179 @@
+"""Admission control: capacity, per-client limits, the bounded FIFO queue, timeouts and cancellation."""
+
+import asyncio
+
+import pytest
+
+from elections_canada_mcp.scheduler import AdmissionController, OverloadedError, tool_cost
+
+
+async def settle():
+    """Let every ready task run until it blocks."""
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+class Call:
+    """A call that holds its admission until released."""
+
+    def __init__(self, controller, client_id, cost, admitted):
+        self.release = asyncio.Event()
+        self.task = asyncio.ensure_future(self.run(controller, client_id, cost, admitted))
+
+    async def run(self, controller, client_id, cost, admitted):
+        async with controller.admit(client_id, cost):
+            admitted.append(self)
+            await self.release.wait()
+
+
+def test_tool_cost():
+    assert tool_cost("get_winning_party", {}) == 1
+    assert tool_cost("find_closest_ridings", {"num_results": 120}) == 10
+    assert tool_cost("find_similar_ridings_batch", {"riding_codes": list(range(100))}) == 6
+    assert tool_cost("unknown", {"num_entries": -5}) == 1
+
+
+def test_cost_above_capacity_is_rejected():
+    async def main():
+        controller = AdmissionController(capacity=4)
+        with pytest.raises(OverloadedError, match="exceeds the server capacity"):
+            async with controller.admit("a", 5):
+                pass
+        async with controller.admit("a", 4):
+            assert controller.in_flight_cost == 4
+        return controller.stats()
+
+    stats = asyncio.run(main())
+    assert stats["rejected"] == 1 and stats["admitted"] == 1
+    assert stats["inFlightCost"] == 0 and stats["activeClients"] == 0
+
+
+def test_per_client_limit():
+    async def main():
+        controller = AdmissionController(capacity=10, per_client_limit=2)
+        admitted = []
+        calls = [Call(controller, "a", 1, admitted) for _ in range(2)]
+        await settle()
+        with pytest.raises(OverloadedError, match="Too many concurrent requests"):
+            async with controller.admit("a", 1):
+                pass
+        # Other clients are not affected
+        async with controller.admit("b", 1):
+            pass
+        calls[0].release.set()
+        await settle()
+        # A finished call frees a slot for its client
+        async with controller.admit("a", 1):
+            pass
+        calls[1].release.set()
+        await settle()
+        return controller.stats()
+
+    stats = asyncio.run(main())
+    assert stats["rejected"] == 1 and stats["admitted"] == 4
+    assert stats["activeClients"] == 0
+
+
+def test_bounded_queue_wakes_waiters_in_fifo_order():
+    async def main():
+        controller = AdmissionController(capacity=2, max_queue=3, max_wait=5)
+        admitted = []
+        holder = Call(controller, "holder", 2, admitted)
+        await settle()
+        waiters = [Call(controller, f"client{i}", cost, admitted) for i, cost in enumerate((2, 1, 1))]
+        await settle()
+        assert admitted == [holder] and controller.stats()["queueLength"] == 3
+
+        # The queue is full
+        with pytest.raises(OverloadedError, match="overloaded"):
+            async with controller.admit("late", 1):
+                pass
+
+        # A cheap call does not overtake the queue even though it would fit after the first waiter
+        holder.release.set()
+        await settle()
+        assert admitted == [holder, waiters[0]]
+        waiters[0].release.set()
+        await settle()
+        assert admitted == [holder] + waiters
+        for call in waiters[1:]:
+            call.release.set()
+        await asyncio.gather(holder.task, *(call.task for call in waiters))
+        return controller.stats()
+
+    stats = asyncio.run(main())
+    assert stats["queued"] == 3 and stats["admitted"] == 4 and stats["rejected"] == 1
+    assert stats["inFlightCost"] == 0 and stats["queueLength"] == 0
+
+
+def test_wait_timeout():
+    async def main():
+        controller = AdmissionController(capacity=1, max_wait=0.01)
+        admitted = []
+        holder = Call(controller, "holder", 1, admitted)
+        await settle()
+        with pytest.raises(OverloadedError, match="overloaded"):
+            async with controller.admit("a", 1):
+                pass
+        stats = controller.stats()
+        holder.release.set()
+        await holder.task
+        return stats, controller.stats()
+
+    while_held, after = asyncio.run(main())
+    assert while_held["queueLength"] == 0 and while_held["inFlightCost"] == 1
+    assert while_held["rejected"] == 1 and while_held["activeClients"] == 1
+    assert after["inFlightCost"] == 0 and after["activeClients"] == 0
+
+
+def test_cancelled_while_queued():
+    async def main():
+        controller = AdmissionController(capacity=1, max_wait=5)
+        admitted = []
+        holder = Call(controller, "holder", 1, admitted)
+        await settle()
+        queued = Call(controller, "a", 1, admitted)
+        await settle()
+        assert controller.stats()["queueLength"] == 1
+
+        queued.task.cancel()
+        await settle()
+        assert queued.task.cancelled()
+        stats = controller.stats()
+        holder.release.set()
+        await holder.task
+        return admitted, holder, stats, controller.stats()
+
+    admitted, holder, while_held, after = asyncio.run(main())
+    assert admitted == [holder]
+    assert while_held["queueLength"] == 0 and while_held["activeClients"] == 1
+    # Cancellation is not counted as a rejection
+    assert while_held["rejected"] == 0
+    assert after["inFlightCost"] == 0
+
+
+def test_admitted_as_the_wait_ends_gives_the_capacity_back():
+    async def main():
+        controller = AdmissionController(capacity=2, max_wait=5)
+        admitted = []
+        await controller._acquire("holder", 2)
+        first = Call(controller, "a", 2, admitted)
+        second = Call(controller, "b", 1, admitted)
+        await settle()
+
+        # The first waiter is cancelled, then admitted by the release before it
+        # runs again: its wait ends with the capacity already reserved for it
+        first.task.cancel()
+        controller._release("holder", 2)
+        assert controller.in_flight_cost == 2 and controller.stats()["queueLength"] == 1
+        await settle()
+        assert first.task.cancelled()
+        # The capacity it was given went to the next waiter
+        assert admitted == [second]
+        assert controller.in_flight_cost == 1
+        second.release.set()
+        await settle()
+        return controller.stats()
+
+    stats = asyncio.run(main())
+    assert stats["inFlightCost"] == 0 and stats["queueLength"] == 0 and stats["activeClients"] == 0
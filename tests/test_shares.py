@@ -0,0 +1,99 @@
+"""Vote-share range, percentile and histogram queries against a brute-force filter."""
+
+import numpy as np
+import pytest
+
+from elections_canada_mcp.dataset import ElectionDataset
+from elections_canada_mcp.oracle import synthetic_ridings
+from elections_canada_mcp.shares import ShareIndex
+
+# Shares on bucket edges, ties, 0% and 100%
+EDGE_SHARES = [0.0, 10.0, 10.0, 19.99, 20.0, 35.5, 50.0, 90.0, 99.99, 100.0]
+
+
+def riding(code, province, share):
+    return {
+        "ridingCode": code,
+        "ridingName_EN": f"Riding {code}",
+        "provCode": province,
+        "voteDistribution": [
+            {"partyCode": "LPC", "votes": int(share * 100), "votePercent": share},
+            {"partyCode": "CPC", "votes": int((100 - share) * 100), "votePercent": round(100 - share, 2)},
+        ]
+    }
+
+
+@pytest.fixture(scope="module", params=["edges", "synthetic"])
+def index(request):
+    if request.param == "edges":
+        ridings = [riding(1000 + i, "ON" if i % 2 else "QC", share) for i, share in enumerate(EDGE_SHARES)]
+        # A party that ran in a single riding
+        ridings[0]["voteDistribution"].append({"partyCode": "GPC", "votes": 0, "votePercent": 0.0})
+    else:
+        ridings = synthetic_ridings(seed=9, num_ridings=200, tie_rate=0.3)
+    return ShareIndex(ElectionDataset(ridings))
+
+
+def scopes(index):
+    return [None] + list(index.dataset.province_list)
+
+
+def shares_in_scope(index, col, province_code):
+    """(row, share) of every riding where the party ran, by a filter over the ridings."""
+    dataset = index.dataset
+    return [
+        (row, dataset.vote_percent[row, col]) for row in range(dataset.num_ridings)
+        if dataset.has_party[row, col] and province_code in (None, dataset.province_codes[row])
+    ]
+
+
+@pytest.mark.parametrize("low, high", [(0, 100), (10, 20), (10, 10), (19.995, 19.999), (20, 10), (-5, 0),
+                                       (99.99, 100), (35.5, 35.5), (100.5, 200)])
+def test_between_matches_a_filter(index, low, high):
+    for col in range(index.dataset.num_parties):
+        for scope in scopes(index):
+            expected = [(row, share) for row, share in shares_in_scope(index, col, scope) if low <= share <= high]
+            count, rows = index.between(col, low, high, scope)
+            assert count == len(expected)
+            assert sorted(rows.tolist()) == sorted(row for row, _ in expected)
+            found = index.dataset.vote_percent[rows, col].tolist()
+            assert found == sorted(found, reverse=True)
+
+            count, top = index.between(col, low, high, scope, num_entries=3)
+            assert count == len(expected)
+            assert index.dataset.vote_percent[top, col].tolist() == found[:3]
+
+
+def test_percentile_matches_a_count(index):
+    for col in range(index.dataset.num_parties):
+        for scope in scopes(index):
+            ranked = shares_in_scope(index, col, scope)
+            for row, share in ranked:
+                result = index.percentile(col, row, scope)
+                assert result["rank"] == 1 + sum(other > share for _, other in ranked)
+                assert result["rankedRidings"] == len(ranked)
+                below = sum(other < share for _, other in ranked)
+                assert result["percentile"] == round(below / len(ranked) * 100, 2)
+
+
+@pytest.mark.parametrize("bucket_width", [10.0, 7.0, 25.0, 100.0])
+def test_histogram_matches_a_filter(index, bucket_width):
+    edges = list(np.arange(0.0, 100.0, bucket_width))
+    for col in range(index.dataset.num_parties):
+        for scope in scopes(index):
+            shares = [share for _, share in shares_in_scope(index, col, scope)]
+            histogram = index.histogram(col, bucket_width, scope)
+            assert [bucket["fromPercent"] for bucket in histogram] == edges
+            assert histogram[-1]["toPercent"] == 100.0
+            for i, bucket in enumerate(histogram):
+                # Each bucket holds its lower bound; the last one also holds 100%
+                high = edges[i + 1] if i + 1 < len(edges) else float("inf")
+                assert bucket["ridings"] == sum(edges[i] <= share < high for share in shares)
+            assert sum(bucket["ridings"] for bucket in histogram) == len(shares)
+
+
+def test_edge_shares_fall_in_the_upper_bucket():
+    index = ShareIndex(ElectionDataset([riding(1000 + i, "ON", s) for i, s in enumerate(EDGE_SHARES)]))
+    col = index.dataset.party_index["LPC"]
+    counts = [bucket["ridings"] for bucket in index.histogram(col, 10.0)]
+    assert counts == [1, 3, 1, 1, 0, 1, 0, 0, 0, 3]
@@ -0,0 +1,55 @@
+"""Nearest ridings from argpartition against a full sort of the distances."""
+
+import numpy as np
+import pytest
+
+from elections_canada_mcp.dataset import ElectionDataset
+from elections_canada_mcp.oracle import synthetic_ridings
+from elections_canada_mcp.similarity import SimilarityIndex
+
+
+@pytest.fixture(scope="module")
+def index():
+    return SimilarityIndex(ElectionDataset(synthetic_ridings(seed=6, num_ridings=120, tie_rate=0.0)))
+
+
+def brute_force(index, anchor, k, mask=None):
+    """Return the k nearest (row, distance) pairs of an anchor by sorting every distance."""
+    distances = np.linalg.norm(index.features - index.features[anchor], axis=1) * 100.0
+    candidates = [row for row in range(len(distances))
+                  if row != anchor and (mask is None or mask[row])]
+    candidates.sort(key=lambda row: distances[row])
+    return [(row, distances[row]) for row in candidates[:k]]
+
+
+def assert_same_neighbours(found, expected):
+    assert len(found) == len(expected)
+    # Rows may differ only between ridings at the same distance
+    assert np.allclose([d for _, d in found], [d for _, d in expected], atol=1e-6)
+    exact = {row: d for row, d in expected}
+    for row, distance in found:
+        if row in exact:
+            assert distance == pytest.approx(exact[row], abs=1e-6)
+
+
+@pytest.mark.parametrize("k", [1, 5, 40, 119, 500])
+def test_nearest_matches_a_full_sort(index, k):
+    anchors = np.arange(0, 120, 7)
+    for anchor, found in zip(anchors, index.nearest(anchors, k)):
+        assert_same_neighbours(found, brute_force(index, anchor, k))
+        assert anchor not in [row for row, _ in found]
+
+
+def test_masked_candidates(index):
+    mask = np.zeros(120, dtype=bool)
+    mask[::3] = True
+    anchors = np.array([0, 1, 2])
+    for anchor, found in zip(anchors, index.nearest(anchors, 10, mask)):
+        assert all(mask[row] for row, _ in found)
+        assert_same_neighbours(found, brute_force(index, anchor, 10, mask))
+
+    # Fewer candidates than k: only the finite ones are returned
+    small = np.zeros(120, dtype=bool)
+    small[[3, 4]] = True
+    assert [row for row, _ in index.nearest(np.array([3]), 10, small)[0]] == [4]
+    assert index.nearest(np.array([3]), 0) == [[]]
@@ -0,0 +1,78 @@
+"""Cross-election comparison on two small hand-made elections."""
+
+import pytest
+
+from elections_canada_mcp.dataset import ElectionDataset
+from elections_canada_mcp.swing import ElectionComparison
+
+
+def riding(code, province, **votes):
+    total = sum(votes.values())
+    return {
+        "ridingCode": code,
+        "ridingName_EN": f"Riding {code}",
+        "provCode": province,
+        "voteDistribution": [
+            {"partyCode": party, "votes": count, "votePercent": round(count / total * 100, 2)}
+            for party, count in votes.items()
+        ]
+    }
+
+
+@pytest.fixture(scope="module")
+def comparison():
+    base = ElectionDataset([
+        riding(1001, "ON", LPC=600, CPC=400),
+        riding(1002, "ON", LPC=300, CPC=500, NDP=200),
+        riding(1003, "QC", BQ=500, LPC=300, CPC=200),
+        riding(1004, "QC", BQ=100, LPC=50),
+    ])
+    # Different riding order, a new party, one riding only in each election
+    target = ElectionDataset([
+        riding(1003, "QC", LPC=450, BQ=400, CPC=150),
+        riding(1001, "ON", LPC=500, CPC=400, GPC=100),
+        riding(1002, "ON", CPC=700, LPC=200, NDP=100),
+        riding(1005, "ON", LPC=10),
+    ])
+    return ElectionComparison(base, target)
+
+
+def test_ridings_are_joined_on_code(comparison):
+    assert comparison.num_ridings == 3
+    assert comparison.unmatched_base.tolist() == [1004]
+    assert comparison.unmatched_target.tolist() == [1005]
+    assert comparison.party_codes == ["LPC", "CPC", "NDP", "BQ", "GPC"]
+
+
+def test_national_swing_matches_a_hand_computation(comparison):
+    summary = comparison.aggregate(comparison.scope_mask())
+    parties = {party["partyCode"]: party for party in summary["parties"]}
+    # Base: LPC 1200, CPC 1100, NDP 200, BQ 500 of 3000 votes
+    # Target: LPC 1150, CPC 1250, NDP 100, BQ 400, GPC 100 of 3000 votes
+    assert {code: (p["baseVotes"], p["targetVotes"]) for code, p in parties.items()} == {
+        "LPC": (1200, 1150), "CPC": (1100, 1250), "NDP": (200, 100), "BQ": (500, 400), "GPC": (0, 100)
+    }
+    assert {code: p["swing"] for code, p in parties.items()} == {
+        "LPC": -1.67, "CPC": 5.0, "NDP": -3.33, "BQ": -3.33, "GPC": 3.33
+    }
+    assert {code: p["seatChange"] for code, p in parties.items()} == {
+        "LPC": 1, "CPC": 0, "NDP": 0, "BQ": -1, "GPC": 0
+    }
+    assert summary["seatFlips"] == 1
+    assert summary["seatFlows"] == [{"from": "BQ", "to": "LPC", "seats": 1}]
+    # Riding volatilities: 10 (1001), 20 (1002), 15 (1003)
+    assert summary["averageVolatility"] == 15.0
+
+
+def test_province_swing_and_riding_change(comparison):
+    summary = comparison.aggregate(comparison.scope_mask("ON"))
+    assert summary["totalRidings"] == 2 and summary["seatFlips"] == 0
+    assert {p["partyCode"]: p["swing"] for p in summary["parties"]} == {
+        "LPC": -10.0, "CPC": 10.0, "NDP": -5.0, "GPC": 5.0
+    }
+
+    change = comparison.riding_change(comparison.row_by_code[1003])
+    assert (change["baseWinner"], change["targetWinner"], change["flipped"]) == ("BQ", "LPC", True)
+    assert {p["partyCode"]: (p["voteChange"], p["swing"]) for p in change["parties"]} == {
+        "LPC": (150, 15.0), "BQ": (-100, -10.0), "CPC": (-50, -5.0)
+    }
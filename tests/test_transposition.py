@@ -0,0 +1,104 @@
+"""Projection of an election onto other boundaries through a small transposition table."""
+
+import pytest
+
+from elections_canada_mcp.dataset import ElectionDataset
+from elections_canada_mcp.transposition import TranspositionError, TranspositionTable
+
+TABLE = """fromCode,toCode,weight,toName_EN,toName_FR,toProvCode
+35001,35001,1,,,
+35002,35001,0.25,,,
+35002,35999,0.75,,,
+24001,24001,0.5,,,
+24001,24999,0.5,New North,Nouveau Nord,QC
+99999,35999,1,,,
+"""
+
+
+def riding(code, province, rejected, registered, **votes):
+    total = sum(votes.values())
+    return {
+        "ridingCode": code,
+        "ridingName_EN": f"Riding {code}",
+        "ridingName_FR": f"Circonscription {code}",
+        "provCode": province,
+        "voteDistribution": [
+            {"partyCode": party, "votes": count, "votePercent": round(count / total * 100, 2)}
+            for party, count in votes.items()
+        ],
+        "validVotes": total,
+        "rejectedVotes": rejected,
+        "totalVotes": total + rejected,
+        "registeredVoters": registered,
+        "turnout": round((total + rejected) / registered * 100, 2)
+    }
+
+
+@pytest.fixture(scope="module")
+def source():
+    return ElectionDataset([
+        riding(35001, "ON", 8, 1600, LPC=600, CPC=400),
+        riding(35002, "ON", 4, 2000, LPC=400, CPC=800, NDP=200),
+        riding(24001, "QC", 6, 1500, BQ=500, LPC=300),
+    ])
+
+
+@pytest.fixture(scope="module")
+def projected(source, tmp_path_factory):
+    path = tmp_path_factory.mktemp("tables") / "test_transposition.csv"
+    path.write_text(TABLE)
+    return TranspositionTable.from_file(str(path), "test").project(source)
+
+
+def votes_by_riding(dataset):
+    return {
+        riding["ridingCode"]: {vote["partyCode"]: vote["votes"] for vote in riding["voteDistribution"]}
+        for riding in dataset.ridings
+    }
+
+
+def test_projected_votes(projected):
+    assert votes_by_riding(projected) == {
+        24001: {"LPC": 150, "BQ": 250},
+        24999: {"LPC": 150, "BQ": 250},
+        35001: {"LPC": 700, "CPC": 600, "NDP": 50},
+        35999: {"LPC": 300, "CPC": 600, "NDP": 150},
+    }
+    assert projected.rejected_votes.tolist() == [3, 3, 9, 3]
+    riding = projected.ridings[projected.row_by_code[35001]]
+    assert [vote["votePercent"] for vote in riding["voteDistribution"]] == [51.85, 44.44, 3.7]
+
+
+def test_votes_are_conserved_per_party(source, projected):
+    # Every source unit of the election is fully assigned, so no vote is lost or created
+    for code in source.party_codes:
+        before = source.votes[:, source.party_index[code]].sum()
+        after = projected.votes[:, projected.party_index[code]].sum()
+        assert before == after, code
+    for counts in ("valid_votes", "rejected_votes", "total_votes", "registered_voters"):
+        assert getattr(source, counts).sum() == getattr(projected, counts).sum(), counts
+
+
+def test_target_names_and_provinces(projected):
+    names = {riding["ridingCode"]: (riding["ridingName_EN"], riding["ridingName_FR"], riding["provCode"])
+             for riding in projected.ridings}
+    assert names == {
+        # Named in the table
+        24999: ("New North", "Nouveau Nord", "QC"),
+        # Named after the source riding with the same code
+        24001: ("Riding 24001", "Circonscription 24001", "QC"),
+        35001: ("Riding 35001", "Circonscription 35001", "ON"),
+        # Province from the riding code
+        35999: ("Riding 35999", "Riding 35999", "ON"),
+    }
+
+
+def test_invalid_tables(source):
+    with pytest.raises(TranspositionError, match="empty"):
+        TranspositionTable("empty", [])
+    with pytest.raises(TranspositionError, match="negative"):
+        TranspositionTable("negative", [{"fromCode": 1, "toCode": 2, "weight": -1}])
+    with pytest.raises(TranspositionError, match="Invalid entry"):
+        TranspositionTable("missing", [{"fromCode": 1, "toCode": 2}])
+    with pytest.raises(TranspositionError, match="No source unit"):
+        TranspositionTable("unrelated", [{"fromCode": 1, "toCode": 35001, "weight": 1}]).project(source)
@@ -0,0 +1,61 @@
+"""Turnout totals, quantiles and percentiles against plain Python over the ridings."""
+
+import numpy as np
+import pytest
+
+from elections_canada_mcp.dataset import ElectionDataset
+from elections_canada_mcp.oracle import synthetic_ridings
+from elections_canada_mcp.turnout import QUANTILES, TurnoutIndex
+
+
+@pytest.fixture(scope="module")
+def ridings():
+    return synthetic_ridings(seed=7, num_ridings=150)
+
+
+@pytest.fixture(scope="module")
+def index(ridings):
+    return TurnoutIndex(ElectionDataset(ridings))
+
+
+def scopes(ridings):
+    return [None] + sorted({riding["provCode"] for riding in ridings})
+
+
+def in_scope(ridings, province_code):
+    return [riding for riding in ridings if province_code in (None, riding["provCode"])]
+
+
+def test_totals_match_a_python_sum(index, ridings):
+    for scope in scopes(ridings):
+        selected = in_scope(ridings, scope)
+        assert index.totals(scope) == {
+            name: sum(riding[name] for riding in selected)
+            for name in ("registeredVoters", "totalVotes", "rejectedVotes")
+        }, scope
+        assert len(index.scope_rows(scope)) == len(selected)
+
+
+def test_quantiles_and_percentiles(index, ridings):
+    for scope in scopes(ridings):
+        turnout = [riding["turnout"] for riding in in_scope(ridings, scope)]
+        quantiles = index.quantiles(scope, "turnout")
+        for name, q in QUANTILES:
+            assert quantiles[name] == pytest.approx(round(float(np.quantile(turnout, q)), 2), abs=0.011)
+
+        for row in index.scope_rows(scope):
+            value = ridings[row]["turnout"]
+            expected = sum(other < value for other in turnout) / len(turnout) * 100
+            assert index.percentile(scope, "turnout", row) == round(expected, 2)
+
+
+def test_top_rows(index, ridings):
+    rates = index.metrics["rejected_rate"]
+    for row, riding in enumerate(ridings):
+        total = riding["totalVotes"]
+        assert rates[row] == pytest.approx(riding["rejectedVotes"] / total * 100 if total else 0.0)
+
+    top = index.top(None, "rejected_rate", 10)
+    assert sorted(rates[top].tolist(), reverse=True) == sorted(rates.tolist(), reverse=True)[:10]
+    bottom = index.top(None, "turnout", 10, highest=False)
+    assert sorted(index.metrics["turnout"][bottom].tolist()) == sorted(r["turnout"] for r in ridings)[:10]